@@ -8,6 +8,13 @@ Skipped automatically when:
   - .hody/ directory does not exist (project not initialized)
   - .hody/state.json shows an active workflow (start-feature handles tracking)
   - Detected confidence is "low"
+  - The same session already got a hint for this title recently, or any
+    hint within the last minute (see hint_ledger.py)
+  - A trained hint model (`auto_track.py train`) scores the prompt as
+    unlikely to be tracked
+
+Shown hints are logged (as hashed features, with a hint id the suggested
+create command passes back) to .hody/cache/intent_log.jsonl as training data.
 
 Output: JSON with hookSpecificOutput.additionalContext for context injection.
 Errors are swallowed silently — the hook never blocks user input.
@@ -15,6 +22,12 @@ Errors are swallowed silently — the hook never blocks user input.
 import json
 import os
 import sys
+import time
+
+# Prompts longer than this are cut down to auto_track.capped_view() before
+# being forwarded to the daemon or classified (the detector never looks
+# past that view anyway)
+MAX_PROMPT_CHARS = 64 * 1024
 
 
 def load_intent_detector(plugin_root):
@@ -28,20 +41,24 @@ def load_intent_detector(plugin_root):
     return detect_intent
 
 
-def has_active_workflow(state_path):
-    """Return True if .hody/state.json shows an in-progress workflow."""
-    if not os.path.isfile(state_path):
-        return False
-    try:
-        with open(state_path) as f:
-            state = json.load(f)
-        return state.get("status") == "in_progress"
-    except (json.JSONDecodeError, OSError):
-        return False
+def cap_prompt(input_data):
+    """Return *input_data* with a huge prompt replaced by its capped view."""
+    prompt = input_data.get("prompt")
+    if not isinstance(prompt, str) or len(prompt) <= MAX_PROMPT_CHARS:
+        return input_data
+    hook_dir = os.path.dirname(os.path.abspath(__file__))
+    load_intent_detector(os.path.dirname(hook_dir))
+    from auto_track import capped_view
+    return dict(input_data, prompt=capped_view(prompt))
 
 
-def build_hint(result):
-    """Format the additionalContext hint for Claude."""
+def build_hint(result, hint_id=None):
+    """Format the additionalContext hint for Claude.
+
+    *hint_id* (from intent_model.log_hint) goes into the suggested create
+    command, so training can tell which hints led to an item.
+    """
+    link = f" --hint-id {hint_id}" if hint_id else ""
     return (
         f"[Hody Auto-track] Detected possible task intent in user prompt "
         f"({result['type']}/{result.get('subtype', 'general')}, "
@@ -50,42 +67,93 @@ def build_hint(result):
         f"clarification, or part of an ongoing discussion), briefly ask "
         f"the user whether to track it, then create via "
         f"`tracker.py create --type {result['type']} --title \"<title>\" "
-        f"--tags <comma-separated>`. Skip if user is asking a question, "
+        f"--tags <comma-separated>{link}`. Skip if user is asking a question, "
         f"continuing prior work, or already inside an active workflow."
     )
 
 
-def main():
-    try:
-        if os.environ.get("HODY_AUTO_TRACK") == "0":
-            sys.exit(0)
+def handle(input_data, env=None):
+    """Classify one UserPromptSubmit event.
+
+    Returns the hook output dict, or None when no hint should be shown.
+    Shared by main() and the hook daemon.
+    """
+    env = os.environ if env is None else env
+    if env.get("HODY_AUTO_TRACK") == "0":
+        return None
+
+    cwd = input_data.get("cwd", os.getcwd())
+    prompt = input_data.get("prompt", "")
+
+    hody_dir = os.path.join(cwd, ".hody")
+    if not os.path.isdir(hody_dir):
+        return None
+
+    hook_dir = os.path.dirname(os.path.abspath(__file__))
+    plugin_root = os.path.dirname(hook_dir)
+    detect_intent = load_intent_detector(plugin_root)
+
+    result = detect_intent(prompt)
+    if not result or result.get("confidence") == "low":
+        return None
+
+    import hint_ledger
+    ledger = hint_ledger.load(cwd)
+    active, ledger_changed = hint_ledger.workflow_active(cwd, ledger)
+    session_id = input_data.get("session_id")
+    now = time.time()
+    if active or hint_ledger.is_repeat(ledger, session_id, prompt, now):
+        if ledger_changed:
+            hint_ledger.save(cwd, ledger)
+        return None
+
+    import intent_model
+    model = intent_model.load(cwd)
+    if model is not None and model.score(prompt) < intent_model.THRESHOLD:
+        if ledger_changed:
+            hint_ledger.save(cwd, ledger)
+        return None
+
+    hint_ledger.record(ledger, session_id, prompt, now)
+    hint_ledger.save(cwd, ledger)
+    hint_id = intent_model.log_hint(cwd, prompt, session_id=session_id, now=now)
+
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "UserPromptSubmit",
+            "additionalContext": build_hint(result, hint_id),
+        }
+    }
 
-        input_data = json.load(sys.stdin)
-        cwd = input_data.get("cwd", os.getcwd())
-        prompt = input_data.get("prompt", "")
 
-        hody_dir = os.path.join(cwd, ".hody")
-        if not os.path.isdir(hody_dir):
-            sys.exit(0)
+def _forward_to_daemon(input_data):
+    """Try the hook daemon first. Returns (handled, output)."""
+    hook_dir = os.path.dirname(os.path.abspath(__file__))
+    scripts_dir = os.path.join(
+        os.path.dirname(hook_dir), "skills", "project-profile", "scripts"
+    )
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    try:
+        import hook_daemon
+    except ImportError:
+        return False, None
+    return hook_daemon.forward("auto_track_hook", input_data, timeout=5)
+
 
-        if has_active_workflow(os.path.join(hody_dir, "state.json")):
+def main():
+    try:
+        if os.environ.get("HODY_AUTO_TRACK") == "0":
             sys.exit(0)
 
-        hook_dir = os.path.dirname(os.path.abspath(__file__))
-        plugin_root = os.path.dirname(hook_dir)
-        detect_intent = load_intent_detector(plugin_root)
+        input_data = cap_prompt(json.load(sys.stdin))
 
-        result = detect_intent(prompt)
-        if not result or result.get("confidence") == "low":
-            sys.exit(0)
+        handled, output = _forward_to_daemon(input_data)
+        if not handled:
+            output = handle(input_data)
 
-        output = {
-            "hookSpecificOutput": {
-                "hookEventName": "UserPromptSubmit",
-                "additionalContext": build_hint(result),
-            }
-        }
-        print(json.dumps(output))
+        if output is not None:
+            print(json.dumps(output))
         sys.exit(0)
 
     except Exception:
@@ -3,13 +3,23 @@
 SessionStart hook: reads .hody/profile.yaml and injects project context
 into the system message so all agents know the current tech stack.
 
-Auto-refresh: if any config file is newer than profile.yaml, re-runs
-detect_stack.py before injecting context.
+Auto-refresh: if any config file is newer than profile.yaml, starts
+detect_stack.py in the background; the refreshed profile is used by the
+next session so a slow detection never blocks this one.
+
+Caching: the message is assembled from independent sections (profile,
+workflow state, tracker, Graphify, rules). Each section is stored in
+.hody/context_cache.json keyed by the mtime and size of its inputs, and is
+only rebuilt when those inputs change. When nothing changed, the cached
+message is printed as-is. Stale sections are rebuilt concurrently, each
+under its own timeout.
 """
 import json
 import subprocess
 import sys
 import os
+import threading
+import time
 
 
 # Config files that trigger a profile refresh when modified
@@ -39,47 +49,53 @@ CONFIG_FILES = [
 ]
 
 
+# Matched against directory entries; plus extension-matched configs
+# (.csproj/.sln for .NET, .tf for Terraform)
+_CONFIG_NAMES = frozenset(CONFIG_FILES)
+CONFIG_SUFFIXES = (".csproj", ".sln", ".tf")
+
+
 def is_profile_stale(cwd, profile_path):
-    """Check if any config file is newer than profile.yaml."""
+    """Check if any config file is newer than profile.yaml.
+
+    Runs on every SessionStart, before the context cache is consulted, so
+    it lists *cwd* once and only stats the config files that exist rather
+    than probing every CONFIG_FILES name.
+    """
     try:
         profile_mtime = os.path.getmtime(profile_path)
+        names = os.listdir(cwd)
     except OSError:
         return False
 
-    for fname in CONFIG_FILES:
-        fpath = os.path.join(cwd, fname)
+    paths = [
+        os.path.join(cwd, f) for f in names
+        if f in _CONFIG_NAMES or f.endswith(CONFIG_SUFFIXES)
+    ]
+
+    # Check .github/workflows/ directory
+    if ".github" in names:
+        workflows_dir = os.path.join(cwd, ".github", "workflows")
+        try:
+            paths.extend(os.path.join(workflows_dir, f) for f in os.listdir(workflows_dir))
+        except OSError:
+            pass
+
+    for fpath in paths:
         try:
             if os.path.getmtime(fpath) > profile_mtime:
                 return True
         except OSError:
             continue
-
-    # Check for .csproj and .sln files (glob pattern)
-    try:
-        for f in os.listdir(cwd):
-            if f.endswith((".csproj", ".sln", ".tf")):
-                if os.path.getmtime(os.path.join(cwd, f)) > profile_mtime:
-                    return True
-    except OSError:
-        pass
-
-    # Check .github/workflows/ directory
-    workflows_dir = os.path.join(cwd, ".github", "workflows")
-    try:
-        if os.path.isdir(workflows_dir):
-            for f in os.listdir(workflows_dir):
-                fpath = os.path.join(workflows_dir, f)
-                if os.path.getmtime(fpath) > profile_mtime:
-                    return True
-    except OSError:
-        pass
-
     return False
 
 
-def refresh_profile(cwd):
-    """Re-run detect_stack.py to update profile.yaml."""
-    # Derive detect_stack.py path from this script's location
+def refresh_profile_async(cwd):
+    """Start detect_stack.py in the background and return immediately.
+
+    The current session keeps the existing profile.yaml; the refreshed
+    profile is picked up by the next session.
+    """
     hook_dir = os.path.dirname(os.path.abspath(__file__))
     plugin_root = os.path.dirname(hook_dir)
     detect_script = os.path.join(
@@ -90,168 +106,388 @@ def refresh_profile(cwd):
         return False
 
     try:
-        subprocess.run(
+        subprocess.Popen(
             [sys.executable, detect_script, "--cwd", cwd],
-            timeout=15,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
         )
         return True
-    except (subprocess.TimeoutExpired, OSError):
+    except OSError:
         return False
 
 
+def _scripts_dir():
+    """Return the project-profile scripts directory, added to sys.path."""
+    hook_dir = os.path.dirname(os.path.abspath(__file__))
+    plugin_root = os.path.dirname(hook_dir)
+    scripts_dir = os.path.join(plugin_root, "skills", "project-profile", "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return scripts_dir
+
+
+# =====================================================================
+# Section builders — each returns a message fragment ("" = nothing)
+# =====================================================================
+
+def build_profile_section(cwd):
+    """Concise tech-stack summary from .hody/profile.yaml."""
+    profile_path = os.path.join(cwd, ".hody", "profile.yaml")
+    with open(profile_path, "r") as f:
+        profile_content = f.read()
+
+    # Extract key info for a concise summary
+    lines = profile_content.strip().splitlines()
+    summary_parts = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("name:"):
+            summary_parts.append(stripped)
+        elif stripped.startswith("framework:"):
+            summary_parts.append(stripped)
+        elif stripped.startswith("language:"):
+            summary_parts.append(stripped)
+        elif stripped.startswith("database:"):
+            summary_parts.append(stripped)
+        elif stripped.startswith("ci:"):
+            summary_parts.append(stripped)
+
+    summary = " | ".join(summary_parts) if summary_parts else "profile loaded"
+
+    return f"[Hody Workflow] Project: {summary}. Full profile at .hody/profile.yaml"
+
+
+def build_state_section(cwd):
+    """Active workflow state from .hody/state.json."""
+    state_path = os.path.join(cwd, ".hody", "state.json")
+    if not os.path.isfile(state_path):
+        return ""
+    try:
+        with open(state_path, "r") as sf:
+            state = json.load(sf)
+        if state.get("status") != "in_progress":
+            return ""
+        feature = state.get("feature", "unknown")
+        spec_confirmed = state.get("spec_confirmed", False)
+        spec_status = "spec confirmed" if spec_confirmed else "spec pending"
+        exec_mode = state.get("execution_mode", "guided")
+
+        # Find next agent
+        next_info = None
+        for phase in state.get("phase_order", []):
+            p = state.get("phases", {}).get(phase, {})
+            for agent in p.get("agents", []):
+                if (agent not in p.get("completed", [])
+                        and agent not in p.get("skipped", [])):
+                    next_info = (phase, agent)
+                    break
+            if next_info:
+                break
+
+        if not spec_confirmed:
+            return (
+                f"Active workflow: '{feature}'"
+                f" — {spec_status}, discovery incomplete"
+                f" (mode: {exec_mode})"
+                f". Use /hody-workflow:resume to continue discovery."
+            )
+        if next_info:
+            resume_hint = (
+                "will pause between agents"
+                if exec_mode == "manual"
+                else "auto-run remaining agents"
+            )
+            return (
+                f"Active workflow: '{feature}'"
+                f" — {spec_status}, next: {next_info[1]}"
+                f" ({next_info[0]} phase, mode: {exec_mode})"
+                f". Use /hody-workflow:resume to {resume_hint}."
+            )
+        return (
+            f"Active workflow: '{feature}'"
+            f" — all agents done, ready to complete."
+        )
+    except (json.JSONDecodeError, KeyError):
+        return ""  # Don't block on corrupt state file
+
+
+def build_tracker_section(cwd):
+    """Active items and warnings from .hody/tracker.db."""
+    tracker_db = os.path.join(cwd, ".hody", "tracker.db")
+    if not os.path.isfile(tracker_db):
+        return ""
+    try:
+        _scripts_dir()
+        from tracker_awareness import get_session_context, format_context_for_hook
+
+        context = get_session_context(cwd)
+        return format_context_for_hook(context) or ""
+    except Exception:
+        return ""  # Don't block session on tracker error
+
+
+def build_graph_section(cwd):
+    """Graphify knowledge graph summary from graphify-out/graph.json."""
+    graph_path = os.path.join(cwd, "graphify-out", "graph.json")
+    if not os.path.isfile(graph_path):
+        return ""
+    try:
+        _scripts_dir()
+        from graph_stats import load_graph_stats
+    except ImportError:
+        return ""
+
+    # Streams the file and caches counts in graph.stats.json, so large
+    # graphs no longer need a size cap
+    stats = load_graph_stats(graph_path)
+    if not stats or stats.get("node_count", 0) == 0:
+        return ""  # Don't block session on graph read error
+    return (
+        f"Graphify: {stats['node_count']} nodes, {stats['edge_count']} edges"
+        f" in graphify-out/graph.json."
+        f" Use Graphify MCP tools (query_graph, get_neighbors,"
+        f" god_nodes, shortest_path) for structural code queries."
+    )
+
+
+def build_rules_section(cwd):
+    """Project rules summary from .hody/rules.yaml."""
+    rules_path = os.path.join(cwd, ".hody", "rules.yaml")
+    if not os.path.isfile(rules_path):
+        return ""
+    try:
+        _scripts_dir()
+        from rules import load_rules, summarize_rules
+
+        parsed = load_rules(cwd)
+        if parsed:
+            return summarize_rules(parsed) or ""
+        return ""
+    except Exception:
+        return ""  # Don't block session on rules error
+
+
+def _hour_bucket():
+    """Tracker ages and "recent" windows depend on the clock, not only on files."""
+    return time.strftime("%Y%m%d%H", time.gmtime())
+
+
+# (name, builder, input paths relative to cwd, extra key fn) in message order
+SECTIONS = [
+    ("profile", build_profile_section, [".hody/profile.yaml"], None),
+    ("state", build_state_section, [".hody/state.json"], None),
+    ("tracker", build_tracker_section,
+     [".hody/tracker.db", ".hody/tracker.db-wal"], _hour_bucket),
+    ("graphify", build_graph_section, ["graphify-out/graph.json"], None),
+    ("rules", build_rules_section, [".hody/rules.yaml"], None),
+]
+
+
+# Per-section time limits in seconds (default SECTION_TIMEOUT). Sections run
+# concurrently, so SessionStart waits at most the largest limit (8s).
+SECTION_TIMEOUT = 3.0
+SECTION_TIMEOUTS = {
+    "tracker": 5.0,
+    "graphify": 8.0,
+}
+
+DEFAULT_PROFILE_TEXT = (
+    "[Hody Workflow] Project: profile loaded. Full profile at .hody/profile.yaml"
+)
+
+
+# (cwd, section name) -> builder thread still running from an earlier call.
+# Under the hook daemon the process outlives a timed-out builder, so it is
+# not started again until that thread finishes: a hung builder holds one
+# thread, not one per session.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def run_sections(cwd, pending):
+    """Run section builders concurrently, each under its own time limit.
+
+    *pending* is a list of (name, builder). Returns {name: text} for the
+    sections that finished in time; slow sections are simply missing, as
+    are sections whose builder from an earlier call is still running.
+    Daemon threads are used so a hung builder never delays process exit.
+    """
+    results = {}
+
+    def _run(key, builder):
+        try:
+            results[key[1]] = builder(cwd)
+        except Exception:
+            results[key[1]] = ""  # Don't block session on a section error
+        finally:
+            with _inflight_lock:
+                if _inflight.get(key) is threading.current_thread():
+                    del _inflight[key]
+
+    threads = []
+    with _inflight_lock:
+        for name, builder in pending:
+            key = (cwd, name)
+            if key in _inflight:
+                continue
+            t = threading.Thread(target=_run, args=(key, builder), daemon=True)
+            _inflight[key] = t
+            t.start()
+            threads.append((name, t))
+
+    start = time.monotonic()
+    for name, t in threads:
+        limit = SECTION_TIMEOUTS.get(name, SECTION_TIMEOUT)
+        t.join(max(0.0, start + limit - time.monotonic()))
+
+    return dict(results)
+
+
+# =====================================================================
+# Context cache (.hody/context_cache.json)
+# =====================================================================
+
+# Bump when section formatting changes so old cached messages are dropped
+CACHE_VERSION = 1
+CACHE_FILE = "context_cache.json"
+
+
+def section_key(cwd, inputs, extra=None):
+    """Fingerprint a section's inputs: (path, mtime_ns, size) per file."""
+    key = []
+    for rel in inputs:
+        try:
+            st = os.stat(os.path.join(cwd, rel))
+            key.append([rel, st.st_mtime_ns, st.st_size])
+        except OSError:
+            key.append([rel, None, None])
+    if extra is not None:
+        key.append(extra())
+    return key
+
+
+def load_context_cache(cwd):
+    """Read .hody/context_cache.json. Returns {} if missing or outdated."""
+    path = os.path.join(cwd, ".hody", CACHE_FILE)
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache
+
+
+def save_context_cache(cwd, sections, message):
+    """Atomically write the composed message and per-section entries."""
+    path = os.path.join(cwd, ".hody", CACHE_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "version": CACHE_VERSION,
+                "sections": sections,
+                "message": message,
+            }, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def compose_message(texts):
+    """Join section fragments: profile first, the rest as ' | ' suffixes."""
+    head, rest = texts[0], [t for t in texts[1:] if t]
+    return " | ".join([head] + rest)
+
+
+def build_context(cwd):
+    """Compose the system message, recomputing only sections whose inputs changed.
+
+    Stale sections are rebuilt concurrently. A section that misses its
+    deadline keeps its previously cached text (if any) and is not stored
+    under the new key, so it is retried by the next session.
+    """
+    cache = load_context_cache(cwd)
+    cached_sections = cache.get("sections", {})
+
+    keys = {}
+    pending = []
+    for name, builder, inputs, extra in SECTIONS:
+        keys[name] = section_key(cwd, inputs, extra)
+        entry = cached_sections.get(name)
+        if not entry or entry.get("key") != keys[name]:
+            pending.append((name, builder))
+
+    if not pending and "message" in cache:
+        return cache["message"]
+
+    fresh = run_sections(cwd, pending)
+
+    sections = {}
+    texts = []
+    for name, _, _, _ in SECTIONS:
+        entry = cached_sections.get(name) or {}
+        if name in fresh:
+            sections[name] = {"key": keys[name], "text": fresh[name]}
+        elif entry:
+            # Unchanged, or timed out: reuse old text under its old key
+            sections[name] = entry
+        text = sections.get(name, {}).get("text", "")
+        if name == "profile" and not text:
+            text = DEFAULT_PROFILE_TEXT
+        texts.append(text)
+
+    message = compose_message(texts)
+    save_context_cache(cwd, sections, message)
+    return message
+
+
+def handle(input_data, env=None):
+    """Build the SessionStart output dict for one event.
+
+    Shared by main() and the hook daemon.
+    """
+    env = os.environ if env is None else env
+    cwd = input_data.get("cwd", os.getcwd())
+
+    profile_path = os.path.join(cwd, ".hody", "profile.yaml")
+    if not os.path.isfile(profile_path):
+        return {}
+
+    # Auto-refresh if config files changed (skip with HODY_SKIP_REFRESH=1).
+    # Runs in the background: this session gets the previous profile.
+    if not env.get("HODY_SKIP_REFRESH"):
+        if is_profile_stale(cwd, profile_path):
+            refresh_profile_async(cwd)
+
+    return {"systemMessage": build_context(cwd)}
+
+
+def _forward_to_daemon(input_data):
+    """Try the hook daemon first. Returns (handled, output)."""
+    _scripts_dir()
+    try:
+        import hook_daemon
+    except ImportError:
+        return False, None
+    return hook_daemon.forward("inject_project_context", input_data)
+
+
 def main():
     try:
         input_data = json.load(sys.stdin)
-        cwd = input_data.get("cwd", os.getcwd())
-
-        profile_path = os.path.join(cwd, ".hody", "profile.yaml")
-        if not os.path.isfile(profile_path):
-            print("{}")
-            sys.exit(0)
-
-        # Auto-refresh if config files changed (skip with HODY_SKIP_REFRESH=1)
-        if not os.environ.get("HODY_SKIP_REFRESH"):
-            if is_profile_stale(cwd, profile_path):
-                refresh_profile(cwd)
-
-        with open(profile_path, "r") as f:
-            profile_content = f.read()
-
-        # Extract key info for a concise summary
-        lines = profile_content.strip().splitlines()
-        summary_parts = []
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("name:"):
-                summary_parts.append(stripped)
-            elif stripped.startswith("framework:"):
-                summary_parts.append(stripped)
-            elif stripped.startswith("language:"):
-                summary_parts.append(stripped)
-            elif stripped.startswith("database:"):
-                summary_parts.append(stripped)
-            elif stripped.startswith("ci:"):
-                summary_parts.append(stripped)
-
-        summary = " | ".join(summary_parts) if summary_parts else "profile loaded"
-
-        system_msg = f"[Hody Workflow] Project: {summary}. Full profile at .hody/profile.yaml"
-
-        # Inject active workflow state if present
-        state_path = os.path.join(cwd, ".hody", "state.json")
-        if os.path.isfile(state_path):
-            try:
-                with open(state_path, "r") as sf:
-                    state = json.load(sf)
-                if state.get("status") == "in_progress":
-                    feature = state.get("feature", "unknown")
-                    spec_confirmed = state.get("spec_confirmed", False)
-                    spec_status = "spec confirmed" if spec_confirmed else "spec pending"
-                    exec_mode = state.get("execution_mode", "guided")
-
-                    # Find next agent
-                    next_info = None
-                    for phase in state.get("phase_order", []):
-                        p = state.get("phases", {}).get(phase, {})
-                        for agent in p.get("agents", []):
-                            if (agent not in p.get("completed", [])
-                                    and agent not in p.get("skipped", [])):
-                                next_info = (phase, agent)
-                                break
-                        if next_info:
-                            break
-
-                    if not spec_confirmed:
-                        system_msg += (
-                            f" | Active workflow: '{feature}'"
-                            f" — {spec_status}, discovery incomplete"
-                            f" (mode: {exec_mode})"
-                            f". Use /hody-workflow:resume to continue discovery."
-                        )
-                    elif next_info:
-                        resume_hint = (
-                            "will pause between agents"
-                            if exec_mode == "manual"
-                            else "auto-run remaining agents"
-                        )
-                        system_msg += (
-                            f" | Active workflow: '{feature}'"
-                            f" — {spec_status}, next: {next_info[1]}"
-                            f" ({next_info[0]} phase, mode: {exec_mode})"
-                            f". Use /hody-workflow:resume to {resume_hint}."
-                        )
-                    else:
-                        system_msg += (
-                            f" | Active workflow: '{feature}'"
-                            f" — all agents done, ready to complete."
-                        )
-            except (json.JSONDecodeError, KeyError):
-                pass  # Don't block on corrupt state file
-
-        # Inject tracker context if tracker.db exists
-        tracker_db = os.path.join(cwd, ".hody", "tracker.db")
-        if os.path.isfile(tracker_db):
-            try:
-                hook_dir = os.path.dirname(os.path.abspath(__file__))
-                plugin_root = os.path.dirname(hook_dir)
-                scripts_dir = os.path.join(
-                    plugin_root, "skills", "project-profile", "scripts"
-                )
-                sys.path.insert(0, scripts_dir)
-                from tracker_awareness import get_session_context, format_context_for_hook
-
-                context = get_session_context(cwd)
-                tracker_msg = format_context_for_hook(context)
-                if tracker_msg:
-                    system_msg += " | " + tracker_msg
-            except Exception:
-                pass  # Don't block session on tracker error
-
-        # Inject Graphify knowledge graph summary if available
-        graph_path = os.path.join(cwd, "graphify-out", "graph.json")
-        if os.path.isfile(graph_path):
-            try:
-                graph_size = os.path.getsize(graph_path)
-                if graph_size <= 10 * 1024 * 1024:  # Skip if > 10 MB
-                    with open(graph_path, "r") as gf:
-                        graph_data = json.load(gf)
-                    node_count = len(graph_data.get("nodes", []))
-                    link_key = "links" if "links" in graph_data else "edges"
-                    edge_count = len(graph_data.get(link_key, []))
-                    if node_count > 0:
-                        system_msg += (
-                            f" | Graphify: {node_count} nodes, {edge_count} edges"
-                            f" in graphify-out/graph.json."
-                            f" Use Graphify MCP tools (query_graph, get_neighbors,"
-                            f" god_nodes, shortest_path) for structural code queries."
-                        )
-            except (json.JSONDecodeError, OSError, KeyError):
-                pass  # Don't block session on graph read error
-
-        # Inject project rules summary if rules.yaml exists
-        rules_path = os.path.join(cwd, ".hody", "rules.yaml")
-        if os.path.isfile(rules_path):
-            try:
-                hook_dir = os.path.dirname(os.path.abspath(__file__))
-                plugin_root = os.path.dirname(hook_dir)
-                scripts_dir = os.path.join(
-                    plugin_root, "skills", "project-profile", "scripts"
-                )
-                if scripts_dir not in sys.path:
-                    sys.path.insert(0, scripts_dir)
-                from rules import load_rules, summarize_rules
-
-                parsed = load_rules(cwd)
-                if parsed:
-                    rules_summary = summarize_rules(parsed)
-                    if rules_summary:
-                        system_msg += " | " + rules_summary
-            except Exception:
-                pass  # Don't block session on rules error
-
-        output = {"systemMessage": system_msg}
-        print(json.dumps(output))
+
+        handled, output = _forward_to_daemon(input_data)
+        if not handled:
+            output = handle(input_data)
+
+        print(json.dumps(output if output is not None else {}))
         sys.exit(0)
 
     except Exception as e:
@@ -12,28 +12,51 @@ Checks (configurable via .hody/quality-rules.yaml):
 Output: JSON with permissionDecision "allow" or "deny" + reason.
 Skip with HODY_SKIP_QUALITY_GATE=1 env var.
 """
-import json
 import os
-import re
-import subprocess
 import sys
 
+# Only os and sys are imported at module load. This hook runs on every Bash
+# PreToolUse event, so json, re, subprocess and quality_rules are imported
+# lazily — after a commit command has actually been detected.
 
-# Try to import configurable rule engine; fall back to hardcoded behavior
-_USE_QUALITY_RULES = False
-try:
-    _scripts_dir = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "..",
-        "skills",
-        "project-profile",
-        "scripts",
-    )
-    sys.path.insert(0, os.path.abspath(_scripts_dir))
-    import quality_rules
-    _USE_QUALITY_RULES = True
-except ImportError:
-    quality_rules = None
+_SCRIPTS_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "skills",
+    "project-profile",
+    "scripts",
+))
+
+# Cached result of _load_quality_rules(): None = not tried yet, False = missing
+_quality_rules = None
+
+
+def _load_quality_rules():
+    """Import the configurable rule engine on first use.
+
+    Returns the quality_rules module, or None to fall back to the
+    hardcoded legacy patterns.
+    """
+    global _quality_rules
+    if _quality_rules is None:
+        if _SCRIPTS_DIR not in sys.path:
+            sys.path.insert(0, _SCRIPTS_DIR)
+        try:
+            import quality_rules
+            _quality_rules = quality_rules
+        except ImportError:
+            _quality_rules = False
+    return _quality_rules or None
+
+
+def is_commit_candidate(raw_input):
+    """Cheap pre-filter on the raw stdin payload.
+
+    Any event whose JSON does not even contain the word "commit" cannot be
+    a git commit, so it is dropped without parsing JSON or touching disk.
+    Events that pass still go through the exact regex check in handle().
+    """
+    return "commit" in raw_input
 
 
 # --- Legacy hardcoded patterns (fallback when quality_rules unavailable) ---
@@ -58,13 +81,15 @@ SECURITY_PATTERNS = [
 # Max file size to commit (500KB)
 MAX_FILE_SIZE = 500 * 1024
 
-# Files/patterns to skip checking
+# Files/patterns to skip checking when quality_rules is unavailable; kept
+# identical to quality_rules.SKIP_EXTENSIONS / SKIP_PATHS (the tests check)
 SKIP_EXTENSIONS = {".lock", ".sum", ".min.js", ".min.css", ".map", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".woff", ".woff2", ".ttf", ".eot"}
 SKIP_PATHS = {"node_modules/", "vendor/", "dist/", "build/", ".next/", "__pycache__/"}
 
 
 def get_staged_files(cwd):
     """Get list of staged files with their status."""
+    import subprocess
     try:
         result = subprocess.run(
             ["git", "diff", "--cached", "--name-status"],
@@ -85,8 +110,30 @@ def get_staged_files(cwd):
         return []
 
 
+def get_staged_entries(cwd):
+    """Staged entries (path, status, mode, sha) from the git index.
+
+    Returns None when the index cannot be listed; callers then fall back
+    to get_staged_files() and working-tree reads.
+    """
+    if _load_quality_rules() is None:
+        return None
+    try:
+        import git_index
+    except ImportError:
+        return None
+    return git_index.staged_entries(cwd)
+
+
 def should_skip(filepath):
-    """Check if a file should be skipped from quality checks."""
+    """Check if a file should be skipped from quality checks.
+
+    Delegates to quality_rules (shared with the repository audit); the
+    local lists only cover the legacy path where it cannot be imported.
+    """
+    quality_rules = _load_quality_rules()
+    if quality_rules is not None:
+        return quality_rules.should_skip(filepath)
     ext = os.path.splitext(filepath)[1].lower()
     if ext in SKIP_EXTENSIONS:
         return True
@@ -105,6 +152,7 @@ def check_file(cwd, filepath):
 
     Legacy fallback — used when quality_rules module is not available.
     """
+    import re
     issues = []
     full_path = os.path.join(cwd, filepath)
 
@@ -146,10 +194,11 @@ def check_file(cwd, filepath):
 
 
 def check_file_v2(cwd, filepath):
-    """Run configurable quality checks on a staged file.
+    """Run configurable quality checks on a file in the working tree.
 
     Returns (errors, warnings) tuple of lists.
-    Uses quality_rules module for configurable checks.
+    Uses quality_rules module for configurable checks. The gate itself
+    reads staged content from the index (see _run_quality_gate_v2).
     """
     full_path = os.path.join(cwd, filepath)
 
@@ -160,31 +209,108 @@ def check_file_v2(cwd, filepath):
     except (OSError, UnicodeDecodeError):
         content = ""
 
-    result = quality_rules.run_checks(cwd, filepath, content)
+    result = _load_quality_rules().run_checks(cwd, filepath, content)
     return result.get("errors", []), result.get("warnings", [])
 
 
 def run_quality_gate(cwd):
     """Run all quality checks on staged files. Returns (passed, report)."""
-    staged = get_staged_files(cwd)
+    entries = get_staged_entries(cwd)
+    if entries is not None:
+        staged = [e["path"] for e in entries if e["status"] != "D"]
+    else:
+        staged = get_staged_files(cwd)
     if not staged:
         return True, "No staged files to check."
 
-    if _USE_QUALITY_RULES:
-        return _run_quality_gate_v2(cwd, staged)
+    if _load_quality_rules() is not None:
+        return _run_quality_gate_v2(cwd, staged, entries)
     else:
         return _run_quality_gate_legacy(cwd, staged)
 
 
-def _run_quality_gate_v2(cwd, staged):
-    """Configurable quality gate using quality_rules module."""
+def _staged_content(cwd, paths, entries, rules):
+    """Read staged content for *paths* from the index.
+
+    With `scope: added_lines`, only the lines the commit adds are returned
+    (as (path, content, size, line_numbers) tuples); otherwise whole raw
+    blobs as (path, bytes, size). Falls back to the plain paths (read
+    from the working tree) if the index cannot be read.
+    """
+    import git_index
+    quality_rules = _load_quality_rules()
+    if rules.get("scope") == quality_rules.SCOPE_ADDED_LINES:
+        items = git_index.staged_additions(cwd, paths, entries=entries)
+        if items is not None:
+            return items
+    items = git_index.staged_blobs(
+        cwd, paths, max_bytes=quality_rules.max_scan_bytes(rules), entries=entries,
+        decode=False,
+    )
+    return paths if items is None else items
+
+
+def _check_staged(cwd, paths, entries, rules, tables):
+    """Check staged files, answering unchanged blobs from the result cache.
+
+    Only cache misses are read from the index and scanned; their results
+    are stored under (blob sha, path, rules digest[, diff base]).
+    """
+    import quality_cache
+    quality_rules = _load_quality_rules()
+    digest = quality_cache.rules_digest(rules)
+    by_path = {e["path"]: e for e in entries}
+
+    def key_for(path, added_only):
+        entry = by_path[path]
+        base = f"added:{entry['old_sha'] or ''}" if added_only else None
+        return quality_cache.entry_key(digest, path, entry["sha"], base)
+
+    added_only = rules.get("scope") == quality_rules.SCOPE_ADDED_LINES
+    keys = {p: key_for(p, added_only) for p in paths if p in by_path}
+    hits = quality_cache.lookup(cwd, keys.values())
+    results = {p: hits[k] for p, k in keys.items() if k in hits}
+
+    missing = [p for p in paths if p not in results]
+    if missing:
+        items = _staged_content(cwd, missing, entries, rules)
+        fresh = quality_rules.run_checks_parallel(cwd, items, rules=rules, tables=tables)
+        # Key by the mode actually used: additions may have fallen back to
+        # whole blobs, and working-tree reads (plain paths) are not cached
+        quality_cache.store(cwd, {
+            key_for(item[0], len(item) > 3): fresh[item[0]]
+            for item in items
+            if not isinstance(item, str) and item[0] in fresh and item[0] in by_path
+        })
+        results.update(fresh)
+    return results
+
+
+def _run_quality_gate_v2(cwd, staged, entries=None):
+    """Configurable quality gate using quality_rules module.
+
+    With *entries* from get_staged_entries(), file content and sizes come
+    from the git index (what will actually be committed) instead of the
+    working tree.
+    """
+    quality_rules = _load_quality_rules()
     all_errors = {}
     all_warnings = {}
 
-    for filepath in staged:
-        if should_skip(filepath):
-            continue
-        errors, warnings = check_file_v2(cwd, filepath)
+    # Rules are loaded and compiled once for the whole commit; large commits
+    # are spread across CPU cores, small ones stay serial
+    rules, tables = quality_rules.load_rule_set(cwd)
+    to_check = [f for f in staged if not should_skip(f)]
+    if entries is not None:
+        results = _check_staged(cwd, to_check, entries, rules, tables)
+    else:
+        results = quality_rules.run_checks_parallel(cwd, to_check, rules=rules, tables=tables)
+
+    for filepath in to_check:
+        if filepath not in results:
+            continue  # Submodule or object missing from the index
+        errors = results[filepath].get("errors", [])
+        warnings = results[filepath].get("warnings", [])
         if errors:
             all_errors[filepath] = errors
         if warnings:
@@ -250,50 +376,83 @@ def _run_quality_gate_legacy(cwd, staged):
     return False, "\n".join(report_lines)
 
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
+def handle(input_data, env=None):
+    """Evaluate one PreToolUse event.
 
-        # Skip if disabled
-        if os.environ.get("HODY_SKIP_QUALITY_GATE"):
-            sys.exit(0)
+    Returns the hook output dict, or None when the event is not a commit
+    (or the gate is skipped). Shared by main() and the hook daemon.
+    """
+    env = os.environ if env is None else env
 
-        # Only intercept git commit commands
-        tool_input = input_data.get("tool_input", {})
-        command = tool_input.get("command", "")
+    # Skip if disabled
+    if env.get("HODY_SKIP_QUALITY_GATE"):
+        return None
 
-        if not re.match(r"^\s*git\s+commit\b", command):
-            sys.exit(0)
+    # Only intercept git commit commands
+    tool_input = input_data.get("tool_input", {})
+    command = tool_input.get("command", "")
 
-        cwd = input_data.get("cwd", os.getcwd())
+    import re
+    if not re.match(r"^\s*git\s+commit\b", command):
+        return None
 
-        # Check if .hody/ exists (only run for initialized projects)
-        if not os.path.isdir(os.path.join(cwd, ".hody")):
-            sys.exit(0)
+    cwd = input_data.get("cwd", os.getcwd())
+
+    # Check if .hody/ exists (only run for initialized projects)
+    if not os.path.isdir(os.path.join(cwd, ".hody")):
+        return None
 
-        passed, report = run_quality_gate(cwd)
+    passed, report = run_quality_gate(cwd)
 
-        if passed:
-            # Allow commit, add info message
-            output = {
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                }
+    if passed:
+        # Allow commit, add info message
+        return {
+            "hookSpecificOutput": {
+                "hookEventName": "PreToolUse",
             }
-            print(json.dumps(output))
+        }
+
+    # Deny commit with reason
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "deny",
+            "permissionDecisionReason": f"[Hody Quality Gate] {report}\n\nFix issues or skip with HODY_SKIP_QUALITY_GATE=1"
+        }
+    }
+
+
+def _forward_to_daemon(input_data):
+    """Try the hook daemon first. Returns (handled, output)."""
+    if _SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, _SCRIPTS_DIR)
+    try:
+        import hook_daemon
+    except ImportError:
+        return False, None
+    return hook_daemon.forward("quality_gate", input_data)
+
+
+def main():
+    try:
+        # Fast path: non-commit commands exit before any import or disk access
+        raw_input = sys.stdin.read()
+        if not is_commit_candidate(raw_input):
             sys.exit(0)
-        else:
-            # Deny commit with reason
-            output = {
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                    "permissionDecision": "deny",
-                    "permissionDecisionReason": f"[Hody Quality Gate] {report}\n\nFix issues or skip with HODY_SKIP_QUALITY_GATE=1"
-                }
-            }
-            print(json.dumps(output))
+        if os.environ.get("HODY_SKIP_QUALITY_GATE"):
             sys.exit(0)
 
+        import json
+        input_data = json.loads(raw_input)
+
+        handled, output = _forward_to_daemon(input_data)
+        if not handled:
+            output = handle(input_data)
+
+        if output is not None:
+            print(json.dumps(output))
+        sys.exit(0)
+
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(0)  # Don't block on hook error
@@ -7,10 +7,18 @@ intent is detected.
 
 Used by the UserPromptSubmit hook to suggest tracker item creation
 when the user starts a new task outside the /start-feature workflow.
+`auto_track.py train --cwd <project>` fits the optional learned hint
+filter (intent_model.py) from tracker history; `auto_track.py bench
+--corpus <prompts.jsonl>` replays a labelled prompt corpus and reports
+latency and precision/recall.
 """
 import argparse
+import itertools
 import json
+import os
+import re
 import sys
+import time
 
 
 # English imperative verbs that often signal task intent
@@ -67,6 +75,48 @@ META_COMMAND_PREFIXES = ("/", "!", "@")
 MIN_PROMPT_LENGTH = 15
 SHORT_PROMPT_WORDS = 4
 
+# Phrases and indicators are looked for in this many leading characters.
+# Intent is stated up front; a pasted stack trace or log after it only
+# adds scanning time.
+SCAN_PREFIX_CHARS = 2000
+
+# Longer prompts (multi-megabyte logs, diffs) are classified from a capped
+# view: the first PROMPT_VIEW_CHARS characters plus the last
+# SCAN_PREFIX_CHARS, so the work per prompt stays constant
+PROMPT_VIEW_CHARS = 8192
+
+# Word counts only matter up to the "high" confidence threshold
+CONFIDENCE_HIGH_WORDS = 12
+
+_WORD = re.compile(r"\S+")
+
+
+def _vocabulary(phrases):
+    """Index a phrase set for substring scans as (ascii_only, all) tuples.
+
+    A phrase containing another phrase of the set is dropped (the shorter
+    one matches wherever it does). ASCII text can only contain the ASCII
+    phrases, so English prompts and pasted logs skip the Vietnamese ones.
+    """
+    kept = sorted(p for p in phrases if not any(o != p and o in p for o in phrases))
+    return tuple(p for p in kept if p.isascii()), tuple(kept)
+
+
+def _contains_any(text, vocabulary):
+    ascii_only, everything = vocabulary
+    return any(p in text for p in (ascii_only if text.isascii() else everything))
+
+
+# Built once at import; a plain loop of C-level substring tests measured
+# faster than one alternation regex (or a trie-shaped one) over these sets
+_QUESTION_VOCAB_VI = _vocabulary(QUESTION_PHRASES_VI)
+_BUG_FIX_VOCAB = _vocabulary(BUG_FIX_INDICATORS)
+_INVESTIGATION_VOCAB = _vocabulary(INVESTIGATION_INDICATORS)
+
+# Task verb -> language (Vietnamese wins if a word were in both sets)
+_TASK_VERB_INDEX = dict.fromkeys(EN_TASK_VERBS, "en")
+_TASK_VERB_INDEX.update(dict.fromkeys(VI_TASK_VERBS, "vi"))
+
 
 def is_meta_command(prompt):
     """Slash commands, shell prefixes, and one-token replies."""
@@ -81,9 +131,8 @@ def is_question(prompt_lower):
     head = prompt_lower[:120]
 
     # Vietnamese question phrases (high signal even mid-sentence)
-    for phrase in QUESTION_PHRASES_VI:
-        if phrase in prompt_lower:
-            return True
+    if _contains_any(prompt_lower[:SCAN_PREFIX_CHARS], _QUESTION_VOCAB_VI):
+        return True
 
     # English question words at start
     first_word = head.split(maxsplit=1)[0] if head else ""
@@ -92,7 +141,7 @@ def is_question(prompt_lower):
         return True
 
     # Trailing question mark (excluding rhetorical markers mid-sentence)
-    stripped = prompt_lower.rstrip()
+    stripped = prompt_lower[-SCAN_PREFIX_CHARS:].rstrip()
     if stripped.endswith("?"):
         return True
 
@@ -104,32 +153,58 @@ def find_task_verb(prompt_lower):
 
     Returns (verb, language) or None.
     """
-    words = prompt_lower.split()[:6]
+    words = prompt_lower[:SCAN_PREFIX_CHARS].split(maxsplit=6)[:6]
     for word in words:
         cleaned = word.strip(",.;:!?\"'()[]{}")
-        if cleaned in VI_TASK_VERBS:
-            return (cleaned, "vi")
-        if cleaned in EN_TASK_VERBS:
-            return (cleaned, "en")
+        lang = _TASK_VERB_INDEX.get(cleaned)
+        if lang:
+            return (cleaned, lang)
     return None
 
 
 def classify_subtype(prompt_lower):
     """Determine task subtype: bug-fix, investigation, or feature."""
-    if any(ind in prompt_lower for ind in BUG_FIX_INDICATORS):
+    head = prompt_lower[:SCAN_PREFIX_CHARS]
+    if _contains_any(head, _BUG_FIX_VOCAB):
         return "bug-fix"
-    if any(ind in prompt_lower for ind in INVESTIGATION_INDICATORS):
+    if _contains_any(head, _INVESTIGATION_VOCAB):
         return "investigation"
     return "feature"
 
 
+def capped_view(prompt):
+    """Return the part of *prompt* that detect_intent() looks at.
+
+    Prompts up to PROMPT_VIEW_CHARS are returned unchanged; longer ones
+    become their head and tail joined by a newline (the tail keeps a
+    trailing "?" visible).
+    """
+    if len(prompt) <= PROMPT_VIEW_CHARS:
+        return prompt
+    return prompt[:PROMPT_VIEW_CHARS] + "\n" + prompt[-SCAN_PREFIX_CHARS:]
+
+
+def count_words(text, limit=CONFIDENCE_HIGH_WORDS):
+    """Count whitespace-separated words, stopping at *limit*.
+
+    Same as min(len(text.split()), limit), without splitting the whole
+    text.
+    """
+    return sum(1 for _ in itertools.islice(_WORD.finditer(text), limit))
+
+
 def detect_intent(prompt):
     """Detect task intent from a user prompt.
 
     Returns dict with keys: type, subtype, verb, language, confidence,
-    title_hint. Returns None if no task intent is detected.
+    title_hint. Returns None if no task intent is detected. Very long
+    prompts are judged on capped_view(), so a huge paste costs no more
+    than a few KB of text.
     """
-    if not prompt or not prompt.strip():
+    if not prompt:
+        return None
+    prompt = capped_view(prompt)
+    if not prompt.strip():
         return None
 
     if is_meta_command(prompt):
@@ -148,13 +223,13 @@ def detect_intent(prompt):
         return None
 
     verb, lang = verb_match
+    word_count = count_words(prompt)
     subtype = classify_subtype(prompt_lower)
     item_type = "investigation" if subtype == "investigation" else "task"
 
-    word_count = len(prompt.split())
     if word_count < SHORT_PROMPT_WORDS:
         confidence = "low"
-    elif word_count < 12:
+    elif word_count < CONFIDENCE_HIGH_WORDS:
         confidence = "medium"
     else:
         confidence = "high"
@@ -171,11 +246,229 @@ def detect_intent(prompt):
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Detect task intent in prompts")
+def train_main(argv):
+    """`auto_track.py train`: fit the hint filter model (see intent_model)."""
+    try:
+        from . import intent_model
+    except ImportError:
+        import intent_model
+
+    parser = argparse.ArgumentParser(
+        prog="auto_track.py train",
+        description="Train the auto-track hint model from tracker history",
+    )
+    parser.add_argument("--cwd", default=".", help="Project root directory")
+    parser.add_argument("--prompts", action="append", default=[], metavar="FILE",
+                        help='Extra JSONL prompt log of {"prompt": ..., "label": 0|1} (repeatable)')
+    args = parser.parse_args(argv)
+    cwd = os.path.abspath(args.cwd)
+
+    examples = intent_model.collect_examples(cwd, prompt_logs=args.prompts)
+    try:
+        model = intent_model.train(examples)
+    except ValueError as e:
+        print(f"Not enough training data: {e}", file=sys.stderr)
+        sys.exit(1)
+    path = os.path.join(cwd, intent_model.MODEL_FILE)
+    model.save(path)
+
+    correct = sum(
+        1 for feats, label in examples
+        if (model.score_features(feats) >= intent_model.THRESHOLD) == bool(label)
+    )
+    print(json.dumps({
+        "model": path,
+        "examples": len(examples),
+        "accepted": sum(label for _, label in examples),
+        "training_accuracy": round(correct / len(examples), 3),
+    }, indent=2))
+
+
+# Subtypes a corpus `expected` string may name, with the item type each implies
+EXPECTED_SUBTYPES = {"feature": "task", "bug-fix": "task", "investigation": "investigation"}
+
+
+def is_hint(result):
+    """True if the hook would show a hint for this detect_intent() result."""
+    return bool(result) and result.get("confidence") != "low"
+
+
+def _expected_label(record):
+    """Return (should_hint, subtype or None) for a corpus record, or None.
+
+    `expected` may be true/false/null (hint or not), or a subtype or type
+    name (a hint of that kind). Records with only a training-style
+    `label` of 0/1 are accepted too; records with neither are unlabelled.
+    """
+    if "expected" in record:
+        expected = record["expected"]
+    elif record.get("label") in (0, 1, True, False):
+        expected = bool(record["label"])
+    else:
+        return None
+    if isinstance(expected, str):
+        if expected in EXPECTED_SUBTYPES:
+            return True, expected
+        return expected in EXPECTED_SUBTYPES.values(), None
+    return bool(expected), None
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _ratio(num, den):
+    return round(num / den, 4) if den else None
+
+
+def evaluate(records, repeat=1, max_errors=0):
+    """Replay corpus *records* through detect_intent() and score them.
+
+    *records* are dicts with a `prompt` and an optional `expected` label
+    (see _expected_label). Every prompt is classified *repeat* times for
+    the latency figures; accuracy uses the first pass. Returns a report
+    dict; up to *max_errors* misclassified prompts are listed under
+    "errors".
+    """
+    prompts = [r["prompt"] for r in records]
+    timings = []
+    results = []
+    clock = time.perf_counter
+    start = clock()
+    for attempt in range(max(1, repeat)):
+        for prompt in prompts:
+            t0 = clock()
+            result = detect_intent(prompt)
+            timings.append(clock() - t0)
+            if not attempt:
+                results.append(result)
+    elapsed = clock() - start
+
+    counts = {"tp": 0, "fp": 0, "fn": 0, "tn": 0}
+    subtype_total = subtype_correct = 0
+    errors = []
+    for record, result in zip(records, results):
+        label = _expected_label(record)
+        if label is None:
+            continue
+        expected, subtype = label
+        predicted = is_hint(result)
+        counts[("t" if predicted == expected else "f") + ("p" if predicted else "n")] += 1
+        wrong = predicted != expected
+        if subtype and predicted:
+            subtype_total += 1
+            if result["subtype"] == subtype:
+                subtype_correct += 1
+            else:
+                wrong = True
+        if wrong and len(errors) < max_errors:
+            errors.append({
+                "prompt": record["prompt"][:120],
+                "expected": record.get("expected", expected),
+                "got": result and {k: result[k] for k in ("subtype", "confidence", "verb")},
+            })
+
+    timings.sort()
+    ms = 1000.0
+    precision = _ratio(counts["tp"], counts["tp"] + counts["fp"])
+    recall = _ratio(counts["tp"], counts["tp"] + counts["fn"])
+    report = {
+        "prompts": len(prompts),
+        "labelled": sum(counts.values()),
+        "runs": len(timings),
+        "throughput_per_sec": round(len(timings) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": round(sum(timings) * ms / len(timings), 4) if timings else 0.0,
+            "p50": round(_percentile(timings, 50) * ms, 4),
+            "p99": round(_percentile(timings, 99) * ms, 4),
+            "max": round(timings[-1] * ms, 4) if timings else 0.0,
+        },
+        "confusion": counts,
+        "precision": precision,
+        "recall": recall,
+        "f1": (round(2 * precision * recall / (precision + recall), 4)
+               if precision and recall else None),
+        "subtype_accuracy": _ratio(subtype_correct, subtype_total),
+    }
+    if max_errors:
+        report["errors"] = errors
+    return report
+
+
+def load_corpus(path):
+    """Read a JSONL corpus into (records, skipped_line_count).
+
+    Each line is {"prompt": ..., "expected": ...} or a bare JSON string.
+    """
+    records = []
+    skipped = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if isinstance(record, str):
+                record = {"prompt": record}
+            if not isinstance(record, dict) or not isinstance(record.get("prompt"), str):
+                skipped += 1
+                continue
+            records.append(record)
+    return records, skipped
+
+
+def bench_main(argv):
+    """`auto_track.py bench`: replay a prompt corpus through detect_intent."""
+    parser = argparse.ArgumentParser(
+        prog="auto_track.py bench",
+        description="Measure detect_intent latency and accuracy on a JSONL prompt corpus",
+    )
+    parser.add_argument("--corpus", required=True, metavar="FILE",
+                        help='JSONL of {"prompt": ..., "expected": true|false|<subtype>}')
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Classify the corpus this many times for timing (default: 1)")
+    parser.add_argument("--show-errors", type=int, default=0, metavar="N",
+                        help="List up to N misclassified prompts")
+    args = parser.parse_args(argv)
+
+    try:
+        records, skipped = load_corpus(args.corpus)
+    except OSError as e:
+        print(f"Cannot read corpus: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not records:
+        print(f"No prompts in corpus: {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+
+    report = evaluate(records, repeat=args.repeat, max_errors=args.show_errors)
+    report["skipped_lines"] = skipped
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "train":
+        train_main(argv[1:])
+        return
+    if argv and argv[0] == "bench":
+        bench_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Detect task intent in prompts",
+        epilog="Subcommands: train --cwd <project> (fit the hint model), "
+               "bench --corpus <prompts.jsonl> (latency and precision/recall)",
+    )
     parser.add_argument("prompt", nargs="?", help="Prompt text (default: stdin)")
     parser.add_argument("--json", action="store_true", help="Output JSON")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     text = args.prompt if args.prompt else sys.stdin.read()
     result = detect_intent(text)
@@ -0,0 +1,343 @@
+"""
+Read staged file content straight from the git index.
+
+The quality gate must check what is about to be committed, not whatever
+happens to be in the working tree (a partially staged file differs). This
+module lists staged entries with one `git diff --cached --raw` call and
+reads every blob through a single `git cat-file --batch` process, so the
+number of subprocesses stays constant no matter how many files are staged.
+Sizes come from the object headers.
+
+For `scope: added_lines` in quality-rules.yaml, staged_added_lines() parses
+one `git diff --cached -U0` into the added lines of every staged file, with
+their line numbers in the staged version.
+"""
+import re
+import subprocess
+import threading
+
+# Gitlinks (submodule commits) have no blob to read
+GITLINK_MODE = "160000"
+
+_ZERO_SHA = "0" * 40
+_SKIP_CHUNK = 1024 * 1024
+
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+
+def staged_entries(cwd, timeout=10):
+    """List staged changes from `git diff --cached --raw -z`.
+
+    Returns a list of {path, status, mode, sha, old_sha} dicts in git's
+    order, or None if git is unavailable or cwd is not a repository.
+    Renames are reported as delete + add.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev", "--no-renames"],
+            cwd=cwd, capture_output=True, timeout=timeout,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    fields = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    entries = []
+    # Each record is ":<old mode> <new mode> <old sha> <new sha> <status>" NUL <path> NUL
+    for i in range(0, len(fields) - 1, 2):
+        meta = fields[i].lstrip(":").split()
+        if len(meta) < 5:
+            continue
+        _old_mode, mode, old_sha, sha, status = meta[:5]
+        entries.append({
+            "path": fields[i + 1],
+            "status": status[:1],
+            "mode": mode,
+            "sha": sha,
+            "old_sha": None if old_sha == _ZERO_SHA else old_sha,
+        })
+    return entries
+
+
+def tracked_entries(cwd, timeout=60):
+    """List every file in the index from `git ls-files -s -z`.
+
+    Returns a list of {path, mode, sha} dicts in index order, or None if
+    git is unavailable or cwd is not a repository. Unmerged paths (stage
+    1-3) and gitlinks are left out.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-s", "-z"], cwd=cwd, capture_output=True, timeout=timeout,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    entries = []
+    # Each record is "<mode> <sha> <stage>\t<path>" NUL
+    for record in result.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        meta, sep, path = record.partition("\t")
+        if not sep:
+            continue
+        fields = meta.split()
+        if len(fields) != 3 or fields[2] != "0" or fields[0] == GITLINK_MODE:
+            continue
+        entries.append({"path": path, "mode": fields[0], "sha": fields[1]})
+    return entries
+
+
+def read_blobs(cwd, shas, max_bytes=None, timeout=30, headers_only=False):
+    """Read blobs with one `git cat-file --batch` process.
+
+    Returns {sha: (data, size)} where data is bytes, or None for blobs
+    larger than *max_bytes* (their content is streamed past, never held in
+    memory). With *headers_only*, only sizes are read (`--batch-check`)
+    and data is always None. Missing objects are left out. Returns None if
+    git fails.
+    """
+    unique = list(dict.fromkeys(shas))
+    if not unique:
+        return {}
+
+    try:
+        proc = subprocess.Popen(
+            ["git", "cat-file", "--batch-check" if headers_only else "--batch"], cwd=cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    def _feed():
+        # Separate thread: git stops reading stdin while its stdout is full
+        try:
+            proc.stdin.write(("\n".join(unique) + "\n").encode("ascii"))
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+
+    writer = threading.Thread(target=_feed, daemon=True)
+    writer.start()
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+
+    blobs = {}
+    try:
+        for sha in unique:
+            header = proc.stdout.readline().split()
+            if not header:
+                return None  # git exited early (killed or bad repo)
+            if header[-1] == b"missing" or len(header) < 3:
+                continue
+            size = int(header[2])
+            if headers_only:
+                blobs[sha] = (None, size)
+                continue
+            if max_bytes is not None and size > max_bytes:
+                remaining = size
+                while remaining > 0:
+                    skipped = len(proc.stdout.read(min(remaining, _SKIP_CHUNK)))
+                    if not skipped:
+                        return None
+                    remaining -= skipped
+                data = None
+            else:
+                data = proc.stdout.read(size)
+                if len(data) != size:
+                    return None
+            proc.stdout.read(1)  # Trailing newline after the object
+            blobs[sha] = (data, size)
+    except (OSError, ValueError):
+        return None
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        writer.join()
+    return blobs
+
+
+def decode_blob(data):
+    """Decode blob bytes the way the gate reads working-tree files.
+
+    UTF-8 with undecodable bytes dropped and universal newlines, matching
+    open(path, "r", encoding="utf-8", errors="ignore").
+    """
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def staged_blobs(cwd, paths=None, max_bytes=None, entries=None, decode=True):
+    """Return [(path, content, size)] for staged files, read from the index.
+
+    *paths* limits which staged files are read (default: all); *entries*
+    reuses an earlier staged_entries() result. Deleted files and gitlinks
+    are skipped. Blobs over *max_bytes* get empty content with their real
+    size so size checks still fire. With decode=False content is the raw
+    blob bytes. Returns None if the index cannot be read.
+    """
+    if entries is None:
+        entries = staged_entries(cwd)
+        if entries is None:
+            return None
+
+    wanted = None if paths is None else set(paths)
+    selected = [
+        e for e in entries
+        if e["status"] != "D" and e["mode"] != GITLINK_MODE
+        and (wanted is None or e["path"] in wanted)
+    ]
+    blobs = read_blobs(cwd, [e["sha"] for e in selected], max_bytes=max_bytes)
+    if blobs is None:
+        return None
+
+    result = []
+    for e in selected:
+        blob = blobs.get(e["sha"])
+        if blob is None:
+            continue
+        data, size = blob
+        if data is None:
+            content = "" if decode else b""
+        else:
+            content = decode_blob(data) if decode else data
+        result.append((e["path"], content, size))
+    return result
+
+
+def _unquote_path(raw):
+    """Undo git's C-style quoting of a path in diff headers."""
+    if not (raw.startswith('"') and raw.endswith('"')):
+        return raw
+    body = raw[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c == "\\" and i + 1 < len(body):
+            nxt = body[i + 1]
+            if nxt in "01234567":
+                out.append(int(body[i + 1:i + 4], 8))
+                i += 4
+                continue
+            out.append(_ESCAPES.get(nxt, ord(nxt)))
+            i += 2
+            continue
+        out.extend(c.encode("utf-8", errors="surrogateescape"))
+        i += 1
+    return out.decode("utf-8", errors="surrogateescape")
+
+
+def parse_added_lines(diff_text):
+    """Parse `git diff -U0` output into {path: [(line_no, text), ...]}.
+
+    Line numbers are positions in the new (staged) file. Deleted files
+    and binary changes have no added lines and are left out.
+    """
+    added = {}
+    path = None
+    line_no = 0
+    in_hunk = False
+    for line in diff_text.split("\n"):
+        if line.startswith("diff --git "):
+            path = None
+            in_hunk = False
+            continue
+        if not in_hunk:
+            if line.startswith("+++ "):
+                target = _unquote_path(line[4:].rstrip("\t"))
+                path = target[2:] if target.startswith("b/") else None
+                continue
+            if not line.startswith("@@"):
+                continue
+        if line.startswith("@@"):
+            m = _HUNK_HEADER.match(line)
+            if m:
+                line_no = int(m.group(1))
+                in_hunk = True
+            continue
+        if line.startswith("+"):
+            if path is not None:
+                text = line[1:]
+                if text.endswith("\r"):
+                    text = text[:-1]
+                added.setdefault(path, []).append((line_no, text))
+            line_no += 1
+        elif line.startswith(" "):
+            line_no += 1
+    return added
+
+
+def staged_added_lines(cwd, timeout=10):
+    """Return {path: [(line_no, text), ...]} for lines added in the index.
+
+    Runs `git diff --cached -U0` once for all staged files, bypassing
+    textconv and external diff drivers so the lines are the staged bytes.
+    Undecodable bytes come back as surrogate escapes (see
+    staged_additions). Returns None if git fails.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotePath=false", "diff", "--cached", "-U0",
+             "--no-color", "--no-ext-diff", "--no-textconv", "--no-renames",
+             "--src-prefix=a/", "--dst-prefix=b/"],
+            cwd=cwd, capture_output=True, timeout=timeout,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    # Same decoding as staged_entries(), so non-UTF-8 paths key the same
+    return parse_added_lines(result.stdout.decode("utf-8", errors="surrogateescape"))
+
+
+def staged_additions(cwd, paths=None, entries=None):
+    """Like staged_blobs(), but content is only the lines each file adds.
+
+    Returns [(path, content, size, line_numbers)]: content joins the added
+    lines, line_numbers[i] is the staged-file line number of content line
+    i, and size is the full blob size (from `git cat-file --batch-check`).
+    Returns None if the index or diff cannot be read.
+    """
+    if entries is None:
+        entries = staged_entries(cwd)
+        if entries is None:
+            return None
+
+    wanted = None if paths is None else set(paths)
+    selected = [
+        e for e in entries
+        if e["status"] != "D" and e["mode"] != GITLINK_MODE
+        and (wanted is None or e["path"] in wanted)
+    ]
+    added = staged_added_lines(cwd)
+    if added is None:
+        return None
+    sizes = read_blobs(cwd, [e["sha"] for e in selected], headers_only=True)
+    if sizes is None:
+        return None
+
+    result = []
+    for e in selected:
+        if e["sha"] not in sizes:
+            continue
+        texts = []
+        numbers = []
+        for line_no, text in added.get(e["path"], []):
+            # Match str.splitlines() so content lines and numbers stay aligned
+            for part in text.splitlines() or [""]:
+                texts.append(part)
+                numbers.append(line_no)
+        content = "\n".join(texts)
+        if not content.isascii():
+            # Drop undecodable bytes, as decode_blob() does for whole files
+            content = content.encode("utf-8", "surrogateescape").decode("utf-8", "ignore")
+        result.append((e["path"], content, sizes[e["sha"]][1], numbers))
+    return result
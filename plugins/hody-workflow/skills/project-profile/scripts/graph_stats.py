@@ -0,0 +1,259 @@
+"""
+Streaming statistics for Graphify's graphify-out/graph.json.
+
+graph.json (NetworkX node-link format) can grow well past 10 MB on large
+codebases. Readers that only need counts — the SessionStart hook and the
+KB index builder — should not json.load the whole file. This module walks
+the top-level object in fixed-size chunks, decoding nodes and links a chunk
+at a time, and computes:
+
+  - node_count / edge_count
+  - per-module node counts (dirname of each node's source_file)
+  - in-degree per node, reduced to the top god nodes
+
+Results are written to a small `graph.stats.json` sidecar next to
+graph.json, keyed by the graph's mtime and size, so later readers skip the
+scan entirely. Memory stays bounded by the chunk size plus the per-node
+label and in-degree tables.
+"""
+import json
+import os
+import re
+
+STATS_VERSION = 1
+SIDECAR_NAME = "graph.stats.json"
+CHUNK_SIZE = 256 * 1024
+DEFAULT_TOP_N = 10
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Sliding text buffer over a file, refilled on demand."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk, dropping consumed text. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} in graph.json, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode one complete JSON value starting at the cursor."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the buffer end may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _batch_cut(buf, pos):
+    """Return the index just past the last "}," or "}]" in *buf*, or -1."""
+    cut = max(buf.rfind("},", pos), buf.rfind("}]", pos))
+    return cut + 1 if cut >= 0 else -1
+
+
+def _iter_array(reader):
+    """Yield elements of the JSON array at the cursor.
+
+    Node and link arrays hold objects, so most of a chunk is decoded in one
+    json.loads call: everything up to the last "}," / "}]" is wrapped in
+    brackets and parsed as a list. If that cut falls inside a string or a
+    nested object the wrapped text is never valid JSON, so a successful
+    parse always ends on a real element boundary. On failure the rest of
+    the chunk is decoded one element at a time.
+    """
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    skip_ws = _WHITESPACE.match
+    decode = _decoder.raw_decode
+    batch_ok = True
+    while True:
+        buf = reader.buf
+        pos = skip_ws(buf, reader.pos).end()
+
+        cut = _batch_cut(buf, pos) if batch_ok else -1
+        if cut > pos:
+            try:
+                items = json.loads("[" + buf[pos:cut] + "]")
+            except ValueError:
+                items = None
+                batch_ok = False
+            if items is not None:
+                sep = buf[cut]
+                reader.pos = cut + 1
+                yield from items
+                if sep == "]":
+                    return
+                continue
+
+        try:
+            obj, end = decode(buf, pos)
+            end = skip_ws(buf, end).end()
+        except json.JSONDecodeError:
+            end = len(buf)
+        if end >= len(buf):
+            # Element or its separator is cut off by the chunk boundary
+            reader.pos = pos
+            if not reader.fill():
+                raise ValueError("Truncated array in graph.json")
+            batch_ok = True
+            continue
+        sep = buf[end]
+        if sep not in ",]":
+            raise ValueError(f"Expected ',' or ']' in graph.json, got {sep!r}")
+        reader.pos = end + 1
+        yield obj
+        if sep == "]":
+            return
+
+
+def compute_graph_stats(graph_path, top_n=DEFAULT_TOP_N, chunk_size=CHUNK_SIZE):
+    """Scan graph.json in chunks and return a stats dict.
+
+    Keys: node_count, edge_count, modules ({dir: count}), god_nodes
+    ([{id, label, in_degree}], top *top_n* by in-degree).
+
+    Raises ValueError (including json.JSONDecodeError) on malformed input
+    and OSError if the file cannot be read.
+    """
+    node_count = 0
+    edge_count = 0
+    modules = {}
+    labels = {}
+    in_deg = {}
+
+    with open(graph_path, "r", encoding="utf-8") as f:
+        reader = _ChunkReader(f, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.value()
+                reader.expect(":")
+                if key == "nodes" and reader.peek() == "[":
+                    for node in _iter_array(reader):
+                        node_count += 1
+                        if not isinstance(node, dict):
+                            continue
+                        d = os.path.dirname(node.get("source_file", "") or "") or "."
+                        modules[d] = modules.get(d, 0) + 1
+                        if "id" in node:
+                            labels[node["id"]] = node.get("label", node["id"])
+                elif key in ("links", "edges") and reader.peek() == "[":
+                    for edge in _iter_array(reader):
+                        edge_count += 1
+                        if isinstance(edge, dict):
+                            tgt = edge.get("target")
+                            if tgt:
+                                in_deg[tgt] = in_deg.get(tgt, 0) + 1
+                else:
+                    reader.value()  # Skip unrelated keys (graph, directed, ...)
+                if reader.expect(",}") == "}":
+                    break
+
+    scored = sorted(in_deg.items(), key=lambda x: -x[1])
+    god_nodes = []
+    for nid, deg in scored:
+        if len(god_nodes) >= top_n:
+            break
+        if nid in labels:
+            god_nodes.append({"id": nid, "label": labels[nid], "in_degree": deg})
+
+    return {
+        "node_count": node_count,
+        "edge_count": edge_count,
+        "modules": modules,
+        "god_nodes": god_nodes,
+    }
+
+
+def sidecar_path(graph_path):
+    """Return the graph.stats.json path next to *graph_path*."""
+    return os.path.join(os.path.dirname(graph_path), SIDECAR_NAME)
+
+
+def _source_key(graph_path):
+    st = os.stat(graph_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def load_graph_stats(graph_path, write_sidecar=True):
+    """Return stats for *graph_path*, reusing graph.stats.json when fresh.
+
+    Returns None if graph.json is missing or malformed.
+    """
+    try:
+        source = _source_key(graph_path)
+    except OSError:
+        return None
+
+    side = sidecar_path(graph_path)
+    try:
+        with open(side, "r") as f:
+            cached = json.load(f)
+        if (isinstance(cached, dict)
+                and cached.get("version") == STATS_VERSION
+                and cached.get("source") == source):
+            return cached.get("stats")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        stats = compute_graph_stats(graph_path)
+    except (OSError, ValueError):
+        return None
+
+    if write_sidecar:
+        tmp_path = f"{side}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": STATS_VERSION, "source": source, "stats": stats}, f)
+            os.replace(tmp_path, side)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    return stats
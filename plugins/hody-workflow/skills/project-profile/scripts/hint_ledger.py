@@ -0,0 +1,126 @@
+"""
+Per-session ledger of auto-track hints.
+
+While the user iterates on one task, most of their prompts still look like
+task requests. The UserPromptSubmit hook consults this ledger before it
+shows a hint and stays quiet when, in the same session:
+
+  - a hint with the same normalized title was shown within
+    DEDUPE_WINDOW_SECONDS, or
+  - any hint was shown within DEBOUNCE_SECONDS
+
+The ledger lives in `.hody/cache/hint_ledger.json`. It also caches whether
+`.hody/state.json` has an active workflow, keyed by the file's mtime and
+size, so repeated prompts skip parsing state.json. Only the newest
+MAX_SESSIONS sessions are kept. The file is local-only and safe to delete.
+"""
+import hashlib
+import json
+import os
+import re
+
+LEDGER_FILE = os.path.join(".hody", "cache", "hint_ledger.json")
+STATE_FILE = os.path.join(".hody", "state.json")
+
+DEDUPE_WINDOW_SECONDS = 30 * 60
+DEBOUNCE_SECONDS = 60
+MAX_SESSIONS = 20
+
+# Title words that count for deduplication
+TITLE_KEY_WORDS = 12
+
+_WORD = re.compile(r"\w+")
+
+
+def title_key(title):
+    """Hash of a title's first words, ignoring case, punctuation and spacing."""
+    words = _WORD.findall(title.lower())[:TITLE_KEY_WORDS]
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+def load(cwd):
+    """Return the ledger dict ({"sessions": {...}, "workflow": {...}})."""
+    try:
+        with open(os.path.join(cwd, LEDGER_FILE), "r", encoding="utf-8") as f:
+            ledger = json.load(f)
+    except (OSError, ValueError):
+        ledger = None
+    if not isinstance(ledger, dict) or not isinstance(ledger.get("sessions"), dict):
+        ledger = {"sessions": {}}
+    return ledger
+
+
+def save(cwd, ledger):
+    """Write the ledger atomically. Failures are ignored."""
+    path = os.path.join(cwd, LEDGER_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(ledger, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _read_workflow_active(state_path):
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(state, dict) and state.get("status") == "in_progress"
+
+
+def workflow_active(cwd, ledger):
+    """Return (active, changed) for the workflow in state.json.
+
+    *active* is True for an in-progress workflow. The answer is cached in
+    *ledger* under state.json's (mtime_ns, size), so state.json is only
+    parsed when it changed; *changed* tells the caller to save the ledger.
+    """
+    try:
+        st = os.stat(os.path.join(cwd, STATE_FILE))
+    except OSError:
+        return False, ledger.pop("workflow", None) is not None
+    source = [st.st_mtime_ns, st.st_size]
+    cached = ledger.get("workflow")
+    if isinstance(cached, dict) and cached.get("source") == source:
+        return bool(cached.get("active")), False
+    active = _read_workflow_active(os.path.join(cwd, STATE_FILE))
+    ledger["workflow"] = {"source": source, "active": active}
+    return active, True
+
+
+def is_repeat(ledger, session_id, title, now):
+    """True if a hint for *title* should be suppressed in this session."""
+    session = ledger["sessions"].get(session_id or "")
+    if not isinstance(session, dict):
+        return False
+    last = session.get("last", 0)
+    if now - last < DEBOUNCE_SECONDS:
+        return True
+    shown = session.get("titles", {}).get(title_key(title))
+    return shown is not None and now - shown < DEDUPE_WINDOW_SECONDS
+
+
+def record(ledger, session_id, title, now):
+    """Note that a hint for *title* was shown, pruning expired entries."""
+    sessions = ledger["sessions"]
+    session = sessions.get(session_id or "")
+    if not isinstance(session, dict):
+        session = {}
+    titles = {
+        key: ts for key, ts in session.get("titles", {}).items()
+        if now - ts < DEDUPE_WINDOW_SECONDS
+    }
+    titles[title_key(title)] = now
+    sessions[session_id or ""] = {"last": now, "titles": titles}
+
+    if len(sessions) > MAX_SESSIONS:
+        newest = sorted(sessions, key=lambda s: sessions[s].get("last", 0), reverse=True)
+        for stale in newest[MAX_SESSIONS:]:
+            del sessions[stale]
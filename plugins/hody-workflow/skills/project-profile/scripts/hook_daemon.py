@@ -0,0 +1,443 @@
+"""
+Optional long-lived daemon for Hody Workflow hooks.
+
+Every hook event in hooks/hooks.json normally spawns a fresh interpreter,
+which then re-imports quality_rules, tracker, tracker_awareness and rules.
+PreToolUse fires on every Bash call, so that startup cost adds up quickly.
+
+The daemon keeps the hook modules imported in one process and answers hook
+requests over a Unix socket. Hook scripts stay thin clients: they call
+forward() with their stdin JSON and fall back to in-process execution when
+no daemon is listening (or when forwarding fails for any reason).
+
+Every request carries code_version(): the plugin version plus the mtime
+and size of the hook modules. A daemon started from other code answers
+"stale" instead of running the hook; the client then runs in-process and
+tells that daemon to exit.
+
+Usage:
+    python3 hook_daemon.py start [--socket PATH] [--foreground] [--idle-timeout SECS]
+    python3 hook_daemon.py stop [--socket PATH]
+    python3 hook_daemon.py status [--socket PATH]
+
+Set HODY_DAEMON=0 to disable forwarding, HODY_DAEMON_SOCKET to override
+the socket path. The client side only imports json, os, socket and stat.
+"""
+import json
+import os
+import socket
+import stat
+
+# Hook name -> module name in plugins/hody-workflow/hooks/
+HOOK_MODULES = {
+    "inject_project_context": "inject_project_context",
+    "quality_gate": "quality_gate",
+    "auto_track_hook": "auto_track_hook",
+}
+
+# Shut the daemon down after this many idle seconds (0 = never)
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+# Seconds a hook waits for the daemon before running in-process instead
+DEFAULT_TIMEOUT = 5
+
+# Only HODY_* variables are forwarded; handlers must not see the daemon's env
+ENV_PREFIX = "HODY_"
+
+_RECV_CHUNK = 65536
+
+
+def socket_dir(create=False):
+    """Return the per-user directory that holds the socket.
+
+    Uses $XDG_RUNTIME_DIR when set, otherwise a hody-<uid> directory under
+    $TMPDIR (created with mode 0700 when *create* is true). Returns None if
+    the directory is missing or not private to the current user.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        path = runtime
+    else:
+        tmpdir = os.environ.get("TMPDIR") or "/tmp"
+        path = os.path.join(tmpdir, f"hody-{_uid()}")
+        if create:
+            try:
+                os.mkdir(path, 0o700)
+            except FileExistsError:
+                pass
+            except OSError:
+                return None
+    return path if _is_private_dir(path) else None
+
+
+def socket_path():
+    """Return the Unix socket path shared by daemon and clients."""
+    override = os.environ.get("HODY_DAEMON_SOCKET")
+    if override:
+        return override
+    directory = socket_dir()
+    if directory is None:
+        tmpdir = os.environ.get("TMPDIR") or "/tmp"
+        directory = os.path.join(tmpdir, f"hody-{_uid()}")
+    return os.path.join(directory, "hody-daemon.sock")
+
+
+def _uid():
+    return os.getuid() if hasattr(os, "getuid") else 0
+
+
+def _is_private_dir(path):
+    """True if *path* is a real directory owned by us and closed to others."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid == _uid()
+            and not st.st_mode & 0o077)
+
+
+def _in_private_dir(path):
+    """True if nobody but us can create or replace entries next to *path*."""
+    try:
+        st = os.lstat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    return st.st_uid == _uid() and not st.st_mode & 0o022
+
+
+def _is_own_socket(path):
+    """True if *path* is our own socket in a directory others cannot write.
+
+    Another local user could otherwise pre-create the path, read every
+    forwarded payload and answer with forged hook output.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISSOCK(st.st_mode) and st.st_uid == _uid()
+            and _in_private_dir(path))
+
+
+def _hooks_dir():
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    plugin_root = os.path.dirname(os.path.dirname(os.path.dirname(scripts_dir)))
+    return os.path.join(plugin_root, "hooks")
+
+
+def code_version():
+    """Fingerprint of the hook code a daemon would run for this client.
+
+    The plugin.json version plus (path, mtime, size) of this file and of
+    every HOOK_MODULES file, so neither a plugin update nor an edited hook
+    is answered by a daemon that imported the old code.
+    """
+    hooks_dir = _hooks_dir()
+    manifest = os.path.join(os.path.dirname(hooks_dir), ".claude-plugin", "plugin.json")
+    try:
+        with open(manifest, "r") as f:
+            version = json.load(f).get("version")
+    except (OSError, ValueError, AttributeError):
+        version = None
+
+    files = [os.path.abspath(__file__)]
+    files += [os.path.join(hooks_dir, f"{name}.py") for name in HOOK_MODULES.values()]
+    parts = [str(version)]
+    for path in files:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{path}:-")
+    return "|".join(parts)
+
+
+def _request(path, payload, timeout):
+    """Send one JSON request and return the decoded JSON response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(payload).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(_RECV_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def forward(hook, input_data, timeout=DEFAULT_TIMEOUT):
+    """Forward a hook event to the daemon.
+
+    Returns (True, output) when the daemon handled the event — output is
+    the hook's JSON dict or None for "no output". Returns (False, None)
+    when there is no daemon or the request failed; the caller should then
+    run the hook in-process, so *timeout* must leave room for that within
+    the hook's own time limit.
+    """
+    if os.environ.get("HODY_DAEMON") == "0" or not hasattr(socket, "AF_UNIX"):
+        return False, None
+
+    path = socket_path()
+    if not _is_own_socket(path):
+        return False, None
+
+    env = {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+    request = {"hook": hook, "input": input_data, "env": env, "version": code_version()}
+    try:
+        response = _request(path, request, timeout)
+    except (OSError, ValueError):
+        return False, None
+
+    if not isinstance(response, dict):
+        return False, None
+    if response.get("stale"):
+        stop(path)  # Started from other code; the next `start` loads ours
+        return False, None
+    if not response.get("ok"):
+        return False, None
+    return True, response.get("output")
+
+
+def _ping(path=None, timeout=1.0):
+    """Return the daemon's ping response dict, or None if none answers."""
+    path = path or socket_path()
+    if not _is_own_socket(path):
+        return None
+    try:
+        response = _request(path, {"command": "ping"}, timeout)
+    except (OSError, ValueError):
+        return None
+    if isinstance(response, dict) and response.get("ok") is True:
+        return response
+    return None
+
+
+def ping(path=None, timeout=1.0):
+    """Return True if a daemon answers on the socket."""
+    return _ping(path, timeout) is not None
+
+
+def stop(path=None):
+    """Ask a running daemon to shut down. Returns True if one was running."""
+    path = path or socket_path()
+    if not _is_own_socket(path):
+        return False
+    try:
+        response = _request(path, {"command": "shutdown"}, 2.0)
+    except (OSError, ValueError):
+        return False
+    return isinstance(response, dict) and response.get("ok") is True
+
+
+# =====================================================================
+# Server side (only imported by the daemon process itself)
+# =====================================================================
+
+def load_handlers():
+    """Import every hook module once and return {hook: handle function}."""
+    import importlib
+    import sys
+
+    hooks_dir = _hooks_dir()
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    for d in (scripts_dir, hooks_dir):
+        if d not in sys.path:
+            sys.path.insert(0, d)
+
+    handlers = {}
+    for hook, module_name in HOOK_MODULES.items():
+        module = importlib.import_module(module_name)
+        handlers[hook] = module.handle
+    return handlers
+
+
+def dispatch(handlers, request, version=None):
+    """Run one request against the loaded handlers. Returns a response dict.
+
+    *version* is the code_version() the handlers were loaded from; hook
+    requests for any other version are answered {"stale": True} unrun.
+    """
+    if not isinstance(request, dict):
+        return {"ok": False, "error": "malformed request"}
+
+    command = request.get("command")
+    if command == "ping":
+        return {"ok": True, "pid": os.getpid(), "version": version}
+
+    if version is not None and request.get("version") != version:
+        return {"ok": False, "stale": True, "error": "hook code changed since the daemon started"}
+
+    handler = handlers.get(request.get("hook"))
+    if handler is None:
+        return {"ok": False, "error": f"unknown hook: {request.get('hook')}"}
+
+    try:
+        output = handler(request.get("input") or {}, env=request.get("env") or {})
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "output": output}
+
+
+def _listen_path(path=None):
+    """Resolve the socket path to listen on, creating the default directory."""
+    if path is None:
+        if not os.environ.get("HODY_DAEMON_SOCKET"):
+            socket_dir(create=True)
+        path = socket_path()
+    return path
+
+
+def serve(path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Run the daemon in the foreground until shutdown or idle timeout."""
+    import socketserver
+    import threading
+    import time
+
+    path = _listen_path(path)
+    if not _in_private_dir(path):
+        raise RuntimeError(f"Refusing to listen on {path}: its directory is "
+                           "not private to this user")
+    if os.path.lexists(path):
+        if not _is_own_socket(path):
+            raise RuntimeError(f"Refusing to reuse {path}: not a socket owned by this user")
+        if ping(path):
+            raise RuntimeError(f"Daemon already running on {path}")
+        os.unlink(path)  # Stale socket from a crashed daemon
+
+    version = code_version()  # Before importing, so edits made meanwhile count
+    handlers = load_handlers()
+    state = {"last_active": time.monotonic()}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            state["last_active"] = time.monotonic()
+            try:
+                request = json.loads(self.rfile.read().decode("utf-8"))
+            except ValueError:
+                request = None
+            if isinstance(request, dict) and request.get("command") == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            else:
+                response = dispatch(handlers, request, version)
+            self.wfile.write(json.dumps(response).encode("utf-8"))
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    old_umask = os.umask(0o077)  # Socket is private to the current user
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    def _watch_idle():
+        while True:
+            time.sleep(min(30, idle_timeout))
+            if time.monotonic() - state["last_active"] > idle_timeout:
+                server.shutdown()
+                return
+
+    if idle_timeout:
+        threading.Thread(target=_watch_idle, daemon=True).start()
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def start_background(path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, wait=3.0):
+    """Spawn a detached daemon process. Returns True once it answers."""
+    import subprocess
+    import sys
+    import time
+
+    path = _listen_path(path)
+    response = _ping(path)
+    if response is not None:
+        if response.get("version") == code_version():
+            return True
+        # Running older (or newer) code: replace it
+        stop(path)
+        deadline = time.monotonic() + wait
+        while os.path.lexists(path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "start", "--foreground",
+         "--socket", path, "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if ping(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    import argparse
+    import sys
+
+    parent = argparse.ArgumentParser(add_help=False)
+    parent.add_argument("--socket", default=None,
+                        help="Socket path (default: $HODY_DAEMON_SOCKET, else "
+                             "$XDG_RUNTIME_DIR or a private $TMPDIR/hody-<uid> directory)")
+    parser = argparse.ArgumentParser(description="Hody Workflow hook daemon")
+    sub = parser.add_subparsers(dest="command")
+    start_p = sub.add_parser("start", parents=[parent], help="Start the daemon")
+    start_p.add_argument("--foreground", action="store_true",
+                         help="Run in the current process instead of detaching")
+    start_p.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT,
+                         help="Exit after this many idle seconds (0 = never)")
+    sub.add_parser("stop", parents=[parent], help="Stop the daemon")
+    sub.add_parser("status", parents=[parent], help="Check whether the daemon is running")
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    path = args.socket or socket_path()
+
+    if args.command == "start":
+        if args.foreground:
+            try:
+                serve(args.socket, idle_timeout=args.idle_timeout)
+            except RuntimeError as e:
+                print(str(e), file=sys.stderr)
+                sys.exit(1)
+        elif start_background(args.socket, idle_timeout=args.idle_timeout):
+            print(f"Hody daemon running on {path}")
+        else:
+            print(f"Hody daemon failed to start on {path}", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.command == "stop":
+        if stop(path):
+            print("Hody daemon stopped")
+        else:
+            print("Hody daemon not running")
+
+    elif args.command == "status":
+        if ping(path):
+            print(f"Hody daemon running on {path}")
+        else:
+            print("Hody daemon not running")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
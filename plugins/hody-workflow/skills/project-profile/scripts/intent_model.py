@@ -0,0 +1,297 @@
+"""
+Learned filter for auto-track hints.
+
+detect_intent() decides whether a prompt looks like a task; this model
+decides whether the user is likely to actually track it. It is a logistic
+regression over hashed word unigrams and bigrams, trained offline by
+`auto_track.py train --cwd <project>` from:
+
+  - hints the UserPromptSubmit hook showed (`.hody/cache/intent_log.jsonl`).
+    Each hint carries an id that the suggested `tracker.py create
+    --hint-id` command stores on the item, so a hint is labeled positive
+    only when an item was created from it, and negative once it is
+    LABEL_WINDOW_SECONDS old without one
+  - optional JSONL prompt logs of {"prompt": ..., "label": 0|1}
+
+The log stores the hashed features the model uses, never prompt text.
+
+Weights are stored as a flat float32 array in `.hody/cache/intent_model.bin`
+and loaded lazily (once per process, reloaded when the file changes).
+Scoring hashes at most FEATURE_PREFIX_CHARS of the prompt, so it stays far
+below a millisecond. Without a model file every hint is shown, as before.
+"""
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+MODEL_FILE = os.path.join(".hody", "cache", "intent_model.bin")
+LOG_FILE = os.path.join(".hody", "cache", "intent_log.jsonl")
+
+MAGIC = b"HDIM"
+# Bump when the feature extraction or file layout changes
+MODEL_VERSION = 1
+_HEADER = struct.Struct("<4sHIf")
+
+# Hash space for features (float32 weights: 64KB on disk)
+N_FEATURES = 1 << 14
+
+# Only the start of a prompt carries the request
+FEATURE_PREFIX_CHARS = 400
+
+# Hints scoring below this are suppressed
+THRESHOLD = 0.5
+
+# A hint with no item created from it this long after it was shown counts
+# as ignored; younger hints are left out of training
+LABEL_WINDOW_SECONDS = 30 * 60
+
+# The hint log is trimmed to its newest half past this size
+MAX_LOG_BYTES = 512 * 1024
+
+# Training refuses to fit fewer examples than this (or a single class)
+MIN_EXAMPLES = 10
+
+_TOKEN = re.compile(r"\w+")
+
+
+def features(text):
+    """Return the sorted hashed feature indexes for *text*."""
+    tokens = _TOKEN.findall(text[:FEATURE_PREFIX_CHARS].lower())
+    names = [f"w:{t}" for t in tokens]
+    names.extend(f"b:{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    mask = N_FEATURES - 1
+    return sorted({zlib.crc32(name.encode("utf-8")) & mask for name in names})
+
+
+def _sigmoid(z):
+    if z < -30:
+        return 0.0
+    if z > 30:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+class IntentModel:
+    """Logistic regression weights over hashed features."""
+
+    def __init__(self, weights, bias):
+        self.weights = weights
+        self.bias = bias
+
+    def score(self, text):
+        """Probability that a hint for *text* leads to a tracked item."""
+        return self.score_features(features(text))
+
+    def score_features(self, feats):
+        """score() for already hashed feature indexes."""
+        w = self.weights
+        return _sigmoid(self.bias + sum(w[i] for i in feats))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        weights = array("f", self.weights)
+        if sys.byteorder != "little":
+            weights.byteswap()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, MODEL_VERSION, len(weights), self.bias))
+            f.write(weights.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse a model file; returns None if it is not a current model."""
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, count, bias = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != MODEL_VERSION or count != N_FEATURES:
+            return None
+        weights = array("f")
+        weights.frombytes(data[_HEADER.size:_HEADER.size + 4 * count])
+        if len(weights) != count:
+            return None
+        if sys.byteorder != "little":
+            weights.byteswap()
+        return cls(weights, bias)
+
+
+# (path, mtime_ns, size) -> IntentModel or None, so the hook daemon only
+# rereads the file when it changes
+_loaded = {}
+
+
+def load(cwd):
+    """Return the project's IntentModel, or None if none is trained."""
+    path = os.path.join(cwd, MODEL_FILE)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _loaded:
+        try:
+            with open(path, "rb") as f:
+                model = IntentModel.from_bytes(f.read())
+        except OSError:
+            model = None
+        _loaded.clear()
+        _loaded[key] = model
+    return _loaded[key]
+
+
+# =====================================================================
+# Hint log (written by the hook)
+# =====================================================================
+
+def new_hint_id():
+    """Return a fresh id linking a hint to the item created from it."""
+    return "hnt_" + os.urandom(6).hex()
+
+
+def log_hint(cwd, text, session_id=None, now=None):
+    """Append a shown hint to the training log and return its hint id.
+
+    Only the hashed features of *text* are stored. Never raises.
+    """
+    path = os.path.join(cwd, LOG_FILE)
+    hint_id = new_hint_id()
+    record = {"ts": int(now if now is not None else time.time()),
+              "session_id": session_id or "", "hint_id": hint_id,
+              "features": features(text)}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            size = f.tell()
+        if size > MAX_LOG_BYTES:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(lines[len(lines) // 2:])
+            os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return hint_id
+
+
+def _read_jsonl(path):
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+
+# =====================================================================
+# Training
+# =====================================================================
+
+def _acted_hint_ids(cwd):
+    """Return the hint ids recorded on tracker items (extra.hint_id)."""
+    import sqlite3
+    db_file = os.path.join(cwd, ".hody", "tracker.db")
+    if not os.path.isfile(db_file):
+        return set()
+    try:
+        conn = sqlite3.connect(db_file)
+        try:
+            rows = conn.execute(
+                "SELECT extra FROM items WHERE extra LIKE '%hint_id%'"
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return set()
+    ids = set()
+    for (extra,) in rows:
+        try:
+            hint_id = json.loads(extra).get("hint_id")
+        except (ValueError, TypeError, AttributeError):
+            continue
+        if isinstance(hint_id, str):
+            ids.add(hint_id)
+    return ids
+
+
+def _valid_features(feats):
+    return isinstance(feats, list) and all(
+        isinstance(i, int) and 0 <= i < N_FEATURES for i in feats
+    )
+
+
+def collect_examples(cwd, prompt_logs=(), now=None):
+    """Build [(feature indexes, label)] training examples for a project.
+
+    A logged hint is positive if a tracker item carries its hint id.
+    Hints younger than LABEL_WINDOW_SECONDS are left out: the user may
+    still create their item. Log lines from before hint ids (with prompt
+    text and no link to an item) are skipped.
+    """
+    now = now if now is not None else time.time()
+    acted = _acted_hint_ids(cwd)
+
+    examples = []
+    for record in _read_jsonl(os.path.join(cwd, LOG_FILE)):
+        ts, hint_id, feats = record.get("ts"), record.get("hint_id"), record.get("features")
+        if not isinstance(ts, (int, float)) or ts > now - LABEL_WINDOW_SECONDS:
+            continue
+        if not isinstance(hint_id, str) or not _valid_features(feats):
+            continue
+        examples.append((feats, 1 if hint_id in acted else 0))
+
+    for path in prompt_logs:
+        for record in _read_jsonl(path):
+            text, label = record.get("prompt"), record.get("label")
+            if text and label in (0, 1, True, False):
+                examples.append((features(text), int(label)))
+    return examples
+
+
+def train(examples, epochs=15, learning_rate=0.2, l2=1e-4, seed=0):
+    """Fit an IntentModel with class-balanced SGD.
+
+    *examples* are [(feature indexes, label)] as built by collect_examples().
+    Raises ValueError with fewer than MIN_EXAMPLES examples or when only
+    one class is present.
+    """
+    data = list(examples)
+    positives = sum(label for _, label in data)
+    negatives = len(data) - positives
+    if len(data) < MIN_EXAMPLES or not positives or not negatives:
+        raise ValueError(
+            f"need at least {MIN_EXAMPLES} examples of both classes "
+            f"(have {positives} accepted, {negatives} ignored)"
+        )
+
+    # Weight classes so the rarer one is not drowned out
+    class_weight = {1: len(data) / (2.0 * positives), 0: len(data) / (2.0 * negatives)}
+    weights = [0.0] * N_FEATURES
+    bias = 0.0
+    rng = random.Random(seed)
+    order = list(range(len(data)))
+    for _ in range(epochs):
+        rng.shuffle(order)
+        for idx in order:
+            feats, label = data[idx]
+            p = _sigmoid(bias + sum(weights[i] for i in feats))
+            grad = (p - label) * class_weight[label]
+            bias -= learning_rate * grad
+            for i in feats:
+                weights[i] -= learning_rate * (grad + l2 * weights[i])
+    return IntentModel(array("f", weights), bias)
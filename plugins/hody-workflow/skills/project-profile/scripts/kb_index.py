@@ -11,6 +11,12 @@ import os
 import re
 from datetime import datetime, timezone
 
+# Handle both package and direct imports
+try:
+    from .graph_stats import load_graph_stats
+except ImportError:
+    from graph_stats import load_graph_stats
+
 
 def parse_frontmatter(content):
     """Parse YAML frontmatter from markdown content.
@@ -129,53 +135,17 @@ def _load_graph_metadata(cwd):
     """Load graph stats and god nodes from graphify-out/graph.json.
 
     Returns a dict with node_count, edge_count, modules, god_nodes,
-    or None if the graph is not available.
+    or None if the graph is not available. Stats come from the streaming
+    counter in graph_stats (cached in graphify-out/graph.stats.json).
     """
     graph_path = os.path.join(cwd, "graphify-out", "graph.json")
     if not os.path.isfile(graph_path):
         return None
 
-    try:
-        with open(graph_path, "r") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
-
-    nodes = data.get("nodes", [])
-    edges = data.get("links") or data.get("edges") or []
-    if not nodes:
+    stats = load_graph_stats(graph_path)
+    if not stats or not stats.get("node_count"):
         return None
-
-    # Module counts
-    modules = {}
-    for n in nodes:
-        d = os.path.dirname(n.get("source_file", "")) or "."
-        modules[d] = modules.get(d, 0) + 1
-
-    # God nodes (top 10 by in-degree)
-    in_deg = {}
-    for e in edges:
-        tgt = e.get("target")
-        if tgt:
-            in_deg[tgt] = in_deg.get(tgt, 0) + 1
-
-    node_map = {n["id"]: n for n in nodes if "id" in n}
-    scored = sorted(in_deg.items(), key=lambda x: -x[1])
-    god_nodes = []
-    for nid, deg in scored[:10]:
-        if nid in node_map:
-            god_nodes.append({
-                "id": nid,
-                "label": node_map[nid].get("label", nid),
-                "in_degree": deg,
-            })
-
-    return {
-        "node_count": len(nodes),
-        "edge_count": len(edges),
-        "modules": modules,
-        "god_nodes": god_nodes,
-    }
+    return stats
 
 
 def build_index(kb_dir, cwd=None):
@@ -0,0 +1,156 @@
+"""
+Incremental whole-repository quality audit.
+
+`quality_rules.py audit --cwd <root>` runs the quality rules over every
+file in the git index, not just the staged ones, and prints a JSON report.
+The tree is listed with one `git ls-files -s` call, and each file's result
+is kept in `.hody/cache/audit.sqlite` next to the blob sha it was computed
+for. A re-audit only reads and scans blobs whose sha changed (or whose
+rules changed) since the last run; everything else is answered from the
+database. That keeps nightly audits of large repositories down to the
+listing and one indexed table read when little has changed.
+
+The audit always scans whole files (`scope` is ignored) and skips the same
+generated/vendored paths as the pre-commit gate (quality_rules.should_skip).
+The database is local-only and safe to delete at any time.
+"""
+import json
+import os
+import sqlite3
+
+try:
+    from . import git_index, quality_cache, quality_rules
+except ImportError:
+    import git_index
+    import quality_cache
+    import quality_rules
+
+AUDIT_DB = os.path.join(".hody", "cache", "audit.sqlite")
+
+# Bump when the table layout changes; older databases are recreated
+SCHEMA_VERSION = 1
+
+# Changed blobs are read and scanned this many at a time, so a first audit
+# of a huge repository never holds every file in memory at once
+AUDIT_BATCH = 2000
+
+
+def _connect(cwd):
+    path = os.path.join(cwd, AUDIT_DB)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.execute("DROP TABLE IF EXISTS results")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS results ("
+        " path TEXT PRIMARY KEY,"
+        " sha TEXT NOT NULL,"
+        " digest TEXT NOT NULL,"
+        " errors TEXT NOT NULL,"
+        " warnings TEXT NOT NULL)"
+    )
+    return conn
+
+
+def _decode_issues(text):
+    # Most files are clean; skip the JSON parser for them
+    return [] if text == "[]" else json.loads(text)
+
+
+def _scan(cwd, entries, rules, tables, workers=None):
+    """Read *entries* from the index and return {path: {errors, warnings}}."""
+    blobs = git_index.read_blobs(
+        cwd, [e["sha"] for e in entries], max_bytes=quality_rules.max_scan_bytes(rules)
+    )
+    if blobs is None:
+        return None
+    items = []
+    for e in entries:
+        blob = blobs.get(e["sha"])
+        if blob is None:
+            continue
+        data, size = blob
+        items.append((e["path"], data if data is not None else b"", size))
+    return quality_rules.run_checks_parallel(cwd, items, rules=rules, tables=tables, workers=workers)
+
+
+def audit(cwd, workers=None, batch_size=AUDIT_BATCH):
+    """Audit every tracked file and return the report dict.
+
+    Report keys: files (audited), scanned (read and checked this run),
+    reused (answered from audit.sqlite), errors / warnings ({path:
+    [issues]} for files that have any). Returns None if cwd is not a git
+    repository or the index cannot be read.
+    """
+    tracked = git_index.tracked_entries(cwd)
+    if tracked is None:
+        return None
+    entries = [e for e in tracked if not quality_rules.should_skip(e["path"])]
+
+    rules, tables = quality_rules.load_rule_set(cwd)
+    digest = quality_cache.rules_digest(rules)
+
+    conn = _connect(cwd)
+    try:
+        known = {
+            path: (sha, row_digest, errors, warnings)
+            for path, sha, row_digest, errors, warnings in conn.execute(
+                "SELECT path, sha, digest, errors, warnings FROM results"
+            )
+        }
+
+        results = {}
+        changed = []
+        for e in entries:
+            row = known.get(e["path"])
+            if row is not None and row[0] == e["sha"] and row[1] == digest:
+                results[e["path"]] = row
+            else:
+                changed.append(e)
+
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+            fresh = _scan(cwd, batch, rules, tables, workers=workers)
+            if fresh is None:
+                return None
+            rows = []
+            for e in batch:
+                if e["path"] not in fresh:
+                    continue  # Object missing from the repository
+                result = fresh[e["path"]]
+                row = (e["sha"], digest, json.dumps(result["errors"]), json.dumps(result["warnings"]))
+                results[e["path"]] = row
+                rows.append((e["path"],) + row)
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO results (path, sha, digest, errors, warnings)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+        gone = [(path,) for path in known if path not in results]
+        if gone:
+            with conn:
+                conn.executemany("DELETE FROM results WHERE path = ?", gone)
+    finally:
+        conn.close()
+
+    report = {
+        "files": len(entries),
+        "scanned": len(changed),
+        "reused": len(entries) - len(changed),
+        "errors": {},
+        "warnings": {},
+    }
+    for e in entries:
+        row = results.get(e["path"])
+        if row is None:
+            continue
+        errors = _decode_issues(row[2])
+        warnings = _decode_issues(row[3])
+        if errors:
+            report["errors"][e["path"]] = errors
+        if warnings:
+            report["warnings"][e["path"]] = warnings
+    return report
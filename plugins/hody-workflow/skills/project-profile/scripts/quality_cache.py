@@ -0,0 +1,151 @@
+"""
+Content-addressed result cache for the pre-commit quality gate.
+
+When a commit is denied, the user usually fixes one file and retries. The
+other staged blobs have not changed, so their issue lists are served from
+`.hody/cache/quality/` instead of being read and scanned again.
+
+Each entry is a small JSON file holding one file's {errors, warnings}. The
+key hashes everything the result depends on:
+
+  - the staged blob sha (content)
+  - the file path (language, ignore_paths, and the "file" field of issues)
+  - a digest of the effective rules, ENGINE_VERSION and the built-in
+    pattern tables (quality_rules.engine_fingerprint)
+  - in `scope: added_lines` mode, the previous blob sha (the diff base)
+
+Entries are evicted least-recently-used first (hits refresh the file's
+mtime) once the directory grows past MAX_CACHE_BYTES. The cache is
+local-only and safe to delete at any time.
+"""
+import hashlib
+import json
+import os
+
+try:
+    from . import quality_rules
+except ImportError:
+    import quality_rules
+
+CACHE_SUBDIR = os.path.join(".hody", "cache", "quality")
+
+# Bump whenever the scan engine can produce different results for the same
+# input, so entries written by an older engine are never reused.
+ENGINE_VERSION = 3
+
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+
+# After eviction the cache is trimmed to this fraction of MAX_CACHE_BYTES,
+# so eviction does not run again on the very next store
+EVICT_TARGET = 0.8
+
+
+def cache_dir(cwd):
+    return os.path.join(cwd, CACHE_SUBDIR)
+
+
+def rules_digest(rules):
+    """Hash the effective rules dict with ENGINE_VERSION and the built-ins.
+
+    The built-in secret/security patterns and rule packs are not part of
+    *rules*, so editing them would otherwise reuse stale results.
+    """
+    blob = json.dumps([ENGINE_VERSION, quality_rules.engine_fingerprint(), rules],
+                      sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def entry_key(digest, path, sha, base_sha=None):
+    """Return the cache key for one staged file."""
+    parts = [digest, path, sha, base_sha or ""]
+    return hashlib.sha256("\0".join(parts).encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def lookup(cwd, keys):
+    """Return {key: result} for the keys present in the cache.
+
+    Hits get their mtime bumped so they survive LRU eviction.
+    """
+    directory = cache_dir(cwd)
+    if not os.path.isdir(directory):
+        return {}
+    found = {}
+    for key in keys:
+        path = os.path.join(directory, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(result, dict) and "errors" in result and "warnings" in result:
+            found[key] = result
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+    return found
+
+
+def store(cwd, results, max_bytes=MAX_CACHE_BYTES):
+    """Write {key: result} entries, then evict if over *max_bytes*.
+
+    Failures (read-only checkout, full disk) are ignored — the cache is
+    an optimization only.
+    """
+    if not results:
+        return
+    directory = cache_dir(cwd)
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return
+    for key, result in results.items():
+        path = os.path.join(directory, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    evict(cwd, max_bytes)
+
+
+def evict(cwd, max_bytes=MAX_CACHE_BYTES):
+    """Delete least-recently-used entries while the cache exceeds *max_bytes*.
+
+    Returns the number of entries removed.
+    """
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir(cwd)) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+    except OSError:
+        return 0
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    target = int(max_bytes * EVICT_TARGET)
+    for _mtime, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -3,13 +3,43 @@ Configurable quality rule engine for Hody Workflow.
 
 Reads `.hody/quality-rules.yaml` for custom quality rules with severity levels.
 Falls back to built-in defaults when no config file exists.
+
+Usage:
+    python3 quality_rules.py audit --cwd <project>   # JSON report for the whole repo
 """
+import bisect
+import functools
+import itertools
+import mmap
 import os
 import re
+import sys
+
+
+# Scan scopes: "file" checks whole staged files, "added_lines" only the
+# lines a commit adds (from `git diff --cached -U0`)
+SCOPE_FILE = "file"
+SCOPE_ADDED_LINES = "added_lines"
+
+# Generated, vendored and binary files that neither the commit gate nor the
+# repository audit scans
+SKIP_EXTENSIONS = {".lock", ".sum", ".min.js", ".min.css", ".map", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".woff", ".woff2", ".ttf", ".eot"}
+SKIP_PATHS = {"node_modules/", "vendor/", "dist/", "build/", ".next/", "__pycache__/"}
+
+
+def should_skip(filepath):
+    """Check if a file is excluded from quality checks."""
+    if os.path.splitext(filepath)[1].lower() in SKIP_EXTENSIONS:
+        return True
+    # .min.js, .min.css and friends
+    if ".min." in os.path.basename(filepath).lower():
+        return True
+    return any(filepath.startswith(skip) for skip in SKIP_PATHS)
 
 
 DEFAULT_RULES = {
     "version": "1",
+    "scope": SCOPE_FILE,
     "rules": {
         "secrets": {
             "enabled": True,
@@ -28,6 +58,11 @@ DEFAULT_RULES = {
                 "javascript": ["console.log", "debugger"],
                 "python": ["breakpoint()"],
                 "go": ["fmt.Println"],
+                "rust": ["dbg!("],
+                "java": ["System.out.println", "printStackTrace()"],
+                "csharp": ["Debugger.Break()"],
+                "ruby": ["binding.pry", "byebug"],
+                "php": ["var_dump(", "print_r("],
             },
         },
         "file_size": {
@@ -58,7 +93,7 @@ BUILTIN_SECRET_PATTERNS = [
     (r'(?i)sk-[a-zA-Z0-9]{20,}', "Possible API secret key"),
 ]
 
-# Built-in security anti-patterns
+# Built-in security anti-patterns, checked in every file
 BUILTIN_SECURITY_PATTERNS = [
     (r'\beval\s*\(', "eval() usage — potential code injection"),
     (r'(?i)innerHTML\s*=', "innerHTML assignment — potential XSS"),
@@ -66,6 +101,70 @@ BUILTIN_SECURITY_PATTERNS = [
     (r'(?i)exec\s*\(\s*["\']', "exec() with string — potential injection"),
 ]
 
+# Per-language rule packs, one for each language detectors/ recognizes.
+# A pack lists the extensions it covers and extra anti-patterns for that
+# language, checked after the built-ins. Pack rules are always reported as
+# warnings, so they never block a commit the built-ins would let through.
+# Their regexes are compiled the first time a file of that language is
+# scanned (see _security_pack). Secret patterns stay global: credentials
+# end up in every kind of file.
+RULE_PACKS = {
+    "javascript": {
+        "extensions": [".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"],
+        "warnings": [],
+    },
+    "python": {
+        "extensions": [".py"],
+        "warnings": [
+            (r'\bpickle\.loads?\s*\(', "pickle.load() — unsafe deserialization"),
+            (r'\bshell\s*=\s*True\b', "subprocess with shell=True — potential command injection"),
+        ],
+    },
+    "go": {
+        "extensions": [".go"],
+        "warnings": [
+            (r'\bexec\.Command\s*\(\s*"(?:sh|bash)"', "exec.Command() through a shell — potential command injection"),
+            (r'\btemplate\.HTML\s*\(', "template.HTML() — unescaped HTML, potential XSS"),
+        ],
+    },
+    "rust": {
+        "extensions": [".rs"],
+        "warnings": [
+            (r'\bCommand::new\s*\(\s*"(?:sh|bash)"', "Command::new() through a shell — potential command injection"),
+        ],
+    },
+    "java": {
+        "extensions": [".java", ".kt", ".kts"],
+        "warnings": [
+            (r'\bRuntime\.getRuntime\(\)\s*\.exec\s*\(', "Runtime.exec() — potential command injection"),
+        ],
+    },
+    "csharp": {
+        "extensions": [".cs"],
+        "warnings": [
+            (r'\bProcess\.Start\s*\(', "Process.Start() — potential command injection"),
+        ],
+    },
+    "ruby": {
+        "extensions": [".rb", ".rake"],
+        "warnings": [
+            (r'\bMarshal\.load\s*\(', "Marshal.load() — unsafe deserialization"),
+        ],
+    },
+    "php": {
+        "extensions": [".php"],
+        "warnings": [
+            (r'\b(?:shell_exec|system|passthru)\s*\(\s*\$', "Shell call with a variable — potential command injection"),
+            (r'\bunserialize\s*\(\s*\$_', "unserialize() of request data — unsafe deserialization"),
+        ],
+    },
+}
+
+# File extension -> language key (rule pack and debug_statements language)
+EXT_TO_LANG = {
+    ext: lang for lang, pack in RULE_PACKS.items() for ext in pack["extensions"]
+}
+
 
 def _parse_yaml_simple(content):
     """Simple YAML parser for quality-rules.yaml (stdlib only).
@@ -165,7 +264,7 @@ def _parse_yaml_simple(content):
             nested = parent.get(current_nested_key) if isinstance(parent, dict) else None
 
             if stripped.startswith("- "):
-                item_content = stripped[2:].strip()
+                item = _parse_list_item(stripped[2:].strip())
                 # This is a list inside a third-level key
                 # Find the last dict-value that should be a list
                 if isinstance(nested, dict):
@@ -173,10 +272,12 @@ def _parse_yaml_simple(content):
                     for k in reversed(list(nested.keys())):
                         v = nested[k]
                         if isinstance(v, list):
-                            v.append(_parse_value(item_content.strip('"').strip("'")))
+                            v.append(item)
+                            current_list = v
                             break
                         elif isinstance(v, dict) and not v:
-                            nested[k] = [_parse_value(item_content.strip('"').strip("'"))]
+                            nested[k] = [item]
+                            current_list = nested[k]
                             break
                 continue
 
@@ -190,6 +291,19 @@ def _parse_yaml_simple(content):
     return result
 
 
+# "- key: value" list item that starts a dict (e.g. custom_patterns entries);
+# "- std::cout" or "- console.log" stay plain strings
+_LIST_DICT_ITEM = re.compile(r"^([A-Za-z_][\w-]*):(?:\s+(.*))?$")
+
+
+def _parse_list_item(item_content):
+    """Parse a nested "- ..." list item into a scalar or a one-key dict."""
+    m = _LIST_DICT_ITEM.match(item_content)
+    if m:
+        return {m.group(1): _parse_value((m.group(2) or "").strip())}
+    return _parse_value(item_content.strip('"').strip("'"))
+
+
 def _parse_value(val):
     """Parse a YAML scalar value."""
     if not val:
@@ -221,33 +335,241 @@ def get_default_rules():
     return copy.deepcopy(DEFAULT_RULES)
 
 
+def _merge_rules(content):
+    """Parse quality-rules.yaml content and merge it over DEFAULT_RULES."""
+    import copy
+    parsed = _parse_yaml_simple(content)
+    # Merge parsed into defaults so missing keys get defaults
+    defaults = copy.deepcopy(DEFAULT_RULES)
+    if "version" in parsed:
+        defaults["version"] = str(parsed["version"])
+    if parsed.get("scope") in (SCOPE_FILE, SCOPE_ADDED_LINES):
+        defaults["scope"] = parsed["scope"]
+    if "rules" in parsed and isinstance(parsed["rules"], dict):
+        for rule_name, rule_config in parsed["rules"].items():
+            if rule_name in defaults["rules"] and isinstance(rule_config, dict):
+                defaults["rules"][rule_name].update(rule_config)
+            else:
+                defaults["rules"][rule_name] = rule_config
+    return defaults
+
+
 def load_rules(cwd):
     """Read .hody/quality-rules.yaml, return parsed rules.
 
-    Falls back to DEFAULT_RULES if file doesn't exist.
+    Falls back to DEFAULT_RULES if file doesn't exist. The parsed result
+    is reused from the compiled-rules artifact while the file is unchanged
+    (see load_rule_set).
+    """
+    return load_rule_set(cwd)[0]
+
+
+# =====================================================================
+# Compiled-rules artifact (.hody/cache/quality-rules.json)
+# =====================================================================
+
+RULES_FILE = os.path.join(".hody", "quality-rules.yaml")
+ARTIFACT_FILE = os.path.join(".hody", "cache", "quality-rules.json")
+
+# Bump when the artifact layout changes
+ARTIFACT_VERSION = 1
+
+# A file modified this close to when it was last read may change again
+# within the same mtime tick, so its stat data alone is not trusted (the
+# same "racy clean" rule git applies to its index).
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+_engine_fingerprint = None
+
+
+def engine_fingerprint():
+    """Fingerprint of the built-in tables; artifacts from other versions are rebuilt."""
+    global _engine_fingerprint
+    if _engine_fingerprint is None:
+        import hashlib
+        import json
+        blob = json.dumps([ARTIFACT_VERSION, DEFAULT_RULES, BUILTIN_SECRET_PATTERNS,
+                           BUILTIN_SECURITY_PATTERNS, RULE_PACKS], sort_keys=True)
+        _engine_fingerprint = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    return _engine_fingerprint
+
+
+def build_pattern_tables(rules):
+    """Validate every pattern once and return the merged pattern tables.
+
+    Returns {secrets, invalid}: secrets is a [pattern, message, line_local]
+    list (built-ins then custom patterns) and invalid lists custom patterns
+    that failed to compile with the error. Security patterns are not part
+    of the tables; they come from the built-in rule packs, compiled per
+    language on first use.
+    """
+    invalid = []
+
+    def _table(entries):
+        table = []
+        for pattern, message in entries:
+            try:
+                regex = re.compile(pattern)
+            except (re.error, TypeError) as e:
+                invalid.append({"pattern": str(pattern), "message": message, "error": str(e)})
+                continue
+            table.append([pattern, message, _is_line_local(regex)])
+        return table
+
+    r = rules.get("rules", {})
+    entries = list(BUILTIN_SECRET_PATTERNS)
+    custom = r.get("secrets", {}).get("custom_patterns", [])
+    if isinstance(custom, list):
+        for entry in custom:
+            if isinstance(entry, dict) and entry.get("pattern", ""):
+                entries.append((
+                    entry["pattern"],
+                    entry.get("message", "Custom secret pattern match"),
+                ))
+
+    return {
+        "secrets": _table(entries),
+        "invalid": invalid,
+    }
+
+
+def _read_artifact(cwd):
+    import json
+    try:
+        with open(os.path.join(cwd, ARTIFACT_FILE), "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(artifact, dict) or artifact.get("engine") != engine_fingerprint():
+        return None
+    return artifact
+
+
+def _write_artifact(cwd, artifact):
+    import json
+    path = os.path.join(cwd, ARTIFACT_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(artifact, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_rule_set(cwd):
+    """Return (rules, tables) for a project.
+
+    tables is the build_pattern_tables() result, or None when there is no
+    quality-rules.yaml (built-in defaults). Parsing and pattern validation
+    run only when the file's mtime/size or content hash changes; otherwise
+    both come from the compiled-rules artifact. Invalid custom patterns are
+    reported on stderr once, when the artifact is built.
     """
     import copy
-    rules_path = os.path.join(cwd, ".hody", "quality-rules.yaml")
+    import hashlib
+    import time
+
+    rules_path = os.path.join(cwd, RULES_FILE)
+    try:
+        st = os.stat(rules_path)
+    except OSError:
+        return copy.deepcopy(DEFAULT_RULES), None
     if not os.path.isfile(rules_path):
-        return copy.deepcopy(DEFAULT_RULES)
+        return copy.deepcopy(DEFAULT_RULES), None
+
+    artifact = _read_artifact(cwd)
+    if artifact is not None:
+        source = artifact.get("source", {})
+        if (source.get("mtime_ns") == st.st_mtime_ns
+                and source.get("size") == st.st_size
+                and st.st_mtime_ns < artifact.get("checked_ns", 0) - RACY_WINDOW_NS):
+            return artifact["rules"], artifact["tables"]
 
     try:
-        with open(rules_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        parsed = _parse_yaml_simple(content)
-        # Merge parsed into defaults so missing keys get defaults
-        defaults = copy.deepcopy(DEFAULT_RULES)
-        if "version" in parsed:
-            defaults["version"] = str(parsed["version"])
-        if "rules" in parsed and isinstance(parsed["rules"], dict):
-            for rule_name, rule_config in parsed["rules"].items():
-                if rule_name in defaults["rules"] and isinstance(rule_config, dict):
-                    defaults["rules"][rule_name].update(rule_config)
-                else:
-                    defaults["rules"][rule_name] = rule_config
-        return defaults
+        with open(rules_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if artifact is not None and artifact.get("source", {}).get("sha256") == digest:
+            rules, tables = artifact["rules"], artifact["tables"]
+        else:
+            rules = _merge_rules(raw.decode("utf-8"))
+            tables = build_pattern_tables(rules)
+            for bad in tables["invalid"]:
+                print(
+                    f"[Hody] {RULES_FILE}: invalid pattern {bad['pattern']!r} "
+                    f"({bad['message']}) ignored: {bad['error']}",
+                    file=sys.stderr,
+                )
     except (OSError, UnicodeDecodeError):
-        return copy.deepcopy(DEFAULT_RULES)
+        return copy.deepcopy(DEFAULT_RULES), None
+
+    _write_artifact(cwd, {
+        "engine": engine_fingerprint(),
+        "source": {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest},
+        "checked_ns": time.time_ns(),
+        "rules": rules,
+        "tables": tables,
+    })
+    return rules, tables
+
+
+def _language_for(filepath):
+    """Return the rule-pack / debug_statements language key for a file, or ""."""
+    return EXT_TO_LANG.get(os.path.splitext(filepath)[1].lower(), "")
+
+
+# language -> compiled [(regex, message, line_local, severity)], filled on
+# first use
+_compiled_packs = {}
+
+
+def _security_pack(lang):
+    """Return the compiled security patterns for *lang*.
+
+    BUILTIN_SECURITY_PATTERNS come first with severity None (use the
+    configured security severity), then the language's pack rules with
+    severity "warning". Each pack is compiled once per process, the first
+    time a file of its language is checked, so a commit only pays for the
+    languages it touches. Files without a pack ("") get the built-ins only.
+    """
+    pack = _compiled_packs.get(lang)
+    if pack is None:
+        entries = [(pattern, message, None) for pattern, message in BUILTIN_SECURITY_PATTERNS]
+        entries += [
+            (pattern, message, "warning")
+            for pattern, message in RULE_PACKS.get(lang, {}).get("warnings", [])
+        ]
+        pack = []
+        for pattern, message, severity in entries:
+            regex = re.compile(pattern)
+            pack.append((regex, message, _is_line_local(regex), severity))
+        _compiled_packs[lang] = pack
+    return pack
+
+
+def _is_ignored_path(filepath, ignore_paths):
+    """True if *filepath* matches one of the security ignore_paths."""
+    if not isinstance(ignore_paths, list):
+        return False
+    for pattern in ignore_paths:
+        pattern = str(pattern)
+        if pattern.endswith("/"):
+            if pattern.rstrip("/") in filepath.lower():
+                return True
+        elif "*" in pattern:
+            # Simple glob: *.test.* -> check if ".test." is in filename
+            core = pattern.replace("*", "")
+            if core in os.path.basename(filepath).lower():
+                return True
+        else:
+            if pattern in filepath.lower():
+                return True
+    return False
 
 
 def check_secrets(content, lines, rules):
@@ -292,7 +614,8 @@ def check_secrets(content, lines, rules):
 def check_security(content, lines, filepath, rules):
     """Check security anti-patterns (eval, innerHTML, etc.).
 
-    Skip test files based on rules config.
+    The built-in patterns apply to every file; the rule pack for the
+    file's language adds warnings. Skip test files based on rules config.
     Returns list of {line, severity, message}.
     """
     security_rules = rules.get("rules", {}).get("security", {})
@@ -301,28 +624,16 @@ def check_security(content, lines, filepath, rules):
 
     # Check ignore paths
     ignore_paths = security_rules.get("ignore_paths", ["test/", "*.test.*", "*.spec.*"])
-    if isinstance(ignore_paths, list):
-        for pattern in ignore_paths:
-            pattern = str(pattern)
-            if pattern.endswith("/"):
-                if pattern.rstrip("/") in filepath.lower():
-                    return []
-            elif "*" in pattern:
-                # Simple glob: *.test.* -> check if ".test." is in filename
-                core = pattern.replace("*", "")
-                if core in os.path.basename(filepath).lower():
-                    return []
-            else:
-                if pattern in filepath.lower():
-                    return []
+    if _is_ignored_path(filepath, ignore_paths):
+        return []
 
     severity = security_rules.get("severity", "error")
     issues = []
 
-    for pattern, message in BUILTIN_SECURITY_PATTERNS:
+    for regex, message, _line_local, pack_severity in _security_pack(_language_for(filepath)):
         for i, line in enumerate(lines, 1):
-            if re.search(pattern, line):
-                issues.append({"line": i, "severity": severity, "message": message})
+            if regex.search(line):
+                issues.append({"line": i, "severity": pack_severity or severity, "message": message})
                 break
 
     return issues
@@ -344,18 +655,7 @@ def check_debug_statements(content, lines, filepath, rules):
         return []
 
     # Determine language from file extension
-    ext = os.path.splitext(filepath)[1].lower()
-    ext_to_lang = {
-        ".js": "javascript",
-        ".jsx": "javascript",
-        ".ts": "javascript",
-        ".tsx": "javascript",
-        ".mjs": "javascript",
-        ".cjs": "javascript",
-        ".py": "python",
-        ".go": "go",
-    }
-    lang = ext_to_lang.get(ext, "")
+    lang = _language_for(filepath)
     if not lang:
         return []
 
@@ -364,6 +664,21 @@ def check_debug_statements(content, lines, filepath, rules):
         return []
 
     issues = []
+    if len(patterns) >= AC_MIN_PATTERNS and lines:
+        # One multi-literal pass instead of patterns x lines substring tests
+        literals = [str(pat) for pat in patterns]
+        line_starts = [0]
+        line_starts.extend(itertools.accumulate(len(x) + 1 for x in lines))
+        firsts = _first_literal_lines(literals, "\n".join(lines), line_starts)
+        for pat_str, line_no in zip(literals, firsts):
+            if line_no:
+                issues.append({
+                    "line": line_no,
+                    "severity": severity,
+                    "message": f"Debug statement: {pat_str}",
+                })
+        return issues
+
     for pat in patterns:
         pat_str = str(pat)
         for i, line in enumerate(lines, 1):
@@ -462,6 +777,634 @@ def _route_issue(issue, filepath, errors, warnings):
         warnings.append(entry)
 
 
+# =====================================================================
+# Batch scanning (one rule load + compile for a whole commit)
+# =====================================================================
+
+def _is_line_local(regex):
+    """True if every match of *regex* inside a single line is also a match
+    at the same position when the whole file is searched.
+
+    Anchors, lookarounds, backreferences and conditionals can see text
+    outside the line, so patterns using them are scanned line by line.
+    """
+    if regex.flags & re.VERBOSE:
+        return False
+    pattern = regex.pattern
+    i, n, in_class = 0, len(pattern), False
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if not in_class and (nxt in ("A", "Z") or "1" <= nxt <= "9"):
+                return False
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            i += 1
+            if pattern[i:i + 1] == "^":
+                i += 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            continue
+        elif c in "^$":
+            return False
+        elif pattern.startswith(("(?=", "(?!", "(?<", "(?P=", "(?("), i):
+            return False
+        i += 1
+    return True
+
+
+def _compile_table(table):
+    """Compile [pattern, message, line_local] rows from build_pattern_tables()."""
+    compiled = []
+    for pattern, message, line_local in table:
+        try:
+            compiled.append((re.compile(pattern), message, line_local))
+        except (re.error, TypeError):
+            pass
+    return compiled
+
+
+def compile_rules(rules, tables=None):
+    """Precompile a rules dict (from load_rules) for repeated scanning.
+
+    *tables* are the validated pattern tables from load_rule_set(); they
+    are built from *rules* when not given. Returns a dict holding compiled
+    regexes per check plus a cache of per-file check lists, one per
+    (security active, language) pair. Security rule packs are not compiled
+    here but when a file of their language first needs them.
+    """
+    if tables is None:
+        tables = build_pattern_tables(rules)
+    r = rules.get("rules", {})
+    secrets_rules = r.get("secrets", {})
+    security_rules = r.get("security", {})
+    debug_rules = r.get("debug_statements", {})
+
+    compiled = {
+        "secrets": [],
+        "secrets_severity": secrets_rules.get("severity", "error"),
+        "security": bool(security_rules.get("enabled", True)),
+        "security_severity": security_rules.get("severity", "error"),
+        "ignore_paths": security_rules.get("ignore_paths", ["test/", "*.test.*", "*.spec.*"]),
+        "debug": {},
+        "debug_severity": debug_rules.get("severity", "warning"),
+        "size": None,
+        "scanners": {},
+    }
+
+    if secrets_rules.get("enabled", True):
+        compiled["secrets"] = _compile_table(tables["secrets"])
+
+    languages = debug_rules.get("languages", {})
+    if debug_rules.get("enabled", True) and isinstance(languages, dict):
+        compiled["debug"] = {
+            lang: [str(p) for p in pats]
+            for lang, pats in languages.items()
+            if isinstance(pats, list)
+        }
+
+    compiled["size"] = _size_rule(rules)
+    return compiled
+
+
+def _size_rule(rules):
+    """Normalized file_size rule: {max_kb, max_bytes, severity}, or None if off."""
+    size_rules = rules.get("rules", {}).get("file_size", {})
+    if not size_rules.get("enabled", True):
+        return None
+    max_kb = size_rules.get("max_kb", 500)
+    if not isinstance(max_kb, (int, float)):
+        try:
+            max_kb = int(max_kb)
+        except (ValueError, TypeError):
+            max_kb = 500
+    return {
+        "max_kb": max_kb,
+        "max_bytes": int(max_kb) * 1024,
+        "severity": size_rules.get("severity", "error"),
+    }
+
+
+def _checks_for(compiled, filepath):
+    """Return the ordered checks that apply to *filepath*.
+
+    Each check is (kind, matcher, line_local, severity, message), where
+    kind is "re" (compiled regex) or "in" (literal substring). Order is
+    secrets, security, then debug statements — the order run_checks
+    reports them in.
+    """
+    security_on = compiled["security"] and not _is_ignored_path(
+        filepath, compiled["ignore_paths"]
+    )
+    lang = _language_for(filepath)
+    key = (security_on, lang)
+    checks = compiled["scanners"].get(key)
+    if checks is not None:
+        return checks
+
+    checks = []
+    severity = compiled["secrets_severity"]
+    for regex, message, line_local in compiled["secrets"]:
+        checks.append(("re", regex, line_local, severity, message))
+    if security_on:
+        severity = compiled["security_severity"]
+        for regex, message, line_local, pack_severity in _security_pack(lang):
+            checks.append(("re", regex, line_local, pack_severity or severity, message))
+    if lang:
+        severity = compiled["debug_severity"]
+        for literal in compiled["debug"].get(lang, []):
+            checks.append(("in", literal, True, severity, f"Debug statement: {literal}"))
+
+    compiled["scanners"][key] = checks
+    return checks
+
+
+def _first_line(content, lines, line_starts, kind, matcher, line_local):
+    """Return the 1-based number of the first line matching a check, or 0.
+
+    Line-local checks search the whole content from C and only look at
+    individual lines to confirm a hit (a match may span a line break);
+    the rest fall back to testing each line.
+    """
+    if not line_local:
+        for i, line in enumerate(lines, 1):
+            if matcher.search(line):
+                return i
+        return 0
+
+    pos = 0
+    while True:
+        if kind == "in":
+            start = content.find(matcher, pos)
+        else:
+            m = matcher.search(content, pos)
+            start = m.start() if m else -1
+        if start < 0:
+            return 0
+        idx = bisect.bisect_right(line_starts, start) - 1
+        if idx >= len(lines):
+            return 0
+        line = lines[idx]
+        if (matcher in line) if kind == "in" else matcher.search(line):
+            return idx + 1
+        if idx + 1 >= len(line_starts):
+            return 0
+        pos = line_starts[idx + 1]
+
+
+# Literal lists at least this long are matched in one Aho-Corasick pass.
+# The automaton walks the content in Python, so below this size one
+# C-level str.find per literal is faster (measured ~0.2us/char for the
+# automaton vs ~0.001us/char per literal for str.find).
+AC_MIN_PATTERNS = 200
+
+# Characters str.splitlines() treats as line boundaries; a literal that
+# contains one can never occur inside a single line
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+@functools.lru_cache(maxsize=32)
+def _literal_automaton(literals):
+    """Build an Aho-Corasick automaton over a tuple of literals.
+
+    Returns (goto, fail, out): goto[state] maps a character to the next
+    state, fail[state] is the failure link and out[state] lists the
+    indexes of every literal ending at that state (duplicates included).
+    Empty literals and literals spanning a line break are left out.
+    """
+    goto = [{}]
+    out = [[]]
+    for idx, literal in enumerate(literals):
+        if not literal or not _LINE_BREAKS.isdisjoint(literal):
+            continue
+        state = 0
+        for ch in literal:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto.append({})
+                out.append([])
+                goto[state][ch] = nxt
+            state = nxt
+        out[state].append(idx)
+
+    fail = [0] * len(goto)
+    queue = list(goto[0].values())
+    for state in queue:  # Breadth-first; the list grows while iterating
+        for ch, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0) if state else 0
+            out[nxt] = out[nxt] + out[fail[nxt]]
+    return goto, fail, out
+
+
+def _first_literal_lines(literals, content, line_starts):
+    """Return the first line number (0 = none) of every literal in one pass.
+
+    Same result as testing `literal in line` for each literal on each line
+    of content.splitlines(); *line_starts* are the lines' start offsets.
+    """
+    literals = tuple(literals)
+    first = [0] * len(literals)
+    pending = 0
+    for idx, literal in enumerate(literals):
+        if not literal:
+            first[idx] = 1  # "" is in every line
+        elif _LINE_BREAKS.isdisjoint(literal):
+            pending += 1
+    if not pending:
+        return first
+
+    goto, fail, out = _literal_automaton(literals)
+    lengths = [len(x) for x in literals]
+    state = 0
+    for pos, ch in enumerate(content):
+        nxt = goto[state].get(ch)
+        while nxt is None and state:
+            state = fail[state]
+            nxt = goto[state].get(ch)
+        state = nxt or 0
+        if out[state]:
+            for idx in out[state]:
+                if not first[idx]:
+                    start = pos - lengths[idx] + 1
+                    first[idx] = bisect.bisect_right(line_starts, start)
+                    pending -= 1
+            if not pending:
+                break
+    return first
+
+
+def _scan_content(content, lines, checks):
+    """Return issues for the first matching line of each check, in order."""
+    issues = []
+    if not lines:
+        return issues
+    # Offsets where each line starts, matching str.splitlines() boundaries
+    line_starts = [0]
+    line_starts.extend(itertools.accumulate(len(x) for x in content.splitlines(True)))
+
+    # Large literal lists (debug statements) share a single pass
+    literal_lines = {}
+    literal_checks = [i for i, check in enumerate(checks) if check[0] == "in"]
+    if len(literal_checks) >= AC_MIN_PATTERNS:
+        firsts = _first_literal_lines(
+            [checks[i][1] for i in literal_checks], content, line_starts
+        )
+        literal_lines = dict(zip(literal_checks, firsts))
+
+    for i, (kind, matcher, line_local, severity, message) in enumerate(checks):
+        if i in literal_lines:
+            line_no = literal_lines[i]
+        else:
+            line_no = _first_line(content, lines, line_starts, kind, matcher, line_local)
+        if line_no:
+            issues.append({"line": line_no, "severity": severity, "message": message})
+    return issues
+
+
+# Files at least this large are memory-mapped rather than read
+MMAP_MIN_BYTES = 64 * 1024
+
+# Bytes the bytes scanner cannot handle the way the str scanner does:
+# non-ASCII (offsets would stop being character offsets), \r (universal
+# newlines on decode) and the control characters str.splitlines() or
+# str-mode \s treat specially
+_NOT_PLAIN_ASCII = re.compile(rb"[\x0b-\x0d\x1c-\x1f\x80-\xff]")
+
+_COUNT_CHUNK = 1024 * 1024
+
+
+def _decode(data):
+    """Decode raw file bytes the way files are read for checking.
+
+    UTF-8 with undecodable bytes dropped and universal newlines, matching
+    open(path, "r", encoding="utf-8", errors="ignore").
+    """
+    text = bytes(data).decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+@functools.lru_cache(maxsize=64)
+def _byte_checks(checks):
+    """Translate a tuple of _checks_for() checks to bytes matchers.
+
+    Returns a tuple of (kind, matcher, severity, message), or None when
+    the checks need the str scanner: a pattern that is not line-local,
+    cannot be compiled as a bytes pattern (non-ASCII, \\u escapes), or a
+    literal list long enough for the multi-literal pass. A non-ASCII
+    literal gets matcher None — it can never occur in ASCII content.
+    """
+    if sum(1 for check in checks if check[0] == "in") >= AC_MIN_PATTERNS:
+        return None
+    converted = []
+    for kind, matcher, line_local, severity, message in checks:
+        if not line_local:
+            return None
+        if kind == "in":
+            try:
+                matcher = matcher.encode("ascii")
+            except UnicodeEncodeError:
+                matcher = None
+        else:
+            try:
+                matcher = re.compile(matcher.pattern.encode("ascii"), matcher.flags & ~re.UNICODE)
+            except (UnicodeEncodeError, re.error):
+                return None
+        converted.append((kind, matcher, severity, message))
+    return tuple(converted)
+
+
+def _count_newlines(buf, end):
+    """Count b"\n" in buf[:end] (mmap has no count(); copy in chunks)."""
+    if isinstance(buf, bytes):
+        return buf.count(b"\n", 0, end)
+    total = 0
+    for start in range(0, end, _COUNT_CHUNK):
+        total += buf[start:min(start + _COUNT_CHUNK, end)].count(b"\n")
+    return total
+
+
+def _first_line_bytes(buf, kind, matcher):
+    """Bytes counterpart of _first_line() for line-local checks.
+
+    The line number is only computed for the confirmed match, by counting
+    newlines before it.
+    """
+    if matcher is None:
+        return 0
+    size = len(buf)
+    pos = 0
+    while True:
+        if kind == "in":
+            start = buf.find(matcher, pos)
+        else:
+            m = matcher.search(buf, pos)
+            start = m.start() if m else -1
+        if start < 0 or start >= size:
+            return 0
+        line_start = buf.rfind(b"\n", 0, start) + 1
+        line_end = buf.find(b"\n", start)
+        if line_end < 0:
+            line_end = size
+        line = buf[line_start:line_end]
+        if (matcher in line) if kind == "in" else matcher.search(line):
+            return _count_newlines(buf, line_start) + 1
+        if line_end >= size:
+            return 0
+        pos = line_end + 1
+
+
+def _scan_bytes(buf, checks):
+    """Return issues like _scan_content(), scanning an ASCII buffer in place."""
+    issues = []
+    if not len(buf):
+        return issues
+    for kind, matcher, severity, message in checks:
+        line_no = _first_line_bytes(buf, kind, matcher)
+        if line_no:
+            issues.append({"line": line_no, "severity": severity, "message": message})
+    return issues
+
+
+def check_file_compiled(compiled, filepath, content, size=None, line_numbers=None):
+    """Run all enabled checks for one file against precompiled rules.
+
+    *content* is a str, or the raw file bytes (bytes or mmap). Plain ASCII
+    bytes are scanned in place with bytes regexes, without decoding or
+    splitting into lines; anything else is decoded first. *size* is the
+    file size in bytes, or None if the file is unreadable (no size issue
+    is reported then). When *content* holds only selected lines of the
+    file (added lines), *line_numbers* gives each line's number in the
+    real file and issues are reported against those.
+    Returns {errors, warnings} exactly as run_checks does.
+    """
+    errors = []
+    warnings = []
+
+    size_rule = compiled["size"]
+    if size_rule is not None and size is not None and size > size_rule["max_bytes"]:
+        issue = {
+            "line": 0,
+            "severity": size_rule["severity"],
+            "message": f"File too large ({size // 1024}KB > {size_rule['max_kb']}KB)",
+        }
+        _route_issue(issue, filepath, errors, warnings)
+        # If file is too large, skip content checks
+        if errors:
+            return {"errors": errors, "warnings": warnings}
+
+    checks = _checks_for(compiled, filepath)
+    if not isinstance(content, str):
+        byte_checks = _byte_checks(tuple(checks)) if line_numbers is None else None
+        if byte_checks is not None and not _NOT_PLAIN_ASCII.search(content):
+            for issue in _scan_bytes(content, byte_checks):
+                _route_issue(issue, filepath, errors, warnings)
+            return {"errors": errors, "warnings": warnings}
+        content = _decode(content)
+
+    lines = content.splitlines() if content else []
+    for issue in _scan_content(content, lines, checks):
+        if line_numbers is not None:
+            issue["line"] = line_numbers[issue["line"] - 1]
+        _route_issue(issue, filepath, errors, warnings)
+
+    return {"errors": errors, "warnings": warnings}
+
+
+def _max_scan_bytes(size_rule):
+    """Largest file whose content is scanned, or None for no limit."""
+    if size_rule is not None and size_rule["severity"] == "error":
+        return size_rule["max_bytes"]
+    return None
+
+
+def max_scan_bytes(rules):
+    """Return the size above which a file's content is never scanned.
+
+    A file that fails the size check as an error skips content checks, so
+    callers need not read it. Returns None when there is no such limit.
+    """
+    return _max_scan_bytes(_size_rule(rules))
+
+
+def _read_for_check(full_path, max_bytes):
+    """Return (content, size) for a file on disk.
+
+    content is the raw bytes, or an mmap for files of MMAP_MIN_BYTES and
+    up (the caller closes it). Files larger than *max_bytes* are not read
+    (content is b"").
+    """
+    try:
+        size = os.path.getsize(full_path)
+    except OSError:
+        size = None
+    if size is not None and max_bytes is not None and size > max_bytes:
+        return b"", size
+    try:
+        with open(full_path, "rb") as f:
+            if size is not None and size >= MMAP_MIN_BYTES:
+                try:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size
+                except (OSError, ValueError):
+                    pass
+            return f.read(), size
+    except OSError:
+        return b"", size
+
+
+def run_checks_batch(cwd, files, rules=None, tables=None):
+    """Run all enabled checks against many files with one rule load.
+
+    *files* is an iterable of paths relative to *cwd* (read from disk) or
+    (path, content) / (path, content, size) tuples, content being str or
+    raw bytes. A fourth tuple item,
+    line_numbers, marks content as selected lines of the file (see
+    check_file_compiled). Rules are loaded and
+    compiled once, and each pattern is searched over a file's whole content
+    in one call instead of line by line.
+
+    Returns {path: {errors: [...], warnings: [...]}} in input order, with
+    the same issues run_checks would report for each file.
+    """
+    if rules is None:
+        rules, tables = load_rule_set(cwd)
+    compiled = compile_rules(rules, tables)
+    max_bytes = _max_scan_bytes(compiled["size"])
+
+    results = {}
+    for item in files:
+        line_numbers = None
+        if isinstance(item, str):
+            filepath, content, size = item, None, None
+        else:
+            filepath, content = item[0], item[1]
+            size = item[2] if len(item) > 2 else None
+            if len(item) > 3:
+                line_numbers = item[3]
+
+        full_path = os.path.join(cwd, filepath) if not os.path.isabs(filepath) else filepath
+        if content is None:
+            content, size = _read_for_check(full_path, max_bytes)
+        elif size is None:
+            try:
+                size = os.path.getsize(full_path)
+            except OSError:
+                size = None
+
+        try:
+            results[filepath] = check_file_compiled(
+                compiled, filepath, content, size, line_numbers
+            )
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+    return results
+
+
+# Below this many files a commit is always scanned serially: process pool
+# startup would cost more than it saves.
+PARALLEL_MIN_FILES = 200
+
+# Upper bound on worker processes for run_checks_parallel()
+PARALLEL_MAX_WORKERS = 8
+
+# (rules, tables) handed to each pool worker by _init_worker()
+_worker_rules = None
+
+
+def _cpu_count():
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return len(os.sched_getaffinity(0))
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
+def _pool_context():
+    """Multiprocessing context that never forks the calling process.
+
+    The hook daemon serves requests from several threads; forking it could
+    copy a lock held by another thread into the child and deadlock there.
+    forkserver (or spawn where it is unavailable) starts workers from a
+    fresh interpreter instead.
+    """
+    import multiprocessing
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_worker(rules, tables):
+    global _worker_rules
+    _worker_rules = (rules, tables)
+
+
+def _check_chunk(args):
+    """Pool task: run_checks_batch over one chunk of files."""
+    cwd, chunk = args
+    rules, tables = _worker_rules
+    return run_checks_batch(cwd, chunk, rules=rules, tables=tables)
+
+
+def run_checks_parallel(cwd, files, rules=None, workers=None, min_files=None, tables=None):
+    """run_checks_batch, fanned out across CPU cores for large commits.
+
+    Files are split into contiguous chunks (several per worker, so a few
+    huge files do not leave the other workers idle) and results are merged
+    back in input order — the output is identical to run_checks_batch.
+    Falls back to a serial scan for fewer than *min_files* files
+    (default PARALLEL_MIN_FILES), on single-CPU machines, or when a
+    process pool cannot be started. *tables* are passed through to
+    run_checks_batch.
+    """
+    files = list(files)
+    if rules is None:
+        rules, tables = load_rule_set(cwd)
+    if min_files is None:
+        min_files = PARALLEL_MIN_FILES
+    if workers is None:
+        workers = min(_cpu_count(), PARALLEL_MAX_WORKERS)
+    workers = min(workers, len(files))
+
+    if workers < 2 or len(files) < min_files:
+        return run_checks_batch(cwd, files, rules=rules, tables=tables)
+
+    chunk_size = -(-len(files) // (workers * 4))
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+    except ImportError:
+        return run_checks_batch(cwd, files, rules=rules, tables=tables)
+
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                 initializer=_init_worker,
+                                 initargs=(rules, tables)) as pool:
+            for partial in pool.map(_check_chunk, [(cwd, c) for c in chunks]):
+                results.update(partial)
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # No usable multiprocessing here (sandbox, missing /dev/shm, ...)
+        return run_checks_batch(cwd, files, rules=rules, tables=tables)
+    return results
+
+
 def generate_default_config():
     """Return default quality-rules.yaml content as string.
 
@@ -473,6 +1416,10 @@ def generate_default_config():
 
 version: "1"
 
+# What to scan: "file" (whole staged files) or "added_lines" (only lines
+# added by the commit — old findings in untouched lines are not re-flagged)
+scope: file
+
 rules:
   secrets:
     enabled: true
@@ -500,6 +1447,19 @@ rules:
         - "breakpoint()"
       go:
         - "fmt.Println"
+      rust:
+        - "dbg!("
+      java:
+        - "System.out.println"
+        - "printStackTrace()"
+      csharp:
+        - "Debugger.Break()"
+      ruby:
+        - "binding.pry"
+        - "byebug"
+      php:
+        - "var_dump("
+        - "print_r("
 
   file_size:
     enabled: true
@@ -517,3 +1477,45 @@ rules:
     command: ""
     fail_on: high
 """
+
+
+def main():
+    import argparse
+    import json
+
+    parent = argparse.ArgumentParser(add_help=False)
+    parent.add_argument("--cwd", default=".", help="Project root directory")
+
+    parser = argparse.ArgumentParser(
+        description="Hody Workflow quality rules", parents=[parent]
+    )
+    sub = parser.add_subparsers(dest="command")
+    audit_p = sub.add_parser(
+        "audit", parents=[parent],
+        help="Check every tracked file (incremental, cached in .hody/cache/audit.sqlite)",
+    )
+    audit_p.add_argument("--workers", type=int, default=None,
+                         help="Worker processes for large scans (default: CPU count)")
+
+    args = parser.parse_args()
+    cwd = os.path.abspath(args.cwd)
+
+    if args.command == "audit":
+        try:
+            from . import quality_audit
+        except ImportError:
+            import quality_audit
+        report = quality_audit.audit(cwd, workers=args.workers)
+        if report is None:
+            print(f"Not a git repository (or index unreadable): {cwd}", file=sys.stderr)
+            sys.exit(2)
+        print(json.dumps(report, indent=2))
+        if report["errors"]:
+            sys.exit(1)
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
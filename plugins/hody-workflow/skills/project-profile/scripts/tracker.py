@@ -3,12 +3,16 @@ Core CRUD operations, queries, workflow sync, and CLI entry point
 for the Interaction Tracking system.
 
 Uses tracker_schema for database access, schema init, ID generation,
-transition validation, and migration from state.json.
+transition validation, and migration from state.json. Every operation
+takes either the project directory (one connection per call) or an open
+TrackerStore (no connection cost at all).
 """
 import argparse
 import json
 import os
+import re
 import sys
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 # Handle both package and direct imports
@@ -33,6 +37,11 @@ TERMINAL_STATES = {
 # Priority ordering for queries (higher number = higher priority)
 PRIORITY_ORDER = {"high": 3, "medium": 2, "low": 1}
 
+# bm25() weights for the items_fts columns: title, description, notes
+SEARCH_WEIGHTS = (4.0, 2.0, 1.0)
+
+_SEARCH_WORD = re.compile(r"\w+")
+
 
 # =====================================================================
 # Helpers
@@ -43,40 +52,120 @@ def _now():
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+# Item ids per IN (...) list when hydrating; stays under the 999 bound
+# variables older SQLite builds allow per statement
+HYDRATE_CHUNK = 900
+
+# (table, column, item dict key) for the per-item lists
+_ITEM_LISTS = (
+    ("item_tags", "tag", "tags"),
+    ("item_files", "filepath", "related_files"),
+    ("item_kb_refs", "kb_ref", "kb_refs"),
+)
+
+
+def _hydrate_items(conn, item_rows):
+    """Convert item rows to dicts, including tags, files, kb_refs.
+
+    Fetches the lists for the whole result set with one query per table
+    (per HYDRATE_CHUNK items) instead of three queries per item. Row
+    order is preserved.
+    """
+    items = []
+    by_id = {}
+    for item_row in item_rows:
+        d = dict(item_row)
+
+        # Parse extra JSON
+        if d.get("extra"):
+            try:
+                d["extra"] = json.loads(d["extra"])
+            except (json.JSONDecodeError, TypeError):
+                d["extra"] = {}
+        else:
+            d["extra"] = {}
+
+        for _table, _column, key in _ITEM_LISTS:
+            d[key] = []
+        items.append(d)
+        by_id[d["id"]] = d
+
+    ids = list(by_id)
+    for start in range(0, len(ids), HYDRATE_CHUNK):
+        chunk = ids[start:start + HYDRATE_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        for table, column, key in _ITEM_LISTS:
+            rows = conn.execute(
+                f"SELECT item_id, {column} FROM {table}"
+                f" WHERE item_id IN ({placeholders})"
+                f" ORDER BY item_id, {column}",
+                chunk
+            ).fetchall()
+            for item_id, value in rows:
+                by_id[item_id][key].append(value)
+
+    return items
+
+
 def _item_to_dict(conn, item_row):
     """Convert sqlite3.Row to dict, including tags, files, kb_refs."""
-    d = dict(item_row)
+    return _hydrate_items(conn, [item_row])[0]
 
-    # Parse extra JSON
-    if d.get("extra"):
-        try:
-            d["extra"] = json.loads(d["extra"])
-        except (json.JSONDecodeError, TypeError):
-            d["extra"] = {}
-    else:
-        d["extra"] = {}
 
-    item_id = d["id"]
+# =====================================================================
+# Store
+# =====================================================================
+
+class TrackerStore:
+    """One long-lived connection to a project's tracker.db.
+
+    Opening a store creates the database and checks the schema once;
+    after that every operation reuses the same connection. Every function
+    in this module that takes `cwd` also accepts a TrackerStore in its
+    place, so callers doing several operations (hooks, the daemon,
+    scripts) can skip the per-call connect:
+
+        with TrackerStore(cwd) as store:
+            item = create_item(store, type="task", title="Add OAuth")
+            transition_status(store, item["id"], "in_progress")
+    """
+
+    def __init__(self, cwd, create=True):
+        self.cwd = cwd
+        self.conn = schema._connect(cwd, create=create)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
-    # Fetch tags
-    rows = conn.execute(
-        "SELECT tag FROM item_tags WHERE item_id = ?", (item_id,)
-    ).fetchall()
-    d["tags"] = [r["tag"] for r in rows]
 
-    # Fetch related files
-    rows = conn.execute(
-        "SELECT filepath FROM item_files WHERE item_id = ?", (item_id,)
-    ).fetchall()
-    d["related_files"] = [r["filepath"] for r in rows]
+def _project_dir(cwd):
+    """Project directory for a cwd argument that may be a TrackerStore."""
+    return cwd.cwd if isinstance(cwd, TrackerStore) else cwd
 
-    # Fetch KB refs
-    rows = conn.execute(
-        "SELECT kb_ref FROM item_kb_refs WHERE item_id = ?", (item_id,)
-    ).fetchall()
-    d["kb_refs"] = [r["kb_ref"] for r in rows]
 
-    return d
+@contextmanager
+def _store(cwd, create=False):
+    """Yield a TrackerStore for *cwd*, which may already be one.
+
+    A store opened here is closed on exit; a caller's store is left
+    open. With create=False a missing database raises FileNotFoundError.
+    """
+    if isinstance(cwd, TrackerStore):
+        yield cwd
+        return
+    store = TrackerStore(cwd, create=create)
+    try:
+        yield store
+    finally:
+        store.close()
 
 
 # =====================================================================
@@ -92,44 +181,40 @@ def ensure_session(cwd):
     Returns:
         session_id string (ses_YYYYMMDD_NNN).
     """
-    schema.init_db(cwd)
-    conn = schema.get_db(cwd)
-    now = _now()
-    today = datetime.now(timezone.utc).strftime("%Y%m%d")
-    prefix = f"ses_{today}_"
-
-    # Look for an open session today (no ended_at)
-    row = conn.execute(
-        "SELECT id FROM sessions WHERE id LIKE ? AND ended_at IS NULL",
-        (f"{prefix}%",)
-    ).fetchone()
-
-    if row:
-        session_id = row["id"]
-        conn.close()
+    with _store(cwd, create=True) as store:
+        conn = store.conn
+        now = _now()
+        today = datetime.now(timezone.utc).strftime("%Y%m%d")
+        prefix = f"ses_{today}_"
+
+        # Look for an open session today (no ended_at)
+        row = conn.execute(
+            "SELECT id FROM sessions WHERE id > ? AND id < ? AND ended_at IS NULL",
+            (prefix, prefix + "~")
+        ).fetchone()
+
+        if row:
+            return row["id"]
+
+        # Create new session
+        session_id = schema.generate_session_id(conn=conn)
+        conn.execute(
+            "INSERT INTO sessions (id, started_at) VALUES (?, ?)",
+            (session_id, now)
+        )
+        conn.commit()
         return session_id
 
-    # Create new session
-    session_id = schema.generate_session_id(cwd)
-    conn.execute(
-        "INSERT INTO sessions (id, started_at) VALUES (?, ?)",
-        (session_id, now)
-    )
-    conn.commit()
-    conn.close()
-    return session_id
-
 
 def end_session(cwd, session_id, summary=""):
     """Mark session as ended."""
-    conn = schema.get_db(cwd)
-    now = _now()
-    conn.execute(
-        "UPDATE sessions SET ended_at = ?, summary = ? WHERE id = ?",
-        (now, summary, session_id)
-    )
-    conn.commit()
-    conn.close()
+    with _store(cwd) as store:
+        now = _now()
+        store.conn.execute(
+            "UPDATE sessions SET ended_at = ?, summary = ? WHERE id = ?",
+            (now, summary, session_id)
+        )
+        store.conn.commit()
 
 
 # =====================================================================
@@ -141,7 +226,7 @@ def create_item(cwd, type, title, description="", priority="medium",
     """Create a new tracking item.
 
     Args:
-        cwd: Project root directory.
+        cwd: Project root directory (or a TrackerStore).
         type: One of task, investigation, question, discussion, maintenance.
         title: Short title for the item.
         description: Longer description (optional).
@@ -154,60 +239,55 @@ def create_item(cwd, type, title, description="", priority="medium",
     Returns:
         Full item dict with generated id.
     """
-    schema.init_db(cwd)
-    session_id = ensure_session(cwd)
-    conn = schema.get_db(cwd)
-    now = _now()
+    with _store(cwd, create=True) as store:
+        conn = store.conn
+        session_id = ensure_session(store)
+        now = _now()
 
-    item_id = schema.generate_item_id()
-    initial_status = schema.INITIAL_STATUS.get(type)
-    if initial_status is None:
-        conn.close()
-        raise ValueError(f"Invalid item type: {type}")
+        item_id = schema.generate_item_id()
+        initial_status = schema.INITIAL_STATUS.get(type)
+        if initial_status is None:
+            raise ValueError(f"Invalid item type: {type}")
 
-    extra_json = json.dumps(extra or {})
+        extra_json = json.dumps(extra or {})
 
-    conn.execute(
-        """INSERT INTO items
-           (id, type, title, description, status, priority,
-            created_at, updated_at, completed_at, session_id,
-            workflow_id, notes, extra)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (item_id, type, title, description, initial_status, priority,
-         now, now, None, session_id, workflow_id, "", extra_json)
-    )
+        conn.execute(
+            """INSERT INTO items
+               (id, type, title, description, status, priority,
+                created_at, updated_at, completed_at, session_id,
+                workflow_id, notes, extra)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (item_id, type, title, description, initial_status, priority,
+             now, now, None, session_id, workflow_id, "", extra_json)
+        )
 
-    # Log initial status
-    conn.execute(
-        """INSERT INTO status_log
-           (item_id, from_status, to_status, changed_at, session_id, reason)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (item_id, None, initial_status, now, session_id, "Item created")
-    )
+        # Log initial status
+        conn.execute(
+            """INSERT INTO status_log
+               (item_id, from_status, to_status, changed_at, session_id, reason)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (item_id, None, initial_status, now, session_id, "Item created")
+        )
 
-    # Insert tags
-    if tags:
-        for tag in tags:
-            conn.execute(
+        # Insert tags
+        if tags:
+            conn.executemany(
                 "INSERT OR IGNORE INTO item_tags (item_id, tag) VALUES (?, ?)",
-                (item_id, tag)
+                [(item_id, tag) for tag in tags]
             )
 
-    # Insert related files
-    if related_files:
-        for fp in related_files:
-            conn.execute(
+        # Insert related files
+        if related_files:
+            conn.executemany(
                 "INSERT OR IGNORE INTO item_files (item_id, filepath) VALUES (?, ?)",
-                (item_id, fp)
+                [(item_id, fp) for fp in related_files]
             )
 
-    conn.commit()
+        conn.commit()
 
-    # Read back full item
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    result = _item_to_dict(conn, row)
-    conn.close()
-    return result
+        # Read back full item
+        row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        return _item_to_dict(conn, row)
 
 
 def get_item(cwd, item_id):
@@ -216,14 +296,11 @@ def get_item(cwd, item_id):
     Returns:
         Item dict or None if not found.
     """
-    conn = schema.get_db(cwd)
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    if row is None:
-        conn.close()
-        return None
-    result = _item_to_dict(conn, row)
-    conn.close()
-    return result
+    with _store(cwd) as store:
+        row = store.conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return None
+        return _item_to_dict(store.conn, row)
 
 
 def update_item(cwd, item_id, title=None, description=None, priority=None,
@@ -238,58 +315,56 @@ def update_item(cwd, item_id, title=None, description=None, priority=None,
     Raises:
         ValueError if item not found.
     """
-    conn = schema.get_db(cwd)
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    if row is None:
-        conn.close()
-        raise ValueError(f"Item not found: {item_id}")
-
-    now = _now()
-    updates = []
-    params = []
-
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-
-    if description is not None:
-        updates.append("description = ?")
-        params.append(description)
-
-    if priority is not None:
-        updates.append("priority = ?")
-        params.append(priority)
-
-    if notes is not None:
-        updates.append("notes = ?")
-        params.append(notes)
-
-    if extra is not None:
-        # Merge with existing
-        existing_extra = {}
-        if row["extra"]:
-            try:
-                existing_extra = json.loads(row["extra"])
-            except (json.JSONDecodeError, TypeError):
-                pass
-        existing_extra.update(extra)
-        updates.append("extra = ?")
-        params.append(json.dumps(existing_extra))
-
-    if updates:
-        updates.append("updated_at = ?")
-        params.append(now)
-        params.append(item_id)
-        conn.execute(
-            f"UPDATE items SET {', '.join(updates)} WHERE id = ?",
-            params
-        )
-        conn.commit()
+    with _store(cwd) as store:
+        conn = store.conn
+        row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Item not found: {item_id}")
+
+        now = _now()
+        updates = []
+        params = []
+
+        if title is not None:
+            updates.append("title = ?")
+            params.append(title)
+
+        if description is not None:
+            updates.append("description = ?")
+            params.append(description)
+
+        if priority is not None:
+            updates.append("priority = ?")
+            params.append(priority)
+
+        if notes is not None:
+            updates.append("notes = ?")
+            params.append(notes)
+
+        if extra is not None:
+            # Merge with existing
+            existing_extra = {}
+            if row["extra"]:
+                try:
+                    existing_extra = json.loads(row["extra"])
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            existing_extra.update(extra)
+            updates.append("extra = ?")
+            params.append(json.dumps(existing_extra))
+
+        if updates:
+            updates.append("updated_at = ?")
+            params.append(now)
+            params.append(item_id)
+            conn.execute(
+                f"UPDATE items SET {', '.join(updates)} WHERE id = ?",
+                params
+            )
+            conn.commit()
 
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    result = _item_to_dict(conn, row)
-    conn.close()
-    return result
+        row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        return _item_to_dict(conn, row)
 
 
 def transition_status(cwd, item_id, new_status, reason=""):
@@ -303,50 +378,47 @@ def transition_status(cwd, item_id, new_status, reason=""):
     Raises:
         ValueError if item not found or transition is invalid.
     """
-    conn = schema.get_db(cwd)
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    if row is None:
-        conn.close()
-        raise ValueError(f"Item not found: {item_id}")
-
-    item_type = row["type"]
-    current_status = row["status"]
-
-    if not schema.validate_transition(item_type, current_status, new_status):
-        conn.close()
-        raise ValueError(
-            f"Invalid transition for {item_type}: "
-            f"{current_status} -> {new_status}"
-        )
+    with _store(cwd) as store:
+        conn = store.conn
+        row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Item not found: {item_id}")
+
+        item_type = row["type"]
+        current_status = row["status"]
+
+        if not schema.validate_transition(item_type, current_status, new_status):
+            raise ValueError(
+                f"Invalid transition for {item_type}: "
+                f"{current_status} -> {new_status}"
+            )
 
-    now = _now()
-    session_id = ensure_session(cwd)
+        now = _now()
+        session_id = ensure_session(store)
 
-    # Check if this is a terminal state
-    terminal = TERMINAL_STATES.get(item_type, set())
-    completed_at = now if new_status in terminal else None
+        # Check if this is a terminal state
+        terminal = TERMINAL_STATES.get(item_type, set())
+        completed_at = now if new_status in terminal else None
 
-    conn.execute(
-        """UPDATE items
-           SET status = ?, updated_at = ?, completed_at = ?
-           WHERE id = ?""",
-        (new_status, now, completed_at, item_id)
-    )
+        conn.execute(
+            """UPDATE items
+               SET status = ?, updated_at = ?, completed_at = ?
+               WHERE id = ?""",
+            (new_status, now, completed_at, item_id)
+        )
 
-    # Log transition
-    conn.execute(
-        """INSERT INTO status_log
-           (item_id, from_status, to_status, changed_at, session_id, reason)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (item_id, current_status, new_status, now, session_id, reason)
-    )
+        # Log transition
+        conn.execute(
+            """INSERT INTO status_log
+               (item_id, from_status, to_status, changed_at, session_id, reason)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (item_id, current_status, new_status, now, session_id, reason)
+        )
 
-    conn.commit()
+        conn.commit()
 
-    row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
-    result = _item_to_dict(conn, row)
-    conn.close()
-    return result
+        row = conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+        return _item_to_dict(conn, row)
 
 
 # =====================================================================
@@ -355,63 +427,60 @@ def transition_status(cwd, item_id, new_status, reason=""):
 
 def add_relation(cwd, from_id, to_id, relation):
     """Create a relation between two items."""
-    conn = schema.get_db(cwd)
-    now = _now()
-    conn.execute(
-        """INSERT OR IGNORE INTO item_relations
-           (from_item_id, to_item_id, relation, created_at)
-           VALUES (?, ?, ?, ?)""",
-        (from_id, to_id, relation, now)
-    )
-    conn.commit()
-    conn.close()
+    with _store(cwd) as store:
+        now = _now()
+        store.conn.execute(
+            """INSERT OR IGNORE INTO item_relations
+               (from_item_id, to_item_id, relation, created_at)
+               VALUES (?, ?, ?, ?)""",
+            (from_id, to_id, relation, now)
+        )
+        store.conn.commit()
 
 
 def add_tags(cwd, item_id, tags):
     """Add tags to an item. Idempotent."""
-    conn = schema.get_db(cwd)
-    for tag in tags:
-        conn.execute(
+    with _store(cwd) as store:
+        conn = store.conn
+        conn.executemany(
             "INSERT OR IGNORE INTO item_tags (item_id, tag) VALUES (?, ?)",
-            (item_id, tag)
+            [(item_id, tag) for tag in tags]
         )
-    conn.execute(
-        "UPDATE items SET updated_at = ? WHERE id = ?",
-        (_now(), item_id)
-    )
-    conn.commit()
-    conn.close()
+        conn.execute(
+            "UPDATE items SET updated_at = ? WHERE id = ?",
+            (_now(), item_id)
+        )
+        conn.commit()
 
 
 def add_related_files(cwd, item_id, files):
     """Add related files to an item. Idempotent."""
-    conn = schema.get_db(cwd)
-    for fp in files:
-        conn.execute(
+    with _store(cwd) as store:
+        conn = store.conn
+        conn.executemany(
             "INSERT OR IGNORE INTO item_files (item_id, filepath) VALUES (?, ?)",
-            (item_id, fp)
+            [(item_id, fp) for fp in files]
         )
-    conn.execute(
-        "UPDATE items SET updated_at = ? WHERE id = ?",
-        (_now(), item_id)
-    )
-    conn.commit()
-    conn.close()
+        conn.execute(
+            "UPDATE items SET updated_at = ? WHERE id = ?",
+            (_now(), item_id)
+        )
+        conn.commit()
 
 
 def add_kb_ref(cwd, item_id, ref):
     """Add a knowledge base reference to an item. Idempotent."""
-    conn = schema.get_db(cwd)
-    conn.execute(
-        "INSERT OR IGNORE INTO item_kb_refs (item_id, kb_ref) VALUES (?, ?)",
-        (item_id, ref)
-    )
-    conn.execute(
-        "UPDATE items SET updated_at = ? WHERE id = ?",
-        (_now(), item_id)
-    )
-    conn.commit()
-    conn.close()
+    with _store(cwd) as store:
+        conn = store.conn
+        conn.execute(
+            "INSERT OR IGNORE INTO item_kb_refs (item_id, kb_ref) VALUES (?, ?)",
+            (item_id, ref)
+        )
+        conn.execute(
+            "UPDATE items SET updated_at = ? WHERE id = ?",
+            (_now(), item_id)
+        )
+        conn.commit()
 
 
 # =====================================================================
@@ -426,33 +495,39 @@ def _get_all_terminal_statuses():
     return result
 
 
+def _get_active_statuses():
+    """Return every non-terminal status, sorted.
+
+    Queries filter on `status IN (...)` rather than `NOT IN (terminal)`
+    so SQLite can seek idx_items_status_rank instead of scanning items.
+    """
+    terminal = _get_all_terminal_statuses()
+    return sorted({
+        status
+        for transitions in schema.TYPE_TRANSITIONS.values()
+        for status in transitions
+        if status not in terminal
+    })
+
+
 def get_active_items(cwd, limit=10):
     """Get non-terminal status items, sorted by priority DESC, updated_at DESC.
 
     Returns:
         List of item dicts.
     """
-    conn = schema.get_db(cwd)
-    terminal = _get_all_terminal_statuses()
-    placeholders = ",".join("?" for _ in terminal)
-
-    rows = conn.execute(
-        f"""SELECT * FROM items
-            WHERE status NOT IN ({placeholders})
-            ORDER BY
-                CASE priority
-                    WHEN 'high' THEN 3
-                    WHEN 'medium' THEN 2
-                    WHEN 'low' THEN 1
-                END DESC,
-                updated_at DESC
-            LIMIT ?""",
-        (*terminal, limit)
-    ).fetchall()
-
-    result = [_item_to_dict(conn, row) for row in rows]
-    conn.close()
-    return result
+    active = _get_active_statuses()
+    placeholders = ",".join("?" for _ in active)
+
+    with _store(cwd) as store:
+        rows = store.conn.execute(
+            f"""SELECT * FROM items
+                WHERE status IN ({placeholders})
+                ORDER BY {schema.PRIORITY_RANK_SQL} DESC, updated_at DESC
+                LIMIT ?""",
+            (*active, limit)
+        ).fetchall()
+        return _hydrate_items(store.conn, rows)
 
 
 def get_incomplete(cwd):
@@ -461,35 +536,47 @@ def get_incomplete(cwd):
     Returns:
         List of item dicts.
     """
-    conn = schema.get_db(cwd)
-    terminal = _get_all_terminal_statuses()
-    placeholders = ",".join("?" for _ in terminal)
+    active = _get_active_statuses()
+    placeholders = ",".join("?" for _ in active)
 
-    rows = conn.execute(
-        f"""SELECT * FROM items
-            WHERE status NOT IN ({placeholders})
-            ORDER BY updated_at DESC""",
-        tuple(terminal)
-    ).fetchall()
+    with _store(cwd) as store:
+        rows = store.conn.execute(
+            f"""SELECT * FROM items
+                WHERE status IN ({placeholders})
+                ORDER BY updated_at DESC""",
+            tuple(active)
+        ).fetchall()
+        return _hydrate_items(store.conn, rows)
 
-    result = [_item_to_dict(conn, row) for row in rows]
-    conn.close()
-    return result
+
+def _fts_query(query):
+    """Turn free text into an FTS5 query: every word as a prefix, ANDed.
+
+    Returns "" when the text has no words to match.
+    """
+    return " ".join(f'"{word}"*' for word in _SEARCH_WORD.findall(query))
 
 
 def search(cwd, type=None, status=None, tags=None, related_files=None,
-           after=None, before=None, query=None, limit=20):
+           after=None, before=None, query=None, limit=20, snippets=False):
     """Multi-criteria AND search across items.
 
-    All filters are combined with AND logic. Query does LIKE on
-    title + description.
+    All filters are combined with AND logic. Query matches every word
+    (as a prefix) against title, description and notes through the FTS5
+    index, ranked by BM25; without FTS5 it falls back to LIKE on the
+    whole text, newest first. FTS5 matches words at the start of a
+    token ("auth" finds "authentication" but not "OAuth"); only the LIKE
+    fallback matches inside words. With snippets=True, FTS5 results carry
+    a "snippet" of the best matching column with hits in [brackets].
 
     Returns:
         List of item dicts matching all criteria.
     """
-    conn = schema.get_db(cwd)
     conditions = []
     params = []
+    tables = "items i"
+    columns = "i.*"
+    order = "i.updated_at DESC"
 
     if type is not None:
         conditions.append("i.type = ?")
@@ -507,38 +594,50 @@ def search(cwd, type=None, status=None, tags=None, related_files=None,
         conditions.append("i.created_at <= ?")
         params.append(before)
 
-    if query is not None:
-        conditions.append("(i.title LIKE ? OR i.description LIKE ?)")
-        like_val = f"%{query}%"
-        params.extend([like_val, like_val])
-
     if tags:
         for tag in tags:
             conditions.append(
-                "EXISTS (SELECT 1 FROM item_tags t WHERE t.item_id = i.id AND t.tag = ?)"
+                "i.id IN (SELECT item_id FROM item_tags WHERE tag = ?)"
             )
             params.append(tag)
 
     if related_files:
         for fp in related_files:
             conditions.append(
-                "EXISTS (SELECT 1 FROM item_files f WHERE f.item_id = i.id AND f.filepath = ?)"
+                "i.id IN (SELECT item_id FROM item_files WHERE filepath = ?)"
             )
             params.append(fp)
 
-    where = " AND ".join(conditions) if conditions else "1=1"
-
-    rows = conn.execute(
-        f"""SELECT * FROM items i
-            WHERE {where}
-            ORDER BY updated_at DESC
-            LIMIT ?""",
-        (*params, limit)
-    ).fetchall()
-
-    result = [_item_to_dict(conn, row) for row in rows]
-    conn.close()
-    return result
+    with _store(cwd) as store:
+        conn = store.conn
+        if query is not None:
+            match = _fts_query(query)
+            if match and schema.has_search_index(conn):
+                tables = ("items_fts JOIN items_fts_map m ON m.rowid = items_fts.rowid"
+                          " JOIN items i ON i.id = m.item_id")
+                conditions.insert(0, "items_fts MATCH ?")
+                params.insert(0, match)
+                weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+                order = f"bm25(items_fts, {weights}), i.updated_at DESC"
+                if snippets:
+                    columns += ", snippet(items_fts, -1, '[', ']', '...', 12) AS snippet"
+            else:
+                conditions.append(
+                    "(i.title LIKE ? OR i.description LIKE ? OR i.notes LIKE ?)"
+                )
+                like_val = f"%{query}%"
+                params.extend([like_val, like_val, like_val])
+
+        where = " AND ".join(conditions) if conditions else "1=1"
+
+        rows = conn.execute(
+            f"""SELECT {columns} FROM {tables}
+                WHERE {where}
+                ORDER BY {order}
+                LIMIT ?""",
+            (*params, limit)
+        ).fetchall()
+        return _hydrate_items(conn, rows)
 
 
 def get_item_history(cwd, item_id):
@@ -547,16 +646,14 @@ def get_item_history(cwd, item_id):
     Returns:
         List of status log dicts.
     """
-    conn = schema.get_db(cwd)
-    rows = conn.execute(
-        """SELECT * FROM status_log
-           WHERE item_id = ?
-           ORDER BY changed_at ASC""",
-        (item_id,)
-    ).fetchall()
-    result = [dict(r) for r in rows]
-    conn.close()
-    return result
+    with _store(cwd) as store:
+        rows = store.conn.execute(
+            """SELECT * FROM status_log
+               WHERE item_id = ?
+               ORDER BY changed_at ASC""",
+            (item_id,)
+        ).fetchall()
+        return [dict(r) for r in rows]
 
 
 # =====================================================================
@@ -573,7 +670,7 @@ def save_checkpoint(cwd, workflow_id, agent, phase,
     completing each unit of work so progress survives interruptions.
 
     Args:
-        cwd: Project root directory.
+        cwd: Project root directory (or a TrackerStore).
         workflow_id: The workflow ID from state.json.
         agent: Agent name (e.g. "code-reviewer").
         phase: Phase name (e.g. "VERIFY").
@@ -586,34 +683,32 @@ def save_checkpoint(cwd, workflow_id, agent, phase,
     Returns:
         The checkpoint dict.
     """
-    schema.init_db(cwd)
-    conn = schema.get_db(cwd)
     now = _now()
-
     items_json = json.dumps(items or [])
     checkpoint_id = f"chk_{workflow_id}_{agent}"
 
-    conn.execute(
-        """INSERT INTO checkpoints
-           (id, workflow_id, agent, phase, updated_at,
-            total_items, completed_items, items_json,
-            partial_output, resume_hint)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(workflow_id, agent) DO UPDATE SET
-            phase = excluded.phase,
-            updated_at = excluded.updated_at,
-            total_items = excluded.total_items,
-            completed_items = excluded.completed_items,
-            items_json = excluded.items_json,
-            partial_output = excluded.partial_output,
-            resume_hint = excluded.resume_hint""",
-        (checkpoint_id, workflow_id, agent, phase, now,
-         total_items, completed_items, items_json,
-         partial_output, resume_hint)
-    )
-    conn.commit()
+    with _store(cwd, create=True) as store:
+        store.conn.execute(
+            """INSERT INTO checkpoints
+               (id, workflow_id, agent, phase, updated_at,
+                total_items, completed_items, items_json,
+                partial_output, resume_hint)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(workflow_id, agent) DO UPDATE SET
+                phase = excluded.phase,
+                updated_at = excluded.updated_at,
+                total_items = excluded.total_items,
+                completed_items = excluded.completed_items,
+                items_json = excluded.items_json,
+                partial_output = excluded.partial_output,
+                resume_hint = excluded.resume_hint""",
+            (checkpoint_id, workflow_id, agent, phase, now,
+             total_items, completed_items, items_json,
+             partial_output, resume_hint)
+        )
+        store.conn.commit()
 
-    result = {
+    return {
         "id": checkpoint_id,
         "workflow_id": workflow_id,
         "agent": agent,
@@ -625,8 +720,6 @@ def save_checkpoint(cwd, workflow_id, agent, phase,
         "partial_output": partial_output,
         "resume_hint": resume_hint,
     }
-    conn.close()
-    return result
 
 
 def load_checkpoint(cwd, workflow_id, agent):
@@ -636,17 +729,15 @@ def load_checkpoint(cwd, workflow_id, agent):
         Checkpoint dict or None if no checkpoint exists.
     """
     try:
-        conn = schema.get_db(cwd)
+        with _store(cwd) as store:
+            row = store.conn.execute(
+                "SELECT * FROM checkpoints WHERE workflow_id = ? AND agent = ?",
+                (workflow_id, agent)
+            ).fetchone()
     except FileNotFoundError:
         return None
 
-    row = conn.execute(
-        "SELECT * FROM checkpoints WHERE workflow_id = ? AND agent = ?",
-        (workflow_id, agent)
-    ).fetchone()
-
     if row is None:
-        conn.close()
         return None
 
     result = dict(row)
@@ -654,7 +745,6 @@ def load_checkpoint(cwd, workflow_id, agent):
         result["items"] = json.loads(result.pop("items_json", "[]"))
     except (json.JSONDecodeError, TypeError):
         result["items"] = []
-    conn.close()
     return result
 
 
@@ -665,15 +755,14 @@ def load_workflow_checkpoints(cwd, workflow_id):
         List of checkpoint dicts.
     """
     try:
-        conn = schema.get_db(cwd)
+        with _store(cwd) as store:
+            rows = store.conn.execute(
+                "SELECT * FROM checkpoints WHERE workflow_id = ? ORDER BY updated_at DESC",
+                (workflow_id,)
+            ).fetchall()
     except FileNotFoundError:
         return []
 
-    rows = conn.execute(
-        "SELECT * FROM checkpoints WHERE workflow_id = ? ORDER BY updated_at DESC",
-        (workflow_id,)
-    ).fetchall()
-
     results = []
     for row in rows:
         d = dict(row)
@@ -682,8 +771,6 @@ def load_workflow_checkpoints(cwd, workflow_id):
         except (json.JSONDecodeError, TypeError):
             d["items"] = []
         results.append(d)
-
-    conn.close()
     return results
 
 
@@ -694,18 +781,15 @@ def clear_checkpoint(cwd, workflow_id, agent):
         True if a checkpoint was deleted, False if none existed.
     """
     try:
-        conn = schema.get_db(cwd)
+        with _store(cwd) as store:
+            cursor = store.conn.execute(
+                "DELETE FROM checkpoints WHERE workflow_id = ? AND agent = ?",
+                (workflow_id, agent)
+            )
+            store.conn.commit()
     except FileNotFoundError:
         return False
-
-    cursor = conn.execute(
-        "DELETE FROM checkpoints WHERE workflow_id = ? AND agent = ?",
-        (workflow_id, agent)
-    )
-    conn.commit()
-    deleted = cursor.rowcount > 0
-    conn.close()
-    return deleted
+    return cursor.rowcount > 0
 
 
 def clear_workflow_checkpoints(cwd, workflow_id):
@@ -715,18 +799,15 @@ def clear_workflow_checkpoints(cwd, workflow_id):
         Number of checkpoints deleted.
     """
     try:
-        conn = schema.get_db(cwd)
+        with _store(cwd) as store:
+            cursor = store.conn.execute(
+                "DELETE FROM checkpoints WHERE workflow_id = ?",
+                (workflow_id,)
+            )
+            store.conn.commit()
     except FileNotFoundError:
         return 0
-
-    cursor = conn.execute(
-        "DELETE FROM checkpoints WHERE workflow_id = ?",
-        (workflow_id,)
-    )
-    conn.commit()
-    count = cursor.rowcount
-    conn.close()
-    return count
+    return cursor.rowcount
 
 
 # =====================================================================
@@ -747,7 +828,7 @@ def sync_workflow_status(cwd, state=None):
                 import state as state_module
             except ImportError:
                 return
-        state = state_module.load_state(cwd)
+        state = state_module.load_state(_project_dir(cwd))
 
     if state is None:
         return
@@ -757,17 +838,20 @@ def sync_workflow_status(cwd, state=None):
         return
 
     try:
-        conn = schema.get_db(cwd)
+        with _store(cwd) as store:
+            _sync_item_status(store, workflow_id, state)
     except FileNotFoundError:
         return
 
+
+def _sync_item_status(store, workflow_id, state):
+    conn = store.conn
     row = conn.execute(
         "SELECT * FROM items WHERE workflow_id = ?",
         (workflow_id,)
     ).fetchone()
 
     if row is None:
-        conn.close()
         return
 
     # Map workflow status to tracker status
@@ -775,17 +859,15 @@ def sync_workflow_status(cwd, state=None):
     current_status = row["status"]
 
     if new_status == current_status:
-        conn.close()
         return
 
     item_type = row["type"]
     item_id = row["id"]
     now = _now()
-    session_id = ensure_session(cwd)
+    session_id = ensure_session(store)
 
     # Check if transition is valid; if not, skip silently
     if not schema.validate_transition(item_type, current_status, new_status):
-        conn.close()
         return
 
     # Check terminal state
@@ -808,7 +890,6 @@ def sync_workflow_status(cwd, state=None):
     )
 
     conn.commit()
-    conn.close()
 
 
 def migrate_from_state_json(cwd):
@@ -819,7 +900,7 @@ def migrate_from_state_json(cwd):
     Returns:
         Created item dict or None if no state.json exists.
     """
-    return schema.migrate_from_state_json(cwd)
+    return schema.migrate_from_state_json(_project_dir(cwd))
 
 
 # =====================================================================
@@ -857,6 +938,8 @@ def main():
     create_p.add_argument("--tags", default=None,
                           help="Comma-separated tags")
     create_p.add_argument("--workflow-id", default=None)
+    create_p.add_argument("--hint-id", default=None,
+                          help="Auto-track hint this item was created from")
 
     # update (status transition)
     update_p = subparsers.add_parser("update", parents=[cwd_parent], help="Update item status")
@@ -877,7 +960,8 @@ def main():
     search_p.add_argument("--status", default=None)
     search_p.add_argument("--tags", default=None,
                           help="Comma-separated tags")
-    search_p.add_argument("--query", default=None, help="Text search")
+    search_p.add_argument("--query", default=None,
+                          help="Text search over title, description and notes (ranked)")
     search_p.add_argument("--limit", type=int, default=20)
 
     # list
@@ -951,6 +1035,7 @@ def main():
             priority=args.priority,
             tags=tags,
             workflow_id=args.workflow_id,
+            extra={"hint_id": args.hint_id} if args.hint_id else None,
         )
         _output(item)
 
@@ -976,6 +1061,7 @@ def main():
             tags=tags,
             query=args.query,
             limit=args.limit,
+            snippets=args.query is not None,
         )
         _output(results)
 
@@ -13,10 +13,8 @@ from datetime import datetime, timezone, timedelta
 
 # Handle both package and direct imports
 try:
-    from . import tracker_schema as schema
     from . import tracker as tracker_mod
 except ImportError:
-    import tracker_schema as schema
     import tracker as tracker_mod
 
 
@@ -157,7 +155,7 @@ def get_warnings(cwd):
     checks for the count-based "too many in_progress tasks" rule.
 
     Args:
-        cwd: Project root directory.
+        cwd: Project root directory (or a TrackerStore).
 
     Returns:
         List of warning dicts, each with 'severity' and 'message' keys.
@@ -236,17 +234,16 @@ def get_session_context(cwd):
             "recent_completed": [],
         }
 
-    # Active items (non-terminal), max 5, sorted by priority
-    try:
-        active_items = tracker_mod.get_active_items(cwd, limit=5)
-    except FileNotFoundError:
-        active_items = []
+    # One connection for all the queries below
+    with tracker_mod.TrackerStore(cwd, create=False) as store:
+        # Active items (non-terminal), max 5, sorted by priority
+        active_items = tracker_mod.get_active_items(store, limit=5)
 
-    # Warnings
-    warnings = get_warnings(cwd)
+        # Warnings
+        warnings = get_warnings(store)
 
-    # Recently completed (last 24h), max 3
-    recent_completed = _get_recent_completed(cwd, hours=24, limit=3)
+        # Recently completed (last 24h), max 3
+        recent_completed = _get_recent_completed(store, hours=24, limit=3)
 
     # Build summary
     summary = _build_summary(active_items, recent_completed)
@@ -324,18 +321,13 @@ def _get_recent_completed(cwd, hours=24, limit=3):
     """Get items completed within the last N hours.
 
     Args:
-        cwd: Project root directory.
+        cwd: Project root directory (or a TrackerStore).
         hours: Look-back window in hours.
         limit: Maximum number of items to return.
 
     Returns:
         List of item dicts that reached a terminal state recently.
     """
-    try:
-        conn = schema.get_db(cwd)
-    except FileNotFoundError:
-        return []
-
     cutoff = (
         datetime.now(timezone.utc) - timedelta(hours=hours)
     ).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -349,22 +341,22 @@ def _get_recent_completed(cwd, hours=24, limit=3):
     positive_terminal = all_terminal - {"abandoned"}
     placeholders = ",".join("?" for _ in positive_terminal)
 
-    rows = conn.execute(
-        f"""SELECT * FROM items
-            WHERE status IN ({placeholders})
-              AND completed_at IS NOT NULL
-              AND completed_at >= ?
-            ORDER BY completed_at DESC
-            LIMIT ?""",
-        (*positive_terminal, cutoff, limit)
-    ).fetchall()
-
-    result = []
-    for row in rows:
-        result.append(tracker_mod._item_to_dict(conn, row))
-
-    conn.close()
-    return result
+    try:
+        with tracker_mod._store(cwd) as store:
+            # Unary + keeps SQLite off the status index: terminal items pile
+            # up over time, while the completed_at window stays small.
+            rows = store.conn.execute(
+                f"""SELECT * FROM items
+                    WHERE +status IN ({placeholders})
+                      AND completed_at IS NOT NULL
+                      AND completed_at >= ?
+                    ORDER BY completed_at DESC
+                    LIMIT ?""",
+                (*positive_terminal, cutoff, limit)
+            ).fetchall()
+            return tracker_mod._hydrate_items(store.conn, rows)
+    except FileNotFoundError:
+        return []
 
 
 def _build_summary(active_items, recent_completed):
@@ -1,11 +1,13 @@
 """
 SQLite schema and migration for the Interaction Tracking system.
 
-Manages `.hody/tracker.db` — creates tables, handles migrations from
+Manages `.hody/tracker.db` — creates tables, upgrades the schema through
+versioned migrations (PRAGMA user_version), handles migrations from
 state.json, validates state machine transitions, and generates IDs.
 """
 import json
 import os
+import re
 import sqlite3
 import uuid
 from datetime import datetime, timezone
@@ -177,6 +179,257 @@ CREATE INDEX IF NOT EXISTS idx_checkpoints_workflow ON checkpoints(workflow_id);
 """
 
 
+# Full-text index over title, description and notes (schema version 2).
+# items has no INTEGER PRIMARY KEY, so its rowids may change on VACUUM;
+# items_fts_map gives every item a stable FTS rowid instead.
+SEARCH_INDEX_SQL = """
+CREATE TABLE IF NOT EXISTS items_fts_map (
+    rowid   INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL UNIQUE
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, description, notes,
+    tokenize = '{tokenize}'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts_map (item_id) VALUES (new.id);
+    INSERT INTO items_fts (rowid, title, description, notes)
+    VALUES (last_insert_rowid(), new.title,
+            coalesce(new.description, ''), coalesce(new.notes, ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_fts_update
+AFTER UPDATE OF title, description, notes ON items BEGIN
+    UPDATE items_fts
+    SET title = new.title,
+        description = coalesce(new.description, ''),
+        notes = coalesce(new.notes, '')
+    WHERE rowid = (SELECT rowid FROM items_fts_map WHERE item_id = new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+    DELETE FROM items_fts
+    WHERE rowid = (SELECT rowid FROM items_fts_map WHERE item_id = old.id);
+    DELETE FROM items_fts_map WHERE item_id = old.id;
+END;
+
+INSERT INTO items_fts_map (item_id)
+SELECT id FROM items WHERE id NOT IN (SELECT item_id FROM items_fts_map);
+
+INSERT INTO items_fts (rowid, title, description, notes)
+SELECT m.rowid, i.title, coalesce(i.description, ''), coalesce(i.notes, '')
+FROM items i JOIN items_fts_map m ON m.item_id = i.id;
+"""
+
+
+# Sort key for priority (higher = more urgent). Queries must use this exact
+# expression to be served by idx_items_status_rank.
+PRIORITY_RANK_SQL = "CASE priority WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 END"
+
+# Indexes for the hot tracker queries (schema version 3). Active items are
+# read through (status, PRIORITY_RANK_SQL, updated_at); indexing the
+# expression rather than storing a rank column means the sort key cannot
+# drift from priority, whichever code path writes the row. The new index
+# has status as its prefix, so the single-column status index it replaces
+# is dropped.
+HOT_QUERY_INDEXES_SQL = f"""
+CREATE INDEX IF NOT EXISTS idx_items_status_rank
+    ON items(status, {PRIORITY_RANK_SQL}, updated_at);
+DROP INDEX IF EXISTS idx_items_status;
+CREATE INDEX IF NOT EXISTS idx_items_updated ON items(updated_at);
+CREATE INDEX IF NOT EXISTS idx_items_completed ON items(completed_at);
+CREATE INDEX IF NOT EXISTS idx_item_files_filepath ON item_files(filepath);
+"""
+
+
+# Tokenizers for items_fts, preferred first. remove_diacritics 2 needs
+# SQLite 3.27+; older FTS5 builds only accept 1, which leaves a few
+# combining marks in place.
+FTS5_TOKENIZERS = ("unicode61 remove_diacritics 2", "unicode61 remove_diacritics 1")
+
+# Probed once per process: the linked SQLite library cannot change
+_fts5 = None
+
+
+def _fts5_tokenizers(conn):
+    """The FTS5_TOKENIZERS this SQLite build accepts; empty without FTS5."""
+    global _fts5
+    if _fts5 is None:
+        accepted = []
+        for tokenize in FTS5_TOKENIZERS:
+            try:
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize = '{tokenize}')")
+            except sqlite3.OperationalError:
+                continue
+            conn.execute("DROP TABLE temp.fts5_probe")
+            accepted.append(tokenize)
+        _fts5 = tuple(accepted)
+    return _fts5
+
+
+def _fts5_available(conn):
+    """True if this SQLite build has FTS5 and accepts one of our tokenizers."""
+    return bool(_fts5_tokenizers(conn))
+
+
+def _index_tokenizer(conn):
+    """tokenize option of the existing items_fts, None if absent or default."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).fetchone()
+    match = row and re.search(r"tokenize\s*=\s*'([^']*)'", row[0])
+    return match.group(1) if match else None
+
+
+def _search_index_usable(conn):
+    """True if FTS5 is available and can open (or drop) the current items_fts.
+
+    An index built under a newer SQLite may name a tokenizer option this
+    build rejects; every read, write and DROP of it then fails.
+    """
+    if not _fts5_available(conn):
+        return False
+    tokenize = _index_tokenizer(conn)
+    return tokenize is None or tokenize in _fts5_tokenizers(conn)
+
+
+def has_search_index(conn):
+    """True if the FTS5 index is live, i.e. its sync triggers are installed."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'items_fts_insert'"
+    ).fetchone() is not None
+
+
+def _build_search_index(conn):
+    """(Re)create the FTS5 index from scratch and backfill every item."""
+    conn.execute("DROP TABLE IF EXISTS items_fts")
+    conn.execute("DROP TABLE IF EXISTS items_fts_map")
+    script = SEARCH_INDEX_SQL.format(tokenize=_fts5_tokenizers(conn)[0])
+    for statement in _statements(script):
+        conn.execute(statement)
+
+
+def _drop_search_triggers(conn):
+    # The stale items_fts table cannot be dropped while it is unusable; it
+    # is rebuilt by _build_search_index once it is usable again.
+    for name in ("items_fts_insert", "items_fts_update", "items_fts_delete"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def _add_search_index(conn):
+    """Migration 2: FTS5 search index, skipped when SQLite lacks FTS5.
+
+    Without the index, tracker.search() falls back to LIKE;
+    sync_search_index() builds it later under an SQLite that has FTS5.
+    """
+    if _fts5_available(conn):
+        _build_search_index(conn)
+
+
+def sync_search_index(conn):
+    """Match the search index to what this SQLite build supports.
+
+    A database can move between Python builds with and without FTS5, or
+    to an older SQLite that rejects the index's tokenizer. Then the sync
+    triggers would fail every write to items ("no such module: fts5",
+    "error in tokenizer constructor"), so they are dropped and search
+    uses LIKE. Once the index is usable and not live, it is rebuilt,
+    picking up items written in the meantime. Costs two sqlite_master
+    lookups when nothing needs to change.
+    """
+    live = has_search_index(conn)
+    if live == _search_index_usable(conn):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have done it while we waited for the lock
+        if has_search_index(conn) == live:
+            if live:
+                _drop_search_triggers(conn)
+            else:
+                _build_search_index(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+# =====================================================================
+# Schema Migrations
+# =====================================================================
+
+# Ordered (version, step) pairs. Step N upgrades a version N-1 database
+# to version N and is either a SQL script or a callable(conn). Never edit
+# a released step; append a new one instead. Version 1 is the original
+# schema, written with IF NOT EXISTS so it also adopts databases created
+# before versioning (user_version 0).
+MIGRATIONS = [
+    (1, SCHEMA_SQL),
+    (2, _add_search_index),
+    (3, HOT_QUERY_INDEXES_SQL),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _statements(script):
+    """Split a SQL script into complete statements (trigger bodies intact)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+    if statement.strip():
+        yield statement
+
+
+def schema_version(conn):
+    """Return the database's PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Bring the database schema up to SCHEMA_VERSION.
+
+    The fast path reads one integer and returns when the schema is
+    current. Otherwise the pending steps run in one IMMEDIATE
+    transaction, so a concurrent process waits and then finds the work
+    done, and a failing step leaves the database at its old version.
+    Databases from a newer plugin are used as they are.
+
+    Returns the schema version.
+    """
+    version = schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    if version == 0:
+        # Persistent; cannot be changed inside a transaction
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = schema_version(conn)
+        for target, step in MIGRATIONS:
+            if target <= version:
+                continue
+            if callable(step):
+                step(conn)
+            else:
+                for statement in _statements(step):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+            version = target
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return version
+
+
 # =====================================================================
 # ID Generation
 # =====================================================================
@@ -186,23 +439,29 @@ def generate_item_id():
     return "itm_" + uuid.uuid4().hex[:12]
 
 
-def generate_session_id(cwd=None):
+def generate_session_id(cwd=None, conn=None):
     """Generate a session ID: ses_<YYYYMMDD>_<3-digit seq>.
 
     The sequence number is based on how many sessions already exist
-    for the current date. If cwd is provided and tracker.db exists,
-    queries the database; otherwise starts at 001.
+    for the current date. Counts through *conn* when given, else through
+    tracker.db under *cwd* if it exists; otherwise starts at 001.
     """
     today = datetime.now(timezone.utc).strftime("%Y%m%d")
     prefix = f"ses_{today}_"
     seq = 1
 
-    if cwd:
+    if conn is not None:
+        # A range on the primary key instead of LIKE, which cannot use it
+        count = conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE id > ? AND id < ?",
+            (prefix, prefix + "~")
+        ).fetchone()[0]
+        seq = count + 1
+    elif cwd:
         db_file = _db_path(cwd)
         if os.path.isfile(db_file):
             try:
                 conn = sqlite3.connect(db_file)
-                conn.execute("PRAGMA foreign_keys = ON")
                 cursor = conn.execute(
                     "SELECT COUNT(*) FROM sessions WHERE id LIKE ?",
                     (f"{prefix}%",)
@@ -220,23 +479,43 @@ def generate_session_id(cwd=None):
 # Database Initialization & Access
 # =====================================================================
 
-def init_db(cwd):
-    """Create tracker.db with the full schema.
-
-    Idempotent — safe to call multiple times. Uses CREATE TABLE IF NOT EXISTS
-    for all tables and CREATE INDEX IF NOT EXISTS for all indexes.
+def _connect(cwd, create=False):
+    """Open tracker.db with row_factory=sqlite3.Row and foreign keys on.
 
-    Sets PRAGMA journal_mode = WAL and PRAGMA foreign_keys = ON.
+    The schema is migrated to SCHEMA_VERSION if it is behind (a single
+    PRAGMA read when it is not) and the search index is matched to this
+    SQLite build (see sync_search_index). With create=True a missing database is
+    created; otherwise it raises FileNotFoundError.
     """
     db_file = _db_path(cwd)
-    os.makedirs(os.path.dirname(db_file), exist_ok=True)
+    if create:
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+    elif not os.path.isfile(db_file):
+        raise FileNotFoundError(
+            f"Tracker database not found at {db_file}. "
+            "Run init_db() or /hody-workflow:init first."
+        )
 
     conn = sqlite3.connect(db_file)
-    conn.execute("PRAGMA journal_mode = WAL")
+    conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
-    conn.executescript(SCHEMA_SQL)
-    conn.commit()
-    conn.close()
+    try:
+        if migrate(conn) >= 2:
+            sync_search_index(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def init_db(cwd):
+    """Create tracker.db with the full schema.
+
+    Idempotent — safe to call multiple times. A new database is switched
+    to WAL and migrated to SCHEMA_VERSION; an existing one only has its
+    PRAGMA user_version checked (and pending migrations applied).
+    """
+    _connect(cwd, create=True).close()
 
 
 def get_db(cwd):
@@ -247,18 +526,7 @@ def get_db(cwd):
 
     Raises FileNotFoundError if the database has not been initialized.
     """
-    db_file = _db_path(cwd)
-    if not os.path.isfile(db_file):
-        raise FileNotFoundError(
-            f"Tracker database not found at {db_file}. "
-            "Run init_db() or /hody-workflow:init first."
-        )
-
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode = WAL")
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    return _connect(cwd)
 
 
 # =====================================================================
@@ -350,14 +618,12 @@ def migrate_from_state_json(cwd):
 def _do_migrate(cwd, state_data):
     """Perform the actual migration from a loaded state dict."""
     # Ensure db is initialized
-    init_db(cwd)
-
-    conn = get_db(cwd)
+    conn = _connect(cwd, create=True)
     now = _now()
 
     # Generate IDs
     item_id = generate_item_id()
-    session_id = generate_session_id(cwd)
+    session_id = generate_session_id(conn=conn)
 
     # Create session
     conn.execute(
@@ -4,8 +4,10 @@ import os
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import unittest
+from unittest.mock import patch
 
 # Add hooks to path
 HOOK_DIR = os.path.join(
@@ -29,6 +31,7 @@ SCRIPT_DIR = os.path.join(
 )
 sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
 
+import inject_project_context
 from inject_project_context import is_profile_stale, CONFIG_FILES
 from detectors.integrations import load_existing_integrations
 
@@ -112,6 +115,19 @@ class TestIsProfileStale(unittest.TestCase):
             fake_path = os.path.join(tmpdir, ".hody", "profile.yaml")
             self.assertFalse(is_profile_stale(tmpdir, fake_path))
 
+    def test_only_existing_config_files_are_stated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "package.json"), "w") as f:
+                f.write("{}")
+            with open(os.path.join(tmpdir, "README.md"), "w") as f:
+                f.write("readme")
+            profile_path = self._make_profile(tmpdir)
+            real_getmtime = os.path.getmtime
+            with patch("os.path.getmtime", side_effect=real_getmtime) as getmtime:
+                is_profile_stale(tmpdir, profile_path)
+            stated = [os.path.basename(c.args[0]) for c in getmtime.call_args_list]
+            self.assertEqual(stated, ["profile.yaml", "package.json"])
+
 
 class TestLoadExistingIntegrations(unittest.TestCase):
     def _make_profile(self, tmpdir, content):
@@ -266,5 +282,177 @@ class TestGraphifyHookInjection(unittest.TestCase):
             self.assertIn("Hody Workflow", msg)
 
 
+class TestContextCache(unittest.TestCase):
+    """SessionStart message is cached per section in .hody/context_cache.json."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.hody_dir = os.path.join(self.tmpdir, ".hody")
+        os.makedirs(self.hody_dir)
+        with open(os.path.join(self.hody_dir, "profile.yaml"), "w") as f:
+            f.write("project:\n  name: cached-app\n")
+        self.cache_path = os.path.join(self.hody_dir, "context_cache.json")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _message(self):
+        return inject_project_context.handle(
+            {"cwd": self.tmpdir}, env={"HODY_SKIP_REFRESH": "1"}
+        )["systemMessage"]
+
+    def _write_state(self, feature):
+        with open(os.path.join(self.hody_dir, "state.json"), "w") as f:
+            json.dump({"status": "in_progress", "feature": feature,
+                       "spec_confirmed": False}, f)
+
+    def test_cache_written(self):
+        msg = self._message()
+        self.assertIn("cached-app", msg)
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        self.assertEqual(cache["message"], msg)
+        self.assertEqual(
+            [name for name, _, _, _ in inject_project_context.SECTIONS],
+            list(cache["sections"].keys()),
+        )
+
+    def test_unchanged_inputs_reuse_cached_message(self):
+        self._message()
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        cache["message"] = "SENTINEL"
+        with open(self.cache_path, "w") as f:
+            json.dump(cache, f)
+        self.assertEqual(self._message(), "SENTINEL")
+
+    def test_only_changed_section_is_rebuilt(self):
+        self._write_state("first feature")
+        self._message()
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        cache["sections"]["profile"]["text"] = "[Hody Workflow] Project: from-cache"
+        with open(self.cache_path, "w") as f:
+            json.dump(cache, f)
+
+        self._write_state("second feature")
+        os.utime(os.path.join(self.hody_dir, "state.json"), ns=(1, 1))
+        msg = self._message()
+        self.assertIn("from-cache", msg)
+        self.assertIn("second feature", msg)
+        self.assertNotIn("first feature", msg)
+
+    def test_removed_input_drops_section(self):
+        self._write_state("gone soon")
+        self.assertIn("gone soon", self._message())
+        os.remove(os.path.join(self.hody_dir, "state.json"))
+        self.assertNotIn("gone soon", self._message())
+
+    def test_corrupt_cache_is_ignored(self):
+        with open(self.cache_path, "w") as f:
+            f.write("{not json")
+        self.assertIn("cached-app", self._message())
+
+
+class TestParallelSections(unittest.TestCase):
+    """Sections run concurrently under deadlines; refresh runs in background."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.hody_dir = os.path.join(self.tmpdir, ".hody")
+        os.makedirs(self.hody_dir)
+        self.profile = os.path.join(self.hody_dir, "profile.yaml")
+        with open(self.profile, "w") as f:
+            f.write("project:\n  name: parallel-app\n")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_run_sections_drops_slow_builder(self):
+        def slow(cwd):
+            time.sleep(2)
+            return "slow"
+
+        with patch.dict(inject_project_context.SECTION_TIMEOUTS, {"slow": 0.1}):
+            start = time.monotonic()
+            results = inject_project_context.run_sections(
+                self.tmpdir, [("slow", slow), ("fast", lambda cwd: "fast")]
+            )
+            elapsed = time.monotonic() - start
+        self.assertEqual(results, {"fast": "fast"})
+        self.assertLess(elapsed, 1.5)
+
+    def test_hung_section_is_not_started_twice(self):
+        release = threading.Event()
+        calls = []
+
+        def hung(cwd):
+            calls.append(cwd)
+            release.wait(5)
+            return "late"
+
+        with patch.dict(inject_project_context.SECTION_TIMEOUTS, {"hung": 0.05}):
+            for _ in range(3):
+                self.assertEqual(
+                    inject_project_context.run_sections(self.tmpdir, [("hung", hung)]), {})
+            self.assertEqual(len(calls), 1)
+            # Another project's section is independent
+            other = tempfile.mkdtemp()
+            try:
+                inject_project_context.run_sections(other, [("hung", hung)])
+            finally:
+                os.rmdir(other)
+            self.assertEqual(len(calls), 2)
+
+            release.set()
+            deadline = time.monotonic() + 5
+            while inject_project_context._inflight and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(
+                inject_project_context.run_sections(self.tmpdir, [("hung", hung)]),
+                {"hung": "late"})
+        self.assertEqual(len(calls), 3)
+
+    def test_run_sections_swallows_errors(self):
+        def broken(cwd):
+            raise RuntimeError("boom")
+        self.assertEqual(
+            inject_project_context.run_sections(self.tmpdir, [("x", broken)]),
+            {"x": ""},
+        )
+
+    def test_timed_out_section_is_retried_next_session(self):
+        def slow_state(cwd):
+            time.sleep(1)
+            return "Active workflow: 'late'"
+
+        sections = [
+            (name, slow_state if name == "state" else builder, inputs, extra)
+            for name, builder, inputs, extra in inject_project_context.SECTIONS
+        ]
+        with patch.object(inject_project_context, "SECTIONS", sections), \
+                patch.dict(inject_project_context.SECTION_TIMEOUTS, {"state": 0.1}):
+            msg = inject_project_context.build_context(self.tmpdir)
+        self.assertIn("parallel-app", msg)
+        self.assertNotIn("late", msg)
+        with open(os.path.join(self.hody_dir, "context_cache.json")) as f:
+            self.assertNotIn("state", json.load(f)["sections"])
+
+    def test_stale_profile_refreshes_in_background(self):
+        with open(os.path.join(self.tmpdir, "package.json"), "w") as f:
+            f.write("{}")
+        os.utime(self.profile, (time.time() - 100, time.time() - 100))
+
+        with patch.object(inject_project_context.subprocess, "Popen") as popen, \
+                patch.object(inject_project_context.subprocess, "run") as run:
+            output = inject_project_context.handle({"cwd": self.tmpdir}, env={})
+        self.assertIn("parallel-app", output["systemMessage"])
+        run.assert_not_called()
+        popen.assert_called_once()
+        self.assertTrue(popen.call_args.kwargs.get("start_new_session"))
+
+
 if __name__ == "__main__":
     unittest.main()
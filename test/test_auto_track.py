@@ -1,8 +1,12 @@
 """Tests for auto-track intent detector (auto_track.py)."""
 import json
 import os
+import random
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
 import unittest
 
 SCRIPT_DIR = os.path.join(
@@ -22,7 +26,14 @@ from auto_track import (
     is_question,
     find_task_verb,
     classify_subtype,
+    SCAN_PREFIX_CHARS,
+    PROMPT_VIEW_CHARS,
+    capped_view,
+    count_words,
+    evaluate,
+    load_corpus,
 )
+import auto_track
 
 
 class TestMetaCommand(unittest.TestCase):
@@ -183,6 +194,216 @@ class TestDetectIntent(unittest.TestCase):
         self.assertIn("oauth", result["title_hint"])
 
 
+def _reference_intent(prompt):
+    """detect_intent() as originally written: full linear scans."""
+    if not prompt or not prompt.strip() or is_meta_command(prompt):
+        return None
+    if len(prompt.strip()) < auto_track.MIN_PROMPT_LENGTH:
+        return None
+    lower = prompt.lower()
+    if any(p in lower for p in auto_track.QUESTION_PHRASES_VI):
+        return None
+    head = lower[:120]
+    first = head.split(maxsplit=1)[0].strip(",.;:!?") if head.split() else ""
+    if first in auto_track.QUESTION_WORDS_EN or lower.rstrip().endswith("?"):
+        return None
+    verb = None
+    for word in lower.split()[:6]:
+        cleaned = word.strip(",.;:!?\"'()[]{}")
+        if cleaned in auto_track.VI_TASK_VERBS:
+            verb = (cleaned, "vi")
+            break
+        if cleaned in auto_track.EN_TASK_VERBS:
+            verb = (cleaned, "en")
+            break
+    if not verb:
+        return None
+    if any(i in lower for i in auto_track.BUG_FIX_INDICATORS):
+        subtype = "bug-fix"
+    elif any(i in lower for i in auto_track.INVESTIGATION_INDICATORS):
+        subtype = "investigation"
+    else:
+        subtype = "feature"
+    return (verb, subtype)
+
+
+def _prompt_corpus(count=10000, seed=16):
+    """Synthetic EN/VI prompt log: tasks, questions, chatter, pasted traces."""
+    rng = random.Random(seed)
+    en_heads = [
+        "add a new oauth2 login endpoint", "fix the broken checkout flow",
+        "refactor the payment service", "investigate slow dashboard queries",
+        "what does this function do", "how do I run the tests",
+        "update the docs for the cli", "the build is failing again",
+        "please look into the flaky test", "remove the deprecated api",
+    ]
+    vi_heads = [
+        "thêm endpoint mới cho login", "sửa lỗi đăng nhập", "tạo trang quản trị",
+        "làm như thế nào để deploy", "tại sao test bị fail", "xóa api cũ đi",
+        "tìm hiểu vì sao chậm", "chuyển config sang yaml", "cái này có cần không",
+        "viết test cho service thanh toán",
+    ]
+    filler = ("with proper error handling and tests", "cho module user",
+              "in the admin panel", "trong trang chủ", "asap", "nhé", "please")
+    trace = "\n".join(
+        f'  File "/srv/app/module_{i}.py", line {i * 7}, in handler_{i}\n    result = call_{i}(x)'
+        for i in range(200)
+    ) + "\nValueError: invalid literal"
+    prompts = []
+    for _ in range(count):
+        head = rng.choice(en_heads if rng.random() < 0.5 else vi_heads)
+        prompt = f"{head} {rng.choice(filler)}"
+        roll = rng.random()
+        if roll < 0.1:
+            prompt += "\n\nTraceback (most recent call last):\n" + trace
+        elif roll < 0.15:
+            prompt += "?"
+        elif roll < 0.2:
+            prompt = "/" + prompt
+        prompts.append(prompt)
+    return prompts
+
+
+class TestIntentBenchmark(unittest.TestCase):
+    """10k-prompt micro-benchmark with a per-prompt latency ceiling."""
+
+    # Generous for slow CI machines; typical runs are ~10x below it
+    MEAN_CEILING_MS = 0.5
+
+    def test_matches_reference_within_prefix(self):
+        for prompt in _prompt_corpus(count=2000, seed=3):
+            if len(prompt) > SCAN_PREFIX_CHARS:
+                continue
+            result = detect_intent(prompt)
+            got = ((result["verb"], result["language"]), result["subtype"]) if result else None
+            self.assertEqual(got, _reference_intent(prompt), prompt)
+
+    def test_long_paste_scans_only_prefix(self):
+        prompt = "add a retry to the upload job\n" + "x" * 50000 + " bug"
+        self.assertEqual(detect_intent(prompt)["subtype"], "feature")
+
+    def test_per_prompt_latency(self):
+        prompts = _prompt_corpus()
+        start = time.perf_counter()
+        detected = sum(1 for prompt in prompts if detect_intent(prompt))
+        mean_ms = (time.perf_counter() - start) * 1000 / len(prompts)
+        self.assertGreater(detected, 0)
+        self.assertLess(mean_ms, self.MEAN_CEILING_MS)
+
+
+class TestHugePrompts(unittest.TestCase):
+    def test_count_words_matches_split(self):
+        for text in ("", "   ", "one", "a b\tc\nd", "x " * 30, "\u3000a\u00a0b c\x1cd"):
+            self.assertEqual(count_words(text), min(len(text.split()), 12), repr(text))
+
+    def test_short_prompts_unchanged(self):
+        prompt = "add retries\n" + "y" * (PROMPT_VIEW_CHARS - 12)
+        self.assertIs(capped_view(prompt), prompt)
+
+    def test_huge_paste_uses_capped_view(self):
+        prompt = "fix the crash in the importer\n" + ("log line " * 500000)
+        start = time.perf_counter()
+        result = detect_intent(prompt)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result, detect_intent(capped_view(prompt)))
+        self.assertEqual(result["subtype"], "bug-fix")
+        self.assertEqual(result["confidence"], "high")
+        self.assertEqual(result["title_hint"], "fix the crash in the importer")
+        self.assertLess(elapsed, 0.05)
+
+    def test_huge_paste_trailing_question(self):
+        prompt = "add this to the parser\n" + "z " * 100000 + "\nshould we?"
+        self.assertIsNone(detect_intent(prompt))
+
+    def test_hook_caps_prompt(self):
+        hook_dir = os.path.join(os.path.dirname(__file__), "..", "plugins", "hody-workflow", "hooks")
+        sys.path.insert(0, os.path.abspath(hook_dir))
+        try:
+            import auto_track_hook
+        finally:
+            sys.path.pop(0)
+        small = {"prompt": "add a login page", "cwd": "/tmp"}
+        self.assertIs(auto_track_hook.cap_prompt(small), small)
+        big = {"prompt": "add a login page " + "x" * 200000, "cwd": "/tmp"}
+        capped = auto_track_hook.cap_prompt(big)
+        self.assertEqual(capped["prompt"], capped_view(big["prompt"]))
+        self.assertEqual(capped["cwd"], "/tmp")
+
+
+class TestBench(unittest.TestCase):
+    LABELLED = [
+        {"prompt": "add a new oauth2 login endpoint with proper tests", "expected": "feature"},
+        {"prompt": "fix the broken checkout flow crash in the admin panel", "expected": "bug-fix"},
+        {"prompt": "investigate slow dashboard queries in the admin panel", "expected": "investigation"},
+        {"prompt": "what does this function do in the admin panel", "expected": False},
+        {"prompt": "/status please", "expected": None},
+        {"prompt": "the production server has been down since this morning", "expected": True},
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_precision_recall(self):
+        report = evaluate(self.LABELLED)
+        self.assertEqual(report["confusion"], {"tp": 3, "fp": 0, "fn": 1, "tn": 2})
+        self.assertEqual(report["precision"], 1.0)
+        self.assertEqual(report["recall"], 0.75)
+        self.assertEqual(report["subtype_accuracy"], 1.0)
+
+    def test_wrong_subtype_counts_as_error(self):
+        records = [{"prompt": "fix the broken checkout flow crash now please", "expected": "feature"}]
+        report = evaluate(records, max_errors=5)
+        self.assertEqual(report["subtype_accuracy"], 0.0)
+        self.assertEqual(report["errors"][0]["got"]["subtype"], "bug-fix")
+
+    def test_latency_and_unlabelled_records(self):
+        records = [{"prompt": p} for p in _prompt_corpus(count=200, seed=5)]
+        report = evaluate(records, repeat=3)
+        self.assertEqual((report["prompts"], report["labelled"], report["runs"]), (200, 0, 600))
+        self.assertIsNone(report["precision"])
+        latency = report["latency_ms"]
+        self.assertLessEqual(latency["p50"], latency["p99"])
+        self.assertLessEqual(latency["p99"], latency["max"])
+        self.assertGreater(report["throughput_per_sec"], 0)
+
+    def test_training_labels_accepted(self):
+        report = evaluate([{"prompt": "add a new oauth2 login endpoint with tests", "label": 1}])
+        self.assertEqual(report["confusion"]["tp"], 1)
+
+    def test_load_corpus_skips_bad_lines(self):
+        path = os.path.join(self.tmpdir, "prompts.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"prompt": "add a login page", "expected": true}\n\nnot json\n'
+                    '"fix the crash"\n{"text": "no prompt"}\n')
+        records, skipped = load_corpus(path)
+        self.assertEqual([r["prompt"] for r in records], ["add a login page", "fix the crash"])
+        self.assertEqual(skipped, 2)
+
+    def test_bench_cli(self):
+        path = os.path.join(self.tmpdir, "prompts.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.LABELLED:
+                f.write(json.dumps(record) + "\n")
+        script = os.path.join(SCRIPT_DIR, "auto_track.py")
+        result = subprocess.run([sys.executable, script, "bench", "--corpus", path],
+                                capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout)
+        self.assertEqual(report["recall"], 0.75)
+        self.assertIn("p99", report["latency_ms"])
+
+    def test_bench_cli_missing_corpus(self):
+        script = os.path.join(SCRIPT_DIR, "auto_track.py")
+        result = subprocess.run([sys.executable, script, "bench", "--corpus",
+                                 os.path.join(self.tmpdir, "missing.jsonl")],
+                                capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Cannot read corpus", result.stderr)
+
+
 class TestCLI(unittest.TestCase):
     def _run(self, args, stdin_text=None):
         cmd = [sys.executable, os.path.join(SCRIPT_DIR, "auto_track.py")] + args
@@ -0,0 +1,192 @@
+"""Tests for reading staged content from the git index (git_index.py)."""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+from git_index import (
+    decode_blob,
+    parse_added_lines,
+    read_blobs,
+    staged_additions,
+    staged_blobs,
+    staged_entries,
+    tracked_entries,
+)
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout
+
+
+class TestGitIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        _git(self.tmpdir, "init", "-q")
+        _git(self.tmpdir, "config", "user.email", "t@example.com")
+        _git(self.tmpdir, "config", "user.name", "t")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="") as f:
+            f.write(content)
+
+    def test_not_a_repository(self):
+        with tempfile.TemporaryDirectory() as plain:
+            self.assertIsNone(staged_entries(plain))
+            self.assertIsNone(staged_blobs(plain))
+
+    def test_tracked_entries(self):
+        self._write("a.txt", "a\n")
+        self._write("dir/b c.txt", "b\n")
+        _git(self.tmpdir, "add", ".")
+        entries = tracked_entries(self.tmpdir)
+        self.assertEqual([e["path"] for e in entries], ["a.txt", "dir/b c.txt"])
+        self.assertEqual(entries[0]["sha"], _git(self.tmpdir, "rev-parse", ":a.txt").strip())
+        with tempfile.TemporaryDirectory() as plain:
+            self.assertIsNone(tracked_entries(plain))
+
+    def test_entries_for_add_modify_delete(self):
+        self._write("keep.txt", "v1\n")
+        self._write("gone.txt", "bye\n")
+        _git(self.tmpdir, "add", ".")
+        _git(self.tmpdir, "commit", "-qm", "init")
+        self._write("keep.txt", "v2\n")
+        self._write("dir/new file.py", "print(1)\n")
+        os.remove(os.path.join(self.tmpdir, "gone.txt"))
+        _git(self.tmpdir, "add", "-A")
+
+        entries = {e["path"]: e for e in staged_entries(self.tmpdir)}
+        self.assertEqual(entries["keep.txt"]["status"], "M")
+        self.assertIsNotNone(entries["keep.txt"]["old_sha"])
+        self.assertEqual(entries["dir/new file.py"]["status"], "A")
+        self.assertIsNone(entries["dir/new file.py"]["old_sha"])
+        self.assertEqual(entries["gone.txt"]["status"], "D")
+
+        blobs = staged_blobs(self.tmpdir)
+        self.assertEqual(sorted(blobs), [("dir/new file.py", "print(1)\n", 9),
+                                         ("keep.txt", "v2\n", 3)])
+
+    def test_reads_index_not_working_tree(self):
+        self._write("a.txt", "staged\n")
+        _git(self.tmpdir, "add", "a.txt")
+        self._write("a.txt", "working tree\n")
+        self.assertEqual(staged_blobs(self.tmpdir), [("a.txt", "staged\n", 7)])
+
+    def test_paths_filter_and_max_bytes(self):
+        self._write("small.txt", "abc")
+        self._write("big.txt", "x" * 5000)
+        self._write("other.txt", "zzz")
+        _git(self.tmpdir, "add", ".")
+        blobs = staged_blobs(self.tmpdir, ["small.txt", "big.txt"], max_bytes=1024)
+        self.assertEqual(sorted(blobs), [("big.txt", "", 5000), ("small.txt", "abc", 3)])
+
+    def test_many_files_in_one_stream(self):
+        for i in range(300):
+            self._write(f"f{i}.txt", f"content {i}\n" * 50)
+        _git(self.tmpdir, "add", ".")
+        blobs = dict((p, c) for p, c, _ in staged_blobs(self.tmpdir))
+        self.assertEqual(len(blobs), 300)
+        self.assertEqual(blobs["f123.txt"], "content 123\n" * 50)
+
+    def test_missing_object_is_skipped(self):
+        self._write("a.txt", "x")
+        _git(self.tmpdir, "add", "a.txt")
+        sha = staged_entries(self.tmpdir)[0]["sha"]
+        blobs = read_blobs(self.tmpdir, [sha, "1" * 40])
+        self.assertEqual(blobs, {sha: (b"x", 1)})
+
+    def test_decode_blob_matches_text_mode(self):
+        self.assertEqual(decode_blob(b"a\r\nb\rc\xff\n"), "a\nb\nc\n")
+
+
+    def test_staged_additions(self):
+        self._write("app.py", "a\nb\nc\n")
+        _git(self.tmpdir, "add", ".")
+        _git(self.tmpdir, "commit", "-qm", "init")
+        self._write("app.py", "a\nNEW\nb\nc\nTAIL\n")
+        _git(self.tmpdir, "add", ".")
+        self.assertEqual(staged_additions(self.tmpdir),
+                         [("app.py", "NEW\nTAIL", 15, [2, 5])])
+
+    def test_additions_ignore_textconv(self):
+        self._write(".gitattributes", "*.py diff=upper\n")
+        _git(self.tmpdir, "config", "diff.upper.textconv", "tr a-z A-Z <")
+        self._write("app.py", "secret = 1\n")
+        _git(self.tmpdir, "add", ".")
+        self.assertIn(("app.py", "secret = 1", 11, [1]), staged_additions(self.tmpdir))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "needs byte filenames")
+    def test_additions_for_non_utf8_path(self):
+        name = os.fsdecode(b"caf\xe9.py")
+        with open(os.path.join(os.fsencode(self.tmpdir), b"caf\xe9.py"), "wb") as f:
+            f.write(b"x = 1\nbad = '\xff'\n")
+        _git(self.tmpdir, "add", ".")
+        self.assertEqual([e["path"] for e in staged_entries(self.tmpdir)], [name])
+        self.assertEqual(staged_additions(self.tmpdir), [(name, "x = 1\nbad = ''", 16, [1, 2])])
+
+
+class TestParseAddedLines(unittest.TestCase):
+    def test_multiple_files_and_hunks(self):
+        diff = "\n".join([
+            "diff --git a/x.py b/x.py",
+            "index 1111111..2222222 100644",
+            "--- a/x.py",
+            "+++ b/x.py",
+            "@@ -3 +3 @@ def f():",
+            "-old",
+            "+new",
+            "@@ -10,0 +11,2 @@",
+            "+++added looks like a header",
+            "+second\r",
+            "diff --git a/gone.py b/gone.py",
+            "deleted file mode 100644",
+            "--- a/gone.py",
+            "+++ /dev/null",
+            "@@ -1 +0,0 @@",
+            "-bye",
+            "diff --git a/n.txt b/n.txt",
+            "--- a/n.txt",
+            "+++ b/n.txt",
+            "@@ -1 +1 @@",
+            "-x",
+            "\\ No newline at end of file",
+            "+y",
+            "\\ No newline at end of file",
+            "",
+        ])
+        self.assertEqual(parse_added_lines(diff), {
+            "x.py": [(3, "new"), (11, "++added looks like a header"), (12, "second")],
+            "n.txt": [(1, "y")],
+        })
+
+    def test_quoted_path(self):
+        diff = "\n".join([
+            'diff --git "a/caf\\303\\251 \\"q\\".py" "b/caf\\303\\251 \\"q\\".py"',
+            '+++ "b/caf\\303\\251 \\"q\\".py"',
+            "@@ -0,0 +1 @@",
+            "+x",
+        ])
+        self.assertEqual(parse_added_lines(diff), {'caf\u00e9 "q".py': [(1, "x")]})
+
+
+if __name__ == "__main__":
+    unittest.main()
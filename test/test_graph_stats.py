@@ -0,0 +1,138 @@
+"""Tests for the streaming graph.json counter (graph_stats.py)."""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+SCRIPT_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+from graph_stats import compute_graph_stats, load_graph_stats, sidecar_path
+
+
+def _graph(n_nodes, link_key="links"):
+    nodes = [
+        {"id": f"n{i}", "label": f"Node {i}", "source_file": f"pkg{i % 3}/mod{i}.py"}
+        for i in range(n_nodes)
+    ]
+    links = [{"source": f"n{i}", "target": "n0"} for i in range(1, n_nodes)]
+    links += [{"source": "n0", "target": "n1"}]
+    return {"directed": True, "multigraph": False, "graph": {"name": "x"},
+            "nodes": nodes, link_key: links}
+
+
+class TestComputeGraphStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "graph.json")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, data, indent=None):
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=indent)
+
+    def test_counts_match_full_load(self):
+        self._write(_graph(50))
+        stats = compute_graph_stats(self.path)
+        self.assertEqual(stats["node_count"], 50)
+        self.assertEqual(stats["edge_count"], 50)
+        self.assertEqual(stats["modules"], {"pkg0": 17, "pkg1": 17, "pkg2": 16})
+        self.assertEqual(stats["god_nodes"][0], {"id": "n0", "label": "Node 0", "in_degree": 49})
+
+    def test_tiny_chunks_and_pretty_printed_json(self):
+        self._write(_graph(30), indent=2)
+        expected = compute_graph_stats(self.path)
+        for chunk_size in (1, 7, 64):
+            self.assertEqual(compute_graph_stats(self.path, chunk_size=chunk_size), expected)
+
+    def test_edges_key(self):
+        self._write(_graph(5, link_key="edges"))
+        self.assertEqual(compute_graph_stats(self.path)["edge_count"], 5)
+
+    def test_empty_graph(self):
+        self._write({"nodes": [], "links": []})
+        stats = compute_graph_stats(self.path)
+        self.assertEqual((stats["node_count"], stats["edge_count"]), (0, 0))
+
+    def test_number_split_across_chunks(self):
+        with open(self.path, "w") as f:
+            f.write('{"version": 123456789, "nodes": [{"id": "a"}], "links": []}')
+        self.assertEqual(compute_graph_stats(self.path, chunk_size=3)["node_count"], 1)
+
+    def test_braces_inside_strings(self):
+        nodes = [{"id": f"n{i}", "label": 'x},{"id": "fake"}]', "source_file": "a/b.py"}
+                 for i in range(20)]
+        self._write({"nodes": nodes, "links": [{"source": "n1", "target": "n2"}]})
+        for chunk_size in (16, 100, 4096):
+            stats = compute_graph_stats(self.path, chunk_size=chunk_size)
+            self.assertEqual(stats["node_count"], 20)
+            self.assertEqual(stats["god_nodes"][0]["label"], 'x},{"id": "fake"}]')
+
+    def test_corrupt_graph_raises(self):
+        with open(self.path, "w") as f:
+            f.write("NOT VALID JSON{{{")
+        with self.assertRaises(ValueError):
+            compute_graph_stats(self.path)
+
+    def test_truncated_graph_raises(self):
+        with open(self.path, "w") as f:
+            f.write('{"nodes": [{"id": "a"}, {"id": ')
+        with self.assertRaises(ValueError):
+            compute_graph_stats(self.path, chunk_size=4)
+
+
+class TestLoadGraphStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "graph.json")
+        with open(self.path, "w") as f:
+            json.dump(_graph(10), f)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_writes_sidecar(self):
+        stats = load_graph_stats(self.path)
+        self.assertTrue(os.path.isfile(sidecar_path(self.path)))
+        self.assertEqual(stats["node_count"], 10)
+
+    def test_reuses_fresh_sidecar(self):
+        load_graph_stats(self.path)
+        side = sidecar_path(self.path)
+        with open(side) as f:
+            cached = json.load(f)
+        cached["stats"]["node_count"] = 999
+        with open(side, "w") as f:
+            json.dump(cached, f)
+        self.assertEqual(load_graph_stats(self.path)["node_count"], 999)
+
+    def test_stale_sidecar_recomputed(self):
+        load_graph_stats(self.path)
+        with open(self.path, "w") as f:
+            json.dump(_graph(4), f)
+        self.assertEqual(load_graph_stats(self.path)["node_count"], 4)
+
+    def test_missing_graph(self):
+        self.assertIsNone(load_graph_stats(os.path.join(self.tmpdir, "nope.json")))
+
+    def test_corrupt_graph_returns_none(self):
+        with open(self.path, "w") as f:
+            f.write("{{{")
+        self.assertIsNone(load_graph_stats(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
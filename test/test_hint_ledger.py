@@ -0,0 +1,173 @@
+"""Tests for the auto-track hint ledger (hint_ledger.py)."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+HOOK_DIR = os.path.join(os.path.dirname(__file__), "..", "plugins", "hody-workflow", "hooks")
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+import hint_ledger
+from hint_ledger import (
+    DEBOUNCE_SECONDS,
+    DEDUPE_WINDOW_SECONDS,
+    LEDGER_FILE,
+    MAX_SESSIONS,
+    STATE_FILE,
+    is_repeat,
+    load,
+    record,
+    save,
+    title_key,
+    workflow_active,
+)
+
+T0 = 1_700_000_000
+
+
+class TestTitleKey(unittest.TestCase):
+    def test_normalizes_case_and_punctuation(self):
+        self.assertEqual(title_key("Add OAuth login!"), title_key("  add oauth, login"))
+
+    def test_different_titles_differ(self):
+        self.assertNotEqual(title_key("add oauth login"), title_key("add saml login"))
+
+    def test_only_leading_words_count(self):
+        head = " ".join(f"w{i}" for i in range(hint_ledger.TITLE_KEY_WORDS))
+        self.assertEqual(title_key(head + " tail one"), title_key(head + " tail two"))
+
+
+class TestRepeats(unittest.TestCase):
+    def setUp(self):
+        self.ledger = {"sessions": {}}
+        record(self.ledger, "s1", "add oauth login endpoint", T0)
+
+    def test_same_title_suppressed_within_window(self):
+        later = T0 + DEBOUNCE_SECONDS + 1
+        self.assertTrue(is_repeat(self.ledger, "s1", "Add OAuth login endpoint.", later))
+
+    def test_same_title_allowed_after_window(self):
+        later = T0 + DEDUPE_WINDOW_SECONDS + 1
+        self.assertFalse(is_repeat(self.ledger, "s1", "add oauth login endpoint", later))
+
+    def test_other_title_debounced(self):
+        self.assertTrue(is_repeat(self.ledger, "s1", "fix the upload worker", T0 + 5))
+        later = T0 + DEBOUNCE_SECONDS + 1
+        self.assertFalse(is_repeat(self.ledger, "s1", "fix the upload worker", later))
+
+    def test_other_session_unaffected(self):
+        self.assertFalse(is_repeat(self.ledger, "s2", "add oauth login endpoint", T0 + 5))
+
+    def test_record_prunes_expired_titles(self):
+        record(self.ledger, "s1", "fix the upload worker", T0 + DEDUPE_WINDOW_SECONDS + 1)
+        self.assertEqual(list(self.ledger["sessions"]["s1"]["titles"]),
+                         [title_key("fix the upload worker")])
+
+    def test_record_caps_sessions(self):
+        for i in range(MAX_SESSIONS + 5):
+            record(self.ledger, f"x{i}", "add oauth login endpoint", T0 + i + 1)
+        self.assertEqual(len(self.ledger["sessions"]), MAX_SESSIONS)
+        self.assertNotIn("s1", self.ledger["sessions"])
+        self.assertIn(f"x{MAX_SESSIONS + 4}", self.ledger["sessions"])
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_roundtrip(self):
+        ledger = load(self.tmpdir)
+        record(ledger, "s1", "add oauth login endpoint", T0)
+        save(self.tmpdir, ledger)
+        self.assertTrue(is_repeat(load(self.tmpdir), "s1", "add oauth login endpoint", T0 + 90))
+
+    def test_corrupt_file_starts_empty(self):
+        path = os.path.join(self.tmpdir, LEDGER_FILE)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(load(self.tmpdir), {"sessions": {}})
+
+
+class TestWorkflowCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmpdir, ".hody"))
+        self.state_path = os.path.join(self.tmpdir, STATE_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write_state(self, status, mtime):
+        with open(self.state_path, "w") as f:
+            json.dump({"status": status}, f)
+        os.utime(self.state_path, (mtime, mtime))
+
+    def test_no_state_file(self):
+        self.assertEqual(workflow_active(self.tmpdir, {"sessions": {}}), (False, False))
+
+    def test_unchanged_state_is_not_reparsed(self):
+        self._write_state("in_progress", T0)
+        ledger = {"sessions": {}}
+        self.assertEqual(workflow_active(self.tmpdir, ledger), (True, True))
+        with mock.patch.object(hint_ledger.json, "load") as parse:
+            self.assertEqual(workflow_active(self.tmpdir, ledger), (True, False))
+        parse.assert_not_called()
+
+    def test_changed_state_is_reparsed(self):
+        self._write_state("in_progress", T0)
+        ledger = {"sessions": {}}
+        workflow_active(self.tmpdir, ledger)
+        self._write_state("completed", T0 + 10)
+        self.assertEqual(workflow_active(self.tmpdir, ledger), (False, True))
+
+    def test_corrupt_state_is_inactive(self):
+        with open(self.state_path, "w") as f:
+            f.write("{oops")
+        self.assertEqual(workflow_active(self.tmpdir, {"sessions": {}})[0], False)
+
+
+class TestHookUsesLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmpdir, ".hody"))
+        sys.path.insert(0, os.path.abspath(HOOK_DIR))
+        import auto_track_hook
+        self.hook = auto_track_hook
+
+    def tearDown(self):
+        sys.path.remove(os.path.abspath(HOOK_DIR))
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _handle(self, prompt, session_id="s1"):
+        return self.hook.handle({"cwd": self.tmpdir, "prompt": prompt, "session_id": session_id}, env={})
+
+    def test_repeat_prompt_hinted_once_per_session(self):
+        self.assertIsNotNone(self._handle("add oauth login endpoint for the api"))
+        self.assertIsNone(self._handle("Add OAuth login endpoint for the API"))
+        self.assertIsNotNone(self._handle("add oauth login endpoint for the api", "s2"))
+
+    def test_active_workflow_suppresses_hint(self):
+        with open(os.path.join(self.tmpdir, STATE_FILE), "w") as f:
+            json.dump({"status": "in_progress"}, f)
+        self.assertIsNone(self._handle("add oauth login endpoint for the api"))
+        self.assertTrue(load(self.tmpdir)["workflow"]["active"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+"""Tests for the optional hook daemon (hook_daemon.py) and thin hook clients."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+HOOK_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "hooks",
+)
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+sys.path.insert(0, os.path.abspath(HOOK_DIR))
+
+import hook_daemon
+import inject_project_context
+
+
+def _setup_project(tmpdir):
+    hody_dir = os.path.join(tmpdir, ".hody")
+    os.makedirs(hody_dir, exist_ok=True)
+    with open(os.path.join(hody_dir, "profile.yaml"), "w") as f:
+        f.write("project:\n  name: daemon-test\n")
+
+
+@unittest.skipUnless(hasattr(__import__("socket"), "AF_UNIX"), "Unix sockets required")
+class TestHookDaemon(unittest.TestCase):
+    def setUp(self):
+        # AF_UNIX paths are length-limited, keep the directory short
+        self.sock_dir = tempfile.mkdtemp(prefix="hody", dir="/tmp")
+        self.sock = os.path.join(self.sock_dir, "d.sock")
+        self.env = patch.dict(os.environ, {"HODY_DAEMON_SOCKET": self.sock})
+        self.env.start()
+        self.thread = threading.Thread(
+            target=hook_daemon.serve, args=(self.sock,), kwargs={"idle_timeout": 0},
+            daemon=True,
+        )
+        self.thread.start()
+        deadline = time.monotonic() + 5
+        while not hook_daemon.ping(self.sock) and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    def tearDown(self):
+        hook_daemon.stop(self.sock)
+        self.thread.join(timeout=5)
+        self.env.stop()
+        shutil.rmtree(self.sock_dir, ignore_errors=True)
+
+    def test_ping(self):
+        self.assertTrue(hook_daemon.ping(self.sock))
+
+    def test_ping_reports_code_version(self):
+        self.assertEqual(hook_daemon._ping(self.sock)["version"], hook_daemon.code_version())
+
+    def test_stale_daemon_is_stopped(self):
+        """A daemon running other hook code is not used, and is told to exit."""
+        with patch.object(hook_daemon, "code_version", return_value="plugin upgraded"):
+            handled, output = hook_daemon.forward(
+                "quality_gate", {"tool_input": {"command": "ls"}, "cwd": "/tmp"}
+            )
+        self.assertEqual((handled, output), (False, None))
+        self.thread.join(timeout=5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(hook_daemon.ping(self.sock))
+
+    def test_forward_non_commit_has_no_output(self):
+        handled, output = hook_daemon.forward(
+            "quality_gate", {"tool_input": {"command": "ls -la"}, "cwd": "/tmp"}
+        )
+        self.assertTrue(handled)
+        self.assertIsNone(output)
+
+    def test_forward_matches_in_process(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _setup_project(tmpdir)
+            input_data = {"cwd": tmpdir}
+            env = {"HODY_SKIP_REFRESH": "1"}
+            with patch.dict(os.environ, env):
+                handled, output = hook_daemon.forward("inject_project_context", input_data)
+            self.assertTrue(handled)
+            self.assertEqual(output, inject_project_context.handle(input_data, env=env))
+
+    def test_env_is_forwarded(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, ".hody"))
+            input_data = {"cwd": tmpdir, "prompt": "Implement the OAuth2 login flow for the admin dashboard"}
+            with patch.dict(os.environ, {"HODY_AUTO_TRACK": "0"}):
+                handled, output = hook_daemon.forward("auto_track_hook", input_data)
+            self.assertTrue(handled)
+            self.assertIsNone(output)
+
+    def test_unknown_hook_is_not_handled(self):
+        handled, output = hook_daemon.forward("nope", {})
+        self.assertFalse(handled)
+
+    def test_hook_script_uses_daemon(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _setup_project(tmpdir)
+            result = subprocess.run(
+                [sys.executable, os.path.join(HOOK_DIR, "inject_project_context.py")],
+                input=json.dumps({"cwd": tmpdir}),
+                capture_output=True, text=True, timeout=10,
+                env={**os.environ, "HODY_SKIP_REFRESH": "1"},
+            )
+            msg = json.loads(result.stdout).get("systemMessage", "")
+            self.assertIn("daemon-test", msg)
+
+
+@unittest.skipUnless(hasattr(os, "getuid"), "POSIX ownership checks")
+class TestSocketSafety(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix="hody", dir="/tmp")
+        self.sock = os.path.join(self.tmpdir, "d.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _listening_socket(self):
+        import socket
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.sock)
+        sock.listen(1)
+        self.addCleanup(sock.close)
+
+    def test_default_dir_is_private(self):
+        env = {"TMPDIR": self.tmpdir, "XDG_RUNTIME_DIR": ""}
+        with patch.dict(os.environ, env):
+            os.environ.pop("XDG_RUNTIME_DIR")
+            directory = hook_daemon.socket_dir(create=True)
+            self.assertEqual(directory, os.path.join(self.tmpdir, f"hody-{os.getuid()}"))
+            self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+            self.assertEqual(os.path.dirname(hook_daemon.socket_path()), directory)
+
+    def test_shared_dir_rejected(self):
+        directory = os.path.join(self.tmpdir, f"hody-{os.getuid()}")
+        os.mkdir(directory, 0o755)
+        os.chmod(directory, 0o755)
+        with patch.dict(os.environ, {"TMPDIR": self.tmpdir, "XDG_RUNTIME_DIR": ""}):
+            os.environ.pop("XDG_RUNTIME_DIR")
+            self.assertIsNone(hook_daemon.socket_dir(create=True))
+
+    def test_forward_ignores_non_socket(self):
+        with open(self.sock, "w") as f:
+            f.write("not a socket")
+        with patch.dict(os.environ, {"HODY_DAEMON_SOCKET": self.sock}):
+            self.assertEqual(hook_daemon.forward("quality_gate", {}), (False, None))
+
+    def test_forward_ignores_socket_in_shared_dir(self):
+        self._listening_socket()
+        os.chmod(self.tmpdir, 0o777)
+        with patch.dict(os.environ, {"HODY_DAEMON_SOCKET": self.sock}):
+            self.assertEqual(hook_daemon.forward("quality_gate", {}), (False, None))
+
+    def test_ping_and_stop_ignore_socket_in_shared_dir(self):
+        self._listening_socket()
+        os.chmod(self.tmpdir, 0o777)
+        with patch.object(hook_daemon, "_request") as request:
+            self.assertFalse(hook_daemon.ping(self.sock))
+            self.assertFalse(hook_daemon.stop(self.sock))
+        request.assert_not_called()
+
+    def test_serve_refuses_foreign_path(self):
+        with open(self.sock, "w") as f:
+            f.write("not a socket")
+        with self.assertRaises(RuntimeError):
+            hook_daemon.serve(self.sock, idle_timeout=0)
+        self.assertTrue(os.path.isfile(self.sock))
+
+    def test_serve_refuses_shared_dir(self):
+        os.chmod(self.tmpdir, 0o777)
+        with self.assertRaises(RuntimeError):
+            hook_daemon.serve(self.sock, idle_timeout=0)
+
+
+class TestForwardFallback(unittest.TestCase):
+    def test_no_socket_falls_back(self):
+        with patch.dict(os.environ, {"HODY_DAEMON_SOCKET": "/tmp/hody-missing.sock"}):
+            self.assertEqual(hook_daemon.forward("quality_gate", {}), (False, None))
+
+    def test_disabled_by_env(self):
+        with patch.dict(os.environ, {"HODY_DAEMON": "0"}):
+            self.assertEqual(hook_daemon.forward("quality_gate", {}), (False, None))
+
+    def test_dispatch_reports_handler_errors(self):
+        def boom(input_data, env=None):
+            raise ValueError("bad input")
+        response = hook_daemon.dispatch({"x": boom}, {"hook": "x", "input": {}})
+        self.assertFalse(response["ok"])
+        self.assertIn("bad input", response["error"])
+
+    def test_dispatch_refuses_other_code_version(self):
+        calls = []
+        handlers = {"x": lambda input_data, env=None: calls.append(input_data)}
+        response = hook_daemon.dispatch(handlers, {"hook": "x", "version": "old"}, version="new")
+        self.assertTrue(response["stale"])
+        self.assertFalse(response["ok"])
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
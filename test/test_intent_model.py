@@ -0,0 +1,268 @@
+"""Tests for the learned auto-track hint filter (intent_model.py)."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+HOOK_DIR = os.path.join(os.path.dirname(__file__), "..", "plugins", "hody-workflow", "hooks")
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+import intent_model
+from intent_model import (
+    LABEL_WINDOW_SECONDS,
+    LOG_FILE,
+    MODEL_FILE,
+    N_FEATURES,
+    collect_examples,
+    features,
+    load,
+    log_hint,
+    train,
+)
+import tracker_schema
+
+ACCEPTED = [
+    "add oauth login endpoint for the api",
+    "implement retry logic in the upload worker",
+    "add pagination to the users endpoint",
+    "implement export to csv for reports",
+    "build the billing dashboard page",
+    "thêm endpoint đăng nhập cho api",
+]
+IGNORED = [
+    "fix typo in that last message please",
+    "change the wording a bit in your answer",
+    "make it shorter and simpler",
+    "update your previous reply with the new name",
+    "remove the emoji from the answer please",
+    "sửa lại câu trả lời ngắn hơn",
+]
+
+
+def _prompts():
+    return [(t, 1) for t in ACCEPTED] * 3 + [(t, 0) for t in IGNORED] * 3
+
+
+def _examples():
+    return [(features(t), label) for t, label in _prompts()]
+
+
+class TestModel(unittest.TestCase):
+    def test_features_are_stable_and_bounded(self):
+        feats = features("Add OAuth login endpoint")
+        self.assertEqual(feats, features("add oauth LOGIN endpoint"))
+        self.assertTrue(all(0 <= i < N_FEATURES for i in feats))
+        self.assertEqual(feats, sorted(set(feats)))
+        self.assertEqual(features("x " * 10000), features("x " * 200))
+
+    def test_train_separates_classes(self):
+        model = train(_examples())
+        for text in ACCEPTED:
+            self.assertGreater(model.score(text), 0.5, text)
+        for text in IGNORED:
+            self.assertLess(model.score(text), 0.5, text)
+
+    def test_train_needs_both_classes(self):
+        with self.assertRaises(ValueError):
+            train([(features(t), 1) for t in ACCEPTED] * 5)
+        with self.assertRaises(ValueError):
+            train([(features("a"), 1), (features("b"), 0)])
+
+    def test_save_load_roundtrip(self):
+        model = train(_examples())
+        tmpdir = tempfile.mkdtemp()
+        try:
+            model.save(os.path.join(tmpdir, MODEL_FILE))
+            self.assertEqual(os.path.getsize(os.path.join(tmpdir, MODEL_FILE)), 14 + 4 * N_FEATURES)
+            loaded = load(tmpdir)
+            self.assertIs(load(tmpdir), loaded)  # Cached until the file changes
+            for text in ACCEPTED + IGNORED:
+                self.assertAlmostEqual(loaded.score(text), model.score(text), places=5)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def test_missing_or_corrupt_model(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            self.assertIsNone(load(tmpdir))
+            os.makedirs(os.path.dirname(os.path.join(tmpdir, MODEL_FILE)))
+            with open(os.path.join(tmpdir, MODEL_FILE), "wb") as f:
+                f.write(b"garbage")
+            self.assertIsNone(load(tmpdir))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def test_scoring_is_sub_millisecond(self):
+        model = train(_examples())
+        prompt = "implement retry logic in the upload worker " * 200
+        start = time.perf_counter()
+        for _ in range(1000):
+            model.score(prompt)
+        self.assertLess((time.perf_counter() - start) / 1000, 0.001)
+
+
+class TestTrainingData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        tracker_schema.init_db(self.tmpdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _add_item(self, title, created_ts, hint_id=None):
+        import sqlite3
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created_ts))
+        extra = json.dumps({"hint_id": hint_id} if hint_id else {})
+        conn = sqlite3.connect(os.path.join(self.tmpdir, ".hody", "tracker.db"))
+        conn.execute(
+            "INSERT INTO items (id, type, title, status, created_at, updated_at, session_id, extra)"
+            " VALUES (?, 'task', ?, 'created', ?, ?, 'ses_1', ?)",
+            (f"itm_{created_ts}_{len(title)}", title, created, created, extra),
+        )
+        conn.commit()
+        conn.close()
+
+    def test_hints_labeled_by_linked_items(self):
+        now = 1_800_000_000
+        accepted = log_hint(self.tmpdir, "add oauth login endpoint", now=now - 7200)
+        log_hint(self.tmpdir, "make it shorter", now=now - 5400)
+        recent = log_hint(self.tmpdir, "too recent to label", now=now - 60)
+        self._add_item("OAuth login endpoint", now - 7200 + 300, hint_id=accepted)
+        self._add_item("Unrelated item", now - 5400 + 60)
+        self._add_item("Too recent", now - 30, hint_id=recent)
+        examples = collect_examples(self.tmpdir, now=now)
+        # Item titles are not training examples, only the logged hints
+        self.assertEqual(examples, [
+            (features("add oauth login endpoint"), 1),
+            (features("make it shorter"), 0),
+        ])
+
+    def test_unlinked_item_does_not_accept_hint(self):
+        """An item created right after a hint, but not from it, is no label."""
+        now = 1_800_000_000
+        log_hint(self.tmpdir, "add export", now=now - 3 * LABEL_WINDOW_SECONDS)
+        self._add_item("Export", now - 3 * LABEL_WINDOW_SECONDS + 60)
+        self.assertEqual(collect_examples(self.tmpdir, now=now), [(features("add export"), 0)])
+
+    def test_log_stores_features_not_text(self):
+        hint_id = log_hint(self.tmpdir, "add the secret-project login page", session_id="s1")
+        with open(os.path.join(self.tmpdir, LOG_FILE)) as f:
+            raw = f.read()
+        self.assertNotIn("secret", raw)
+        record = json.loads(raw)
+        self.assertEqual(record["hint_id"], hint_id)
+        self.assertEqual(record["features"], features("add the secret-project login page"))
+
+    def test_legacy_text_records_skipped(self):
+        os.makedirs(os.path.join(self.tmpdir, ".hody", "cache"))
+        with open(os.path.join(self.tmpdir, LOG_FILE), "w") as f:
+            f.write(json.dumps({"ts": 1, "session_id": "s1", "text": "add export"}) + "\n")
+            f.write(json.dumps({"ts": 1, "hint_id": "hnt_x", "features": [N_FEATURES]}) + "\n")
+        self.assertEqual(collect_examples(self.tmpdir), [])
+
+    def test_extra_prompt_logs(self):
+        path = os.path.join(self.tmpdir, "prompts.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"prompt": "add a thing", "label": 1}) + "\n")
+            f.write("not json\n")
+            f.write(json.dumps({"prompt": "tweak it", "label": 0}) + "\n")
+        examples = collect_examples(self.tmpdir, prompt_logs=[path])
+        self.assertEqual(examples, [(features("add a thing"), 1), (features("tweak it"), 0)])
+
+    def test_log_trimmed_past_limit(self):
+        old_limit = intent_model.MAX_LOG_BYTES
+        intent_model.MAX_LOG_BYTES = 2000
+        try:
+            for i in range(100):
+                log_hint(self.tmpdir, f"add feature number {i}", now=i)
+        finally:
+            intent_model.MAX_LOG_BYTES = old_limit
+        self.assertLessEqual(os.path.getsize(os.path.join(self.tmpdir, LOG_FILE)), 2100)
+
+    def test_train_cli(self):
+        path = os.path.join(self.tmpdir, "prompts.jsonl")
+        with open(path, "w") as f:
+            for text, label in _prompts():
+                f.write(json.dumps({"prompt": text, "label": label}) + "\n")
+        script = os.path.join(os.path.abspath(SCRIPTS_DIR), "auto_track.py")
+        result = subprocess.run(
+            [sys.executable, script, "train", "--cwd", self.tmpdir, "--prompts", path],
+            capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout)
+        self.assertEqual(report["examples"], len(_examples()))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, MODEL_FILE)))
+
+    def test_train_cli_without_data(self):
+        script = os.path.join(os.path.abspath(SCRIPTS_DIR), "auto_track.py")
+        result = subprocess.run([sys.executable, script, "train", "--cwd", self.tmpdir],
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Not enough training data", result.stderr)
+
+
+class TestHookUsesModel(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmpdir, ".hody"))
+        sys.path.insert(0, os.path.abspath(HOOK_DIR))
+        import auto_track_hook
+        self.hook = auto_track_hook
+
+    def tearDown(self):
+        sys.path.remove(os.path.abspath(HOOK_DIR))
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _handle(self, prompt, session_id="s1"):
+        return self.hook.handle({"cwd": self.tmpdir, "prompt": prompt, "session_id": session_id}, env={})
+
+    def test_without_model_hints_and_logs(self):
+        output = self._handle("add oauth login endpoint for the api")
+        self.assertIsNotNone(output)
+        with open(os.path.join(self.tmpdir, LOG_FILE)) as f:
+            record = json.loads(f.readline())
+        self.assertEqual((record["features"], record["session_id"]),
+                         (features("add oauth login endpoint for the api"), "s1"))
+        self.assertIn(f"--hint-id {record['hint_id']}",
+                      output["hookSpecificOutput"]["additionalContext"])
+
+    def test_item_created_from_hint_is_a_positive(self):
+        """The create command suggested by a hint links the item back to it."""
+        now = time.time()
+        self._handle("add oauth login endpoint for the api")
+        with open(os.path.join(self.tmpdir, LOG_FILE)) as f:
+            hint_id = json.loads(f.readline())["hint_id"]
+        script = os.path.join(os.path.abspath(SCRIPTS_DIR), "tracker.py")
+        result = subprocess.run(
+            [sys.executable, script, "create", "--type", "task", "--title", "OAuth login",
+             "--hint-id", hint_id, "--cwd", self.tmpdir],
+            capture_output=True, text=True, timeout=30,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout)["extra"], {"hint_id": hint_id})
+        examples = collect_examples(self.tmpdir, now=now + 2 * LABEL_WINDOW_SECONDS)
+        self.assertEqual([label for _, label in examples], [1])
+
+    def test_model_suppresses_likely_ignored_hints(self):
+        train(_examples()).save(os.path.join(self.tmpdir, MODEL_FILE))
+        self.assertIsNotNone(self._handle("add oauth login endpoint for the api"))
+        # Another session, so the hint ledger's debounce does not apply
+        self.assertIsNone(self._handle("remove the emoji from the answer please", "s2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
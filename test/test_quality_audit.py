@@ -0,0 +1,111 @@
+"""Tests for the incremental whole-repository audit (quality_audit.py)."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+import quality_audit
+from quality_audit import AUDIT_DB, audit
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout
+
+
+class TestAudit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        _git(self.tmpdir, "init", "-q")
+        self._write("src/app.js", 'const x = 1;\nconsole.log("x");\n')
+        self._write("src/clean.py", "x = 1\n")
+        self._write("config.py", 'password = "hunter2hunter2"\n')
+        self._write("node_modules/lib/index.js", "eval(x)\n")
+        _git(self.tmpdir, "add", ".")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_first_audit_scans_everything(self):
+        report = audit(self.tmpdir)
+        self.assertEqual((report["files"], report["scanned"], report["reused"]), (3, 3, 0))
+        self.assertEqual(list(report["errors"]), ["config.py"])
+        self.assertEqual(report["warnings"]["src/app.js"][0]["line"], 2)
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, AUDIT_DB)))
+
+    def test_reaudit_reuses_unchanged_blobs(self):
+        first = audit(self.tmpdir)
+        with patch("quality_audit.git_index.read_blobs",
+                   side_effect=AssertionError("nothing should be read")):
+            second = audit(self.tmpdir)
+        self.assertEqual((second["scanned"], second["reused"]), (0, 3))
+        self.assertEqual((second["errors"], second["warnings"]), (first["errors"], first["warnings"]))
+
+    def test_only_changed_blobs_rescanned(self):
+        audit(self.tmpdir)
+        self._write("config.py", "password = None\n")
+        os.remove(os.path.join(self.tmpdir, "src", "clean.py"))
+        _git(self.tmpdir, "add", "-A", "config.py", "src")
+        report = audit(self.tmpdir)
+        self.assertEqual((report["files"], report["scanned"], report["reused"]), (2, 1, 1))
+        self.assertEqual(report["errors"], {})
+        conn = quality_audit._connect(self.tmpdir)
+        try:
+            paths = [r[0] for r in conn.execute("SELECT path FROM results ORDER BY path")]
+        finally:
+            conn.close()
+        self.assertEqual(paths, ["config.py", "src/app.js"])
+
+    def test_rules_change_rescans(self):
+        audit(self.tmpdir)
+        os.makedirs(os.path.join(self.tmpdir, ".hody"), exist_ok=True)
+        with open(os.path.join(self.tmpdir, ".hody", "quality-rules.yaml"), "w") as f:
+            f.write("rules:\n  debug_statements:\n    enabled: false\n")
+        report = audit(self.tmpdir)
+        self.assertEqual(report["scanned"], 3)
+        self.assertEqual(report["warnings"], {})
+
+    def test_reads_index_not_working_tree(self):
+        self._write("src/clean.py", "breakpoint()\n")  # Not staged
+        self.assertNotIn("src/clean.py", audit(self.tmpdir)["warnings"])
+
+    def test_small_batches(self):
+        report = audit(self.tmpdir, batch_size=1)
+        self.assertEqual(report["scanned"], 3)
+        self.assertEqual(list(report["errors"]), ["config.py"])
+
+    def test_not_a_repository(self):
+        with tempfile.TemporaryDirectory() as plain:
+            self.assertIsNone(audit(plain))
+
+    def test_cli(self):
+        script = os.path.join(os.path.abspath(SCRIPTS_DIR), "quality_rules.py")
+        result = subprocess.run([sys.executable, script, "audit", "--cwd", self.tmpdir],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1)  # config.py has an error
+        self.assertEqual(json.loads(result.stdout)["files"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the quality gate result cache (quality_cache.py)."""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "plugins",
+    "hody-workflow",
+    "skills",
+    "project-profile",
+    "scripts",
+)
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+import quality_cache
+from quality_rules import get_default_rules
+
+RESULT = {"errors": [{"file": "a.js", "line": 1, "message": "x"}], "warnings": []}
+
+
+class TestQualityCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_round_trip(self):
+        key = quality_cache.entry_key("d", "a.js", "1" * 40)
+        self.assertEqual(quality_cache.lookup(self.tmpdir, [key]), {})
+        quality_cache.store(self.tmpdir, {key: RESULT})
+        self.assertEqual(quality_cache.lookup(self.tmpdir, [key]), {key: RESULT})
+
+    def test_key_depends_on_every_input(self):
+        base = quality_cache.entry_key("d", "a.js", "1" * 40)
+        self.assertNotEqual(base, quality_cache.entry_key("e", "a.js", "1" * 40))
+        self.assertNotEqual(base, quality_cache.entry_key("d", "b.js", "1" * 40))
+        self.assertNotEqual(base, quality_cache.entry_key("d", "a.js", "2" * 40))
+        self.assertNotEqual(base, quality_cache.entry_key("d", "a.js", "1" * 40, "added:"))
+
+    def test_rules_digest_tracks_config_and_engine(self):
+        rules = get_default_rules()
+        digest = quality_cache.rules_digest(rules)
+        self.assertEqual(digest, quality_cache.rules_digest(get_default_rules()))
+        rules["rules"]["file_size"]["max_kb"] = 1
+        self.assertNotEqual(digest, quality_cache.rules_digest(rules))
+        old = quality_cache.ENGINE_VERSION
+        try:
+            quality_cache.ENGINE_VERSION = old + 1
+            self.assertNotEqual(digest, quality_cache.rules_digest(get_default_rules()))
+        finally:
+            quality_cache.ENGINE_VERSION = old
+
+    def test_rules_digest_tracks_builtin_patterns(self):
+        digest = quality_cache.rules_digest(get_default_rules())
+        with patch("quality_rules.engine_fingerprint", return_value="other"):
+            self.assertNotEqual(digest, quality_cache.rules_digest(get_default_rules()))
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = quality_cache.entry_key("d", "a.js", "1" * 40)
+        os.makedirs(quality_cache.cache_dir(self.tmpdir))
+        with open(os.path.join(quality_cache.cache_dir(self.tmpdir), f"{key}.json"), "w") as f:
+            f.write("{not json")
+        self.assertEqual(quality_cache.lookup(self.tmpdir, [key]), {})
+
+    def test_lru_eviction(self):
+        keys = [quality_cache.entry_key("d", f"f{i}.js", "1" * 40) for i in range(10)]
+        for i, key in enumerate(keys):
+            quality_cache.store(self.tmpdir, {key: RESULT}, max_bytes=10 ** 6)
+            path = os.path.join(quality_cache.cache_dir(self.tmpdir), f"{key}.json")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        # A hit makes the oldest entry the most recently used
+        quality_cache.lookup(self.tmpdir, [keys[0]])
+
+        entry_size = os.path.getsize(
+            os.path.join(quality_cache.cache_dir(self.tmpdir), f"{keys[0]}.json"))
+        removed = quality_cache.evict(self.tmpdir, max_bytes=entry_size * 5)
+        self.assertEqual(removed, 6)
+        remaining = quality_cache.lookup(self.tmpdir, keys)
+        self.assertIn(keys[0], remaining)
+        self.assertEqual(set(remaining), {keys[0], keys[7], keys[8], keys[9]})
+
+
+if __name__ == "__main__":
+    unittest.main()
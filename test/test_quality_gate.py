@@ -1,9 +1,13 @@
 """Tests for quality_gate.py hook."""
+import io
 import json
 import os
+import subprocess
 import sys
 import tempfile
+import time
 import unittest
+from unittest.mock import patch
 
 # Add the hook to path
 HOOK_DIR = os.path.join(
@@ -16,6 +20,8 @@ HOOK_DIR = os.path.join(
 sys.path.insert(0, os.path.abspath(HOOK_DIR))
 
 from quality_gate import (
+    main,
+    is_commit_candidate,
     check_file,
     should_skip,
     run_quality_gate,
@@ -56,6 +62,19 @@ class TestShouldSkip(unittest.TestCase):
     def test_skip_map_files(self):
         self.assertTrue(should_skip("bundle.js.map"))
 
+    def test_legacy_fallback_still_skips(self):
+        with patch("quality_gate._load_quality_rules", return_value=None):
+            self.assertTrue(should_skip("node_modules/lodash/index.js"))
+            self.assertTrue(should_skip("yarn.lock"))
+            self.assertTrue(should_skip("bundle.min.js"))
+            self.assertFalse(should_skip("src/auth.ts"))
+
+    def test_fallback_lists_match_quality_rules(self):
+        import quality_gate
+        quality_rules = quality_gate._load_quality_rules()
+        self.assertEqual(quality_gate.SKIP_EXTENSIONS, quality_rules.SKIP_EXTENSIONS)
+        self.assertEqual(quality_gate.SKIP_PATHS, quality_rules.SKIP_PATHS)
+
 
 class TestCheckFile(unittest.TestCase):
     def _write_file(self, tmpdir, filename, content):
@@ -161,5 +180,147 @@ class TestRunQualityGate(unittest.TestCase):
             self.assertIn("No staged files", report)
 
 
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestStagedContentFromIndex(unittest.TestCase):
+    """The gate checks staged blobs, not the working tree."""
+
+    SECRET = 'const API_KEY = "abcdef1234567890abcdef";\n'
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        _git(self.tmpdir, "init", "-q")
+        os.makedirs(os.path.join(self.tmpdir, ".hody"))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.tmpdir, name), "w") as f:
+            f.write(content)
+
+    def test_staged_secret_fixed_only_in_working_tree_is_denied(self):
+        self._write("app.js", self.SECRET)
+        _git(self.tmpdir, "add", "app.js")
+        self._write("app.js", "const x = 1;\n")
+        passed, report = run_quality_gate(self.tmpdir)
+        self.assertFalse(passed)
+        self.assertIn("app.js", report)
+
+    def test_unstaged_secret_is_not_reported(self):
+        self._write("app.js", "const x = 1;\n")
+        _git(self.tmpdir, "add", "app.js")
+        self._write("app.js", self.SECRET)
+        passed, _report = run_quality_gate(self.tmpdir)
+        self.assertTrue(passed)
+
+    def test_size_comes_from_index(self):
+        with open(os.path.join(self.tmpdir, ".hody", "quality-rules.yaml"), "w") as f:
+            f.write("rules:\n  file_size:\n    max_kb: 1\n")
+        self._write("big.txt", "x" * 4096)
+        _git(self.tmpdir, "add", "big.txt")
+        self._write("big.txt", "small")
+        passed, report = run_quality_gate(self.tmpdir)
+        self.assertFalse(passed)
+        self.assertIn("File too large (4KB > 1KB)", report)
+
+    def test_retry_rescans_only_changed_blobs(self):
+        from quality_gate import _load_quality_rules
+        quality_rules = _load_quality_rules()
+        for i in range(5):
+            self._write(f"f{i}.js", f"const v{i} = {i};\n")
+        self._write("bad.js", self.SECRET)
+        _git(self.tmpdir, "add", ".")
+
+        scanned = []
+        real = quality_rules.run_checks_parallel
+
+        def spy(cwd, files, **kwargs):
+            scanned.append([f[0] if isinstance(f, tuple) else f for f in files])
+            return real(cwd, files, **kwargs)
+
+        with patch.object(quality_rules, "run_checks_parallel", side_effect=spy):
+            first = run_quality_gate(self.tmpdir)
+            self._write("bad.js", "const fixed = 1;\n")
+            _git(self.tmpdir, "add", "bad.js")
+            second = run_quality_gate(self.tmpdir)
+
+        self.assertFalse(first[0])
+        self.assertTrue(second[0])
+        self.assertEqual(len(scanned[0]), 6)
+        self.assertEqual(scanned[1], ["bad.js"])
+
+    def test_added_lines_scope_ignores_existing_findings(self):
+        _git(self.tmpdir, "config", "user.email", "t@example.com")
+        _git(self.tmpdir, "config", "user.name", "t")
+        self._write("legacy.js", self.SECRET + "const a = 1;\n")
+        _git(self.tmpdir, "add", "legacy.js")
+        _git(self.tmpdir, "commit", "-qm", "legacy")
+        with open(os.path.join(self.tmpdir, ".hody", "quality-rules.yaml"), "w") as f:
+            f.write("scope: added_lines\n")
+
+        self._write("legacy.js", self.SECRET + "const a = 1;\nconsole.log(a);\n")
+        _git(self.tmpdir, "add", "legacy.js")
+        passed, report = run_quality_gate(self.tmpdir)
+        self.assertTrue(passed)
+        self.assertIn("L3: Debug statement: console.log", report)
+        self.assertNotIn("API key", report)
+
+        # Whole-file scope still reports the old secret
+        os.remove(os.path.join(self.tmpdir, ".hody", "quality-rules.yaml"))
+        passed, report = run_quality_gate(self.tmpdir)
+        self.assertFalse(passed)
+        self.assertIn("L1: Possible hardcoded API key", report)
+
+
+class TestNoOpFastPath(unittest.TestCase):
+    """Non-commit Bash events must exit before any heavy import."""
+
+    HOOK_SCRIPT = os.path.join(os.path.abspath(HOOK_DIR), "quality_gate.py")
+
+    def _events(self, n):
+        commands = ["ls -la", "pytest -q", "git status", "npm run build",
+                    "cat README.md", "git log --oneline", "make test"]
+        return [
+            json.dumps({
+                "tool_name": "Bash",
+                "tool_input": {"command": f"{commands[i % len(commands)]} #{i}"},
+                "cwd": "/tmp/project",
+            })
+            for i in range(n)
+        ]
+
+    def test_commit_candidate_filter(self):
+        self.assertTrue(is_commit_candidate('{"command": "git commit -m x"}'))
+        self.assertFalse(is_commit_candidate('{"command": "git status"}'))
+
+    def test_noop_p95_wall_time(self):
+        timings = []
+        for raw in self._events(1000):
+            with patch("sys.stdin", io.StringIO(raw)):
+                start = time.perf_counter()
+                with self.assertRaises(SystemExit):
+                    main()
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95)]
+        self.assertLess(p95, 0.001, f"p95 no-op latency {p95 * 1000:.3f}ms")
+
+    def test_noop_skips_heavy_imports(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", self.HOOK_SCRIPT],
+            input=self._events(1)[0],
+            capture_output=True, text=True, timeout=10,
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "")
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+        for heavy in ("json", "re", "subprocess", "quality_rules"):
+            self.assertNotIn(heavy, imported)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,41 @@ def _write_file(path, content):
         f.write(content)
 
 
+def _synthetic_tracker(cwd, count, seed=7):
+    """Fill tracker.db with *count* items plus tags, files and kb refs."""
+    import random
+    rng = random.Random(seed)
+    schema.init_db(cwd)
+    statuses = ["created", "in_progress", "paused", "blocked", "completed", "abandoned"]
+    items, tags, files, refs = [], [], [], []
+    for n in range(count):
+        item_id = f"itm_{n:012x}"
+        ts = f"2026-01-{1 + n % 28:02d}T{n % 24:02d}:{n % 60:02d}:00Z"
+        status = rng.choice(statuses)
+        priority = rng.choice(["high", "medium", "low"])
+        items.append((item_id, "task", f"Task {n} about module {n % 97}", "",
+                      status, priority, ts, ts,
+                      ts if status in ("completed", "abandoned") else None,
+                      "ses_20260101_001", "{}"))
+        for tag in rng.sample(["api", "ui", "db", "auth", "perf", "docs"], n % 3):
+            tags.append((item_id, tag))
+        for k in range(n % 4):
+            files.append((item_id, f"src/module_{(n + k) % 500}.py"))
+        if n % 5 == 0:
+            refs.append((item_id, f"decisions.md#adr-{n % 40}"))
+    conn = sqlite3.connect(os.path.join(cwd, ".hody", "tracker.db"))
+    with conn:
+        conn.execute("INSERT INTO sessions (id, started_at) VALUES ('ses_20260101_001', '2026-01-01T00:00:00Z')")
+        conn.executemany(
+            "INSERT INTO items (id, type, title, description, status, priority,"
+            " created_at, updated_at, completed_at, session_id, extra)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", items)
+        conn.executemany("INSERT INTO item_tags VALUES (?, ?)", tags)
+        conn.executemany("INSERT INTO item_files VALUES (?, ?)", files)
+        conn.executemany("INSERT INTO item_kb_refs VALUES (?, ?)", refs)
+    conn.close()
+
+
 # =====================================================================
 # tracker_schema.py tests
 # =====================================================================
@@ -75,6 +110,154 @@ class TestInitDB(unittest.TestCase):
         self.assertTrue(expected.issubset(tables), f"Missing tables: {expected - tables}")
 
 
+class TestSchemaMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, ".hody", "tracker.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _raw(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        return sqlite3.connect(self.db_path)
+
+    def _version(self):
+        conn = self._raw()
+        try:
+            return schema.schema_version(conn)
+        finally:
+            conn.close()
+
+    def test_new_db_is_current(self):
+        schema.init_db(self.tmpdir)
+        self.assertEqual(self._version(), schema.SCHEMA_VERSION)
+
+    def test_unversioned_db_adopted(self):
+        """A database created before versioning keeps its data."""
+        conn = self._raw()
+        conn.executescript(schema.SCHEMA_SQL)
+        conn.execute("INSERT INTO sessions (id, started_at) VALUES ('ses_1', '2026-01-01T00:00:00Z')")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self._version(), 0)
+
+        conn = schema.get_db(self.tmpdir)
+        self.assertEqual(conn.execute("SELECT id FROM sessions").fetchone()["id"], "ses_1")
+        conn.close()
+        self.assertEqual(self._version(), schema.SCHEMA_VERSION)
+
+    def test_current_db_fast_path(self):
+        """A current schema costs one PRAGMA read, no DDL."""
+        schema.init_db(self.tmpdir)
+        conn = self._raw()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        schema.migrate(conn)
+        conn.close()
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_writes_skip_ddl(self):
+        schema.init_db(self.tmpdir)
+        with patch.object(schema, "_statements") as run_ddl:
+            tracker_mod.create_item(self.tmpdir, type="task", title="No DDL")
+            tracker_mod.save_checkpoint(self.tmpdir, "wf1", "backend", "BUILD")
+        run_ddl.assert_not_called()
+
+    def test_pending_steps_run_in_order_once(self):
+        schema.init_db(self.tmpdir)
+        calls = []
+
+        def backfill(conn):
+            calls.append(schema.schema_version(conn))
+            conn.execute("INSERT INTO extra_table (name) VALUES ('backfilled')")
+
+        base = schema.SCHEMA_VERSION
+        steps = schema.MIGRATIONS + [
+            (base + 1, "CREATE TABLE extra_table (name TEXT);"),
+            (base + 2, backfill),
+        ]
+        with patch.object(schema, "MIGRATIONS", steps), \
+                patch.object(schema, "SCHEMA_VERSION", base + 2):
+            conn = schema.get_db(self.tmpdir)
+            conn.close()
+            conn = schema.get_db(self.tmpdir)
+            rows = conn.execute("SELECT name FROM extra_table").fetchall()
+            conn.close()
+        self.assertEqual(calls, [base + 1])
+        self.assertEqual([r["name"] for r in rows], ["backfilled"])
+        self.assertEqual(self._version(), base + 2)
+
+    def test_failed_step_rolls_back(self):
+        schema.init_db(self.tmpdir)
+        base = schema.SCHEMA_VERSION
+        steps = schema.MIGRATIONS + [
+            (base + 1, "CREATE TABLE half_done (x TEXT);\nINSERT INTO no_such_table VALUES (1);"),
+        ]
+        with patch.object(schema, "MIGRATIONS", steps), \
+                patch.object(schema, "SCHEMA_VERSION", base + 1):
+            with self.assertRaises(sqlite3.OperationalError):
+                schema.get_db(self.tmpdir)
+        conn = self._raw()
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        conn.close()
+        self.assertNotIn("half_done", tables)
+        self.assertEqual(self._version(), base)
+
+    def test_newer_db_used_as_is(self):
+        schema.init_db(self.tmpdir)
+        conn = self._raw()
+        conn.execute(f"PRAGMA user_version = {schema.SCHEMA_VERSION + 5}")
+        conn.close()
+        tracker_mod.create_item(self.tmpdir, type="task", title="Newer schema")
+        self.assertEqual(self._version(), schema.SCHEMA_VERSION + 5)
+
+    def test_upgrade_ranks_existing_items(self):
+        """Items written before v3 sort by priority without a backfill."""
+        v2 = [step for step in schema.MIGRATIONS if step[0] <= 2]
+        with patch.object(schema, "MIGRATIONS", v2), \
+                patch.object(schema, "SCHEMA_VERSION", 2):
+            schema.init_db(self.tmpdir)
+        conn = self._raw()
+        conn.executemany(
+            "INSERT INTO items (id, type, title, status, priority, created_at, updated_at, session_id)"
+            " VALUES (?, 'task', 'Old', 'created', ?, ?, ?, 'ses_1')",
+            [("itm_low", "low", "t2", "t2"), ("itm_high", "high", "t1", "t1")]
+        )
+        conn.commit()
+        conn.close()
+
+        active = tracker_mod.get_active_items(self.tmpdir)
+        self.assertEqual([i["id"] for i in active], ["itm_high", "itm_low"])
+        self.assertEqual(self._version(), 3)
+
+    def test_raw_writes_cannot_skew_rank(self):
+        """The sort key is an indexed expression, not a copied column."""
+        schema.init_db(self.tmpdir)
+        conn = self._raw()
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(items)")}
+        conn.executemany(
+            "INSERT INTO items (id, type, title, status, priority, created_at, updated_at, session_id)"
+            " VALUES (?, 'task', 'Raw', 'created', ?, 't', 't', 'ses_1')",
+            [("itm_a", "low"), ("itm_b", "medium")]
+        )
+        conn.execute("UPDATE items SET priority = 'high' WHERE id = 'itm_a'")
+        conn.commit()
+        conn.close()
+        self.assertNotIn("priority_rank", columns)
+        active = tracker_mod.get_active_items(self.tmpdir)
+        self.assertEqual([i["id"] for i in active], ["itm_a", "itm_b"])
+
+    def test_statements_keep_trigger_bodies(self):
+        script = (
+            "CREATE TABLE a (x);\n"
+            "CREATE TRIGGER t AFTER INSERT ON a BEGIN\n"
+            "  UPDATE a SET x = 1;\n"
+            "END;\n"
+        )
+        self.assertEqual(len(list(schema._statements(script))), 2)
+
+
 class TestGetDB(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
@@ -674,6 +857,14 @@ class TestGetActiveItems(unittest.TestCase):
         active = tracker_mod.get_active_items(self.tmpdir)
         self.assertEqual(active[0]["id"], high["id"])
 
+    def test_priority_change_reorders(self):
+        """Changing priority moves the item in the active list."""
+        first = tracker_mod.create_item(self.tmpdir, type="task", title="First", priority="low")
+        tracker_mod.create_item(self.tmpdir, type="task", title="Second")
+        tracker_mod.update_item(self.tmpdir, first["id"], priority="high")
+        active = tracker_mod.get_active_items(self.tmpdir)
+        self.assertEqual(active[0]["id"], first["id"])
+
 
 class TestGetIncomplete(unittest.TestCase):
     def setUp(self):
@@ -766,6 +957,212 @@ class TestSearch(unittest.TestCase):
         self.assertEqual(results[0]["id"], self.task["id"])
 
 
+class TestFullTextSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.login = tracker_mod.create_item(
+            self.tmpdir, type="task", title="OAuth login endpoint",
+            description="Add the callback handler")
+        self.docs = tracker_mod.create_item(
+            self.tmpdir, type="task", title="Update API docs",
+            description="Mention the login flow for OAuth clients")
+        self.other = tracker_mod.create_item(
+            self.tmpdir, type="question", title="Which cache backend?")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _ids(self, **kwargs):
+        return [i["id"] for i in tracker_mod.search(self.tmpdir, **kwargs)]
+
+    def _fts_rows(self):
+        conn = schema.get_db(self.tmpdir)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM items_fts").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_index_created(self):
+        conn = schema.get_db(self.tmpdir)
+        self.assertTrue(schema.has_search_index(conn))
+        conn.close()
+        self.assertEqual(self._fts_rows(), 3)
+
+    def test_title_hits_rank_first(self):
+        self.assertEqual(self._ids(query="oauth login"), [self.login["id"], self.docs["id"]])
+
+    def test_prefix_and_case_insensitive(self):
+        self.assertEqual(self._ids(query="LOG"), [self.login["id"], self.docs["id"]])
+
+    def test_notes_are_searched(self):
+        tracker_mod.update_item(self.tmpdir, self.other["id"], notes="Decided on redis")
+        self.assertEqual(self._ids(query="redis"), [self.other["id"]])
+
+    def test_title_update_reindexed(self):
+        tracker_mod.update_item(self.tmpdir, self.other["id"], title="Which queue backend?")
+        self.assertEqual(self._ids(query="cache"), [])
+        self.assertEqual(self._ids(query="queue"), [self.other["id"]])
+
+    def test_delete_removes_from_index(self):
+        conn = schema.get_db(self.tmpdir)
+        conn.execute("DELETE FROM items WHERE id = ?", (self.other["id"],))
+        conn.commit()
+        mapped = conn.execute("SELECT COUNT(*) FROM items_fts_map").fetchone()[0]
+        conn.close()
+        self.assertEqual((self._fts_rows(), mapped), (2, 2))
+
+    def test_vietnamese_without_diacritics(self):
+        item = tracker_mod.create_item(self.tmpdir, type="task", title="Sửa lỗi đăng nhập")
+        self.assertEqual(self._ids(query="sua loi"), [item["id"]])
+
+    def test_combined_with_filters(self):
+        self.assertEqual(self._ids(query="login", type="task", limit=1), [self.login["id"]])
+
+    def test_snippets(self):
+        results = tracker_mod.search(self.tmpdir, query="callback", snippets=True)
+        self.assertIn("[callback]", results[0]["snippet"])
+        plain = tracker_mod.search(self.tmpdir, query="callback")
+        self.assertNotIn("snippet", plain[0])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self._ids(query='"oauth (login* endpoint:'), [self.login["id"]])
+        self.assertEqual(self._ids(query="-- *"), [])
+
+    def test_like_fallback(self):
+        tracker_mod.update_item(self.tmpdir, self.other["id"], notes="Decided on redis")
+        with patch.object(schema, "has_search_index", return_value=False):
+            self.assertEqual(self._ids(query="redis"), [self.other["id"]])
+            self.assertEqual(self._ids(query="gin endp"), [self.login["id"]])
+
+    def test_without_fts5(self):
+        """Databases used by an SQLite without FTS5 search with LIKE."""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with patch.object(schema, "_fts5_available", return_value=False):
+                schema.init_db(tmpdir)
+                item = tracker_mod.create_item(tmpdir, type="task", title="Plain login page")
+                conn = schema.get_db(tmpdir)
+                self.assertFalse(schema.has_search_index(conn))
+                conn.close()
+                self.assertEqual([i["id"] for i in tracker_mod.search(tmpdir, query="login")],
+                                 [item["id"]])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_index_built_once_fts5_is_available(self):
+        """A database first migrated without FTS5 gets the index later."""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with patch.object(schema, "_fts5_available", return_value=False):
+                item = tracker_mod.create_item(tmpdir, type="task", title="Plain login page")
+            conn = schema.get_db(tmpdir)
+            self.assertTrue(schema.has_search_index(conn))
+            conn.close()
+            results = tracker_mod.search(tmpdir, query="login", snippets=True)
+            self.assertEqual(results[0]["id"], item["id"])
+            self.assertIn("[login]", results[0]["snippet"])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def _hide_fts5_module(self, hidden):
+        """Make items_fts unusable, as it is under an SQLite without FTS5."""
+        conn = sqlite3.connect(os.path.join(self.tmpdir, ".hody", "tracker.db"))
+        conn.execute("PRAGMA writable_schema = ON")
+        old, new = ("fts5", "no_fts5") if hidden else ("no_fts5", "fts5")
+        conn.execute(
+            "UPDATE sqlite_master SET sql = replace(sql, ?, ?) WHERE name = 'items_fts'",
+            (f"USING {old}", f"USING {new}"))
+        conn.commit()
+        conn.close()
+
+    def test_writes_survive_sqlite_without_fts5(self):
+        self._hide_fts5_module(True)
+        with patch.object(schema, "_fts5_available", return_value=False):
+            item = tracker_mod.create_item(self.tmpdir, type="task", title="Offline sync")
+            tracker_mod.update_item(self.tmpdir, self.login["id"], title="OAuth sign-in endpoint")
+            self.assertEqual(self._ids(query="offline"), [item["id"]])
+        self._hide_fts5_module(False)
+        # Back on a build with FTS5: rebuilt, including the writes made meanwhile
+        self.assertEqual(self._ids(query="offline"), [item["id"]])
+        self.assertEqual(self._ids(query="sign"), [self.login["id"]])
+        self.assertEqual(self._fts_rows(), 4)
+
+    def _index_sql(self):
+        conn = schema.get_db(self.tmpdir)
+        try:
+            return conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'items_fts'").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_tokenizer_matches_probe(self):
+        self.assertIn(f"tokenize = '{schema.FTS5_TOKENIZERS[0]}'", self._index_sql())
+
+    def test_older_sqlite_tokenizer(self):
+        """An SQLite before 3.27 only accepts remove_diacritics 1."""
+        older = (schema.FTS5_TOKENIZERS[1],)
+        with patch.object(schema, "_fts5", older):
+            # The live remove_diacritics 2 index would fail there: use LIKE
+            item = tracker_mod.create_item(self.tmpdir, type="task", title="Offline sync")
+            conn = schema.get_db(self.tmpdir)
+            self.assertFalse(schema.has_search_index(conn))
+            conn.close()
+            self.assertEqual(self._ids(query="offline"), [item["id"]])
+        # A newer SQLite rebuilds the index with the preferred tokenizer
+        self.assertEqual(self._ids(query="offline"), [item["id"]])
+        self.assertIn(schema.FTS5_TOKENIZERS[0], self._index_sql())
+
+    def test_index_built_with_fallback_tokenizer(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with patch.object(schema, "_fts5", (schema.FTS5_TOKENIZERS[1],)):
+                item = tracker_mod.create_item(tmpdir, type="task", title="Café menu")
+                self.assertEqual([i["id"] for i in tracker_mod.search(tmpdir, query="cafe")],
+                                 [item["id"]])
+                conn = schema.get_db(tmpdir)
+                self.assertTrue(schema.has_search_index(conn))
+                sql = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE name = 'items_fts'").fetchone()[0]
+                conn.close()
+            self.assertIn(schema.FTS5_TOKENIZERS[1], sql)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_words_match_as_token_prefixes(self):
+        """FTS5 matches from the start of a word; LIKE matches anywhere."""
+        self.assertEqual(self._ids(query="endp"), [self.login["id"]])
+        self.assertEqual(self._ids(query="auth"), [])
+        with patch.object(schema, "has_search_index", return_value=False):
+            self.assertCountEqual(self._ids(query="auth"), [self.login["id"], self.docs["id"]])
+
+    def test_existing_items_backfilled(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(tmpdir, ".hody"))
+            conn = sqlite3.connect(os.path.join(tmpdir, ".hody", "tracker.db"))
+            conn.executescript(schema.SCHEMA_SQL)
+            conn.execute("PRAGMA user_version = 1")
+            conn.execute(
+                "INSERT INTO items (id, type, title, status, created_at, updated_at, session_id)"
+                " VALUES ('itm_old', 'task', 'Legacy importer rewrite', 'created', 't', 't', 's')")
+            conn.commit()
+            conn.close()
+            self.assertEqual([i["id"] for i in tracker_mod.search(tmpdir, query="importer")],
+                             ["itm_old"])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_cli_search_shows_snippet(self):
+        script = os.path.join(os.path.abspath(SCRIPTS_DIR), "tracker.py")
+        result = subprocess.run(
+            [sys.executable, script, "search", "--query", "callback", "--cwd", self.tmpdir],
+            capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        data = json.loads(result.stdout)
+        self.assertEqual(data[0]["id"], self.login["id"])
+        self.assertIn("[callback]", data[0]["snippet"])
+
+
 class TestGetItemHistory(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
@@ -787,6 +1184,212 @@ class TestGetItemHistory(unittest.TestCase):
         self.assertEqual(history[2]["to_status"], "paused")
 
 
+class TestTrackerStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _count_connects(self):
+        return patch.object(schema.sqlite3, "connect", wraps=sqlite3.connect)
+
+    def test_store_operations_do_not_reconnect(self):
+        """Operations through an open store reuse its connection."""
+        with tracker_mod.TrackerStore(self.tmpdir) as store:
+            with self._count_connects() as connect:
+                item = tracker_mod.create_item(store, type="task", title="Store task",
+                                               tags=["api"], related_files=["a.py"])
+                tracker_mod.transition_status(store, item["id"], "in_progress")
+                tracker_mod.add_kb_ref(store, item["id"], "decisions.md")
+                tracker_mod.get_item(store, item["id"])
+                tracker_mod.search(store, tags=["api"])
+                tracker_mod.save_checkpoint(store, "wf1", "backend", "BUILD")
+                awareness.get_warnings(store)
+            self.assertEqual(connect.call_count, 0)
+            self.assertEqual(tracker_mod.get_item(store, item["id"])["kb_refs"], ["decisions.md"])
+
+    def test_wrapper_connects_once(self):
+        """A cwd-based create_item opens a single connection."""
+        with self._count_connects() as connect:
+            tracker_mod.create_item(self.tmpdir, type="task", title="One connect")
+        self.assertEqual(connect.call_count, 1)
+
+    def test_store_stays_open_after_calls(self):
+        store = tracker_mod.TrackerStore(self.tmpdir)
+        try:
+            tracker_mod.ensure_session(store)
+            self.assertIsNotNone(store.conn)
+            store.conn.execute("SELECT 1")
+        finally:
+            store.close()
+        self.assertIsNone(store.conn)
+
+    def test_store_without_create_requires_db(self):
+        with self.assertRaises(FileNotFoundError):
+            tracker_mod.TrackerStore(self.tmpdir, create=False)
+
+    def test_generate_session_id_with_conn(self):
+        with tracker_mod.TrackerStore(self.tmpdir) as store:
+            first = tracker_mod.ensure_session(store)
+            tracker_mod.end_session(store, first)
+            second = schema.generate_session_id(conn=store.conn)
+        self.assertTrue(first.endswith("_001"))
+        self.assertTrue(second.endswith("_002"))
+
+    def test_migrate_accepts_store(self):
+        _write_file(os.path.join(self.tmpdir, ".hody", "state.json"),
+                    json.dumps({"feature": "Store migration", "status": "in_progress",
+                                "workflow_id": "wf-store"}))
+        with tracker_mod.TrackerStore(self.tmpdir) as store:
+            item = tracker_mod.migrate_from_state_json(store)
+        self.assertEqual(item["workflow_id"], "wf-store")
+
+
+class TestBulkHydration(unittest.TestCase):
+    """List queries hydrate tags/files/kb_refs in O(1) queries, not O(rows)."""
+
+    ITEMS = 50000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        _synthetic_tracker(cls.tmpdir, cls.ITEMS)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def _traced(self, fn, *args, **kwargs):
+        """Run fn on a TrackerStore, returning (result, SQL statements run)."""
+        statements = []
+        with tracker_mod.TrackerStore(self.tmpdir, create=False) as store:
+            store.conn.set_trace_callback(statements.append)
+            result = fn(store, *args, **kwargs)
+        return result, len(statements)
+
+    def _per_item_reference(self, item_id):
+        conn = sqlite3.connect(os.path.join(self.tmpdir, ".hody", "tracker.db"))
+        try:
+            return tuple(
+                [r[0] for r in conn.execute(f"SELECT {col} FROM {table} WHERE item_id = ?", (item_id,))]
+                for table, col in (("item_tags", "tag"), ("item_files", "filepath"),
+                                   ("item_kb_refs", "kb_ref"))
+            )
+        finally:
+            conn.close()
+
+    def test_get_incomplete_query_count(self):
+        items, queries = self._traced(tracker_mod.get_incomplete)
+        self.assertGreater(len(items), self.ITEMS // 2)
+        chunks = -(-len(items) // tracker_mod.HYDRATE_CHUNK)
+        # The item SELECT plus one query per list table per chunk
+        self.assertEqual(queries, 1 + 3 * chunks)
+
+    def test_list_queries_constant(self):
+        _, active = self._traced(tracker_mod.get_active_items, limit=500)
+        _, found = self._traced(tracker_mod.search, limit=500)
+        _, recent = self._traced(awareness._get_recent_completed, hours=24 * 3650, limit=500)
+        self.assertEqual((active, found, recent), (4, 4, 4))
+
+    def test_shape_matches_per_item_queries(self):
+        items = tracker_mod.search(self.tmpdir, limit=300)
+        self.assertEqual(len(items), 300)
+        for item in items:
+            self.assertEqual(
+                (item["tags"], item["related_files"], item["kb_refs"]),
+                self._per_item_reference(item["id"]),
+            )
+            self.assertEqual(item["extra"], {})
+
+    def test_single_item_unchanged(self):
+        item = tracker_mod.get_item(self.tmpdir, "itm_000000000005")
+        self.assertEqual(set(item), {
+            "id", "type", "title", "description", "status", "priority",
+            "created_at", "updated_at", "completed_at", "session_id",
+            "workflow_id", "notes", "extra", "tags", "related_files", "kb_refs",
+        })
+        self.assertEqual((item["tags"], item["related_files"], item["kb_refs"]),
+                         self._per_item_reference("itm_000000000005"))
+
+    def test_empty_result(self):
+        self.assertEqual(tracker_mod.search(self.tmpdir, query="no such title"), [])
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Hot tracker queries are index-driven, never a full table scan."""
+
+    ITEMS = 20000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        _synthetic_tracker(cls.tmpdir, cls.ITEMS)
+        tracker_mod.save_checkpoint(cls.tmpdir, "wf1", "backend", "BUILD")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def _plans(self, fn, *args, **kwargs):
+        """Run fn on a TrackerStore and EXPLAIN every statement it issued."""
+        statements = []
+        with tracker_mod.TrackerStore(self.tmpdir, create=False) as store:
+            store.conn.set_trace_callback(statements.append)
+            fn(store, *args, **kwargs)
+            store.conn.set_trace_callback(None)
+            return {
+                sql: [row[3] for row in store.conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                for sql in statements
+                if sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE")
+            }
+
+    def assertNoTableScan(self, fn, *args, **kwargs):
+        plans = self._plans(fn, *args, **kwargs)
+        self.assertTrue(plans)
+        for sql, plan in plans.items():
+            for detail in plan:
+                # "SCAN t" alone reads every row; "SCAN t USING INDEX" walks
+                # an index in order and virtual-table scans are FTS5 lookups.
+                # sqlite_master and the FTS5 shadow tables are tiny.
+                match = re.match(r"SCAN (\S+)$", detail)
+                if match and match.group(1) != "sqlite_master" \
+                        and not match.group(1).startswith("main.items_fts"):
+                    self.fail(f"{detail!r} in plan for: {sql}")
+
+    def test_active_items(self):
+        self.assertNoTableScan(tracker_mod.get_active_items)
+
+    def test_incomplete(self):
+        self.assertNoTableScan(tracker_mod.get_incomplete)
+
+    def test_search_filters(self):
+        self.assertNoTableScan(tracker_mod.search)
+        self.assertNoTableScan(tracker_mod.search, type="task", status="blocked")
+        self.assertNoTableScan(tracker_mod.search, tags=["auth"])
+        self.assertNoTableScan(tracker_mod.search, related_files=["src/module_7.py"])
+        self.assertNoTableScan(tracker_mod.search, after="2026-01-20T00:00:00Z")
+        self.assertNoTableScan(tracker_mod.search, query="module")
+
+    def test_file_lookup_uses_filepath_index(self):
+        plans = self._plans(tracker_mod.search, related_files=["src/module_7.py"])
+        self.assertTrue(any("idx_item_files_filepath" in d
+                            for plan in plans.values() for d in plan))
+
+    def test_recent_completed(self):
+        self.assertNoTableScan(awareness._get_recent_completed)
+
+    def test_item_history(self):
+        self.assertNoTableScan(tracker_mod.get_item_history, "itm_000000000005")
+
+    def test_session_lookup(self):
+        self.assertNoTableScan(tracker_mod.ensure_session)
+
+    def test_checkpoints(self):
+        self.assertNoTableScan(tracker_mod.load_checkpoint, "wf1", "backend")
+        self.assertNoTableScan(tracker_mod.load_workflow_checkpoints, "wf1")
+
+
 class TestSyncWorkflowStatus(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()